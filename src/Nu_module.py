@@ -27,18 +27,26 @@ Description  :
 '''
 import logging
 import math
-import sys
+
+import numpy as np
+
+from .valid_module import (ANGLE_OUT, CO_OUT, OPTION_OUT, PHI_OUT, PR_OUT, between_flag, check_result,
+                          choice_flag, range_flag)
 
 
 class Nu_SP_class(object):
 
-    """单相努塞尔数计算类"""
+    """单相努塞尔数计算类
+
+    所有经验公式均可按元素处理数组输入; 超出适用范围的元素返回 NaN 并记录警告,
+    return_flag=True 时同时返回越界原因编码 (见 valid_module, 0 表示有效)
+    """
 
     def __init__(self):
         """无 """
         self.logger = logging.getLogger(__name__)  # 调用_setup_logger方法设置日志记录器
 
-    def YL_cal(self, Re, Pr, mu_f, mu_w):
+    def YL_cal(self, Re, Pr, mu_f, mu_w, return_flag=False):
         """Yan和Li拟合的努塞尔计算公式
 
         :Re: 雷诺数
@@ -50,10 +58,10 @@ class Nu_SP_class(object):
         不能用     
         [1] YAN Y Y, LIN T F. Evaporation Heat Transfer and Pressure Drop of Refrigerant R-134a in a Plate Heat Exchanger[J/OL]. Journal of Heat Transfer, 1999, 121(1): 118-127. DOI:10.1115/1.2825924.
         """
+        Nu = 0.2121*Re**0.78*Pr**(1/3)*(mu_f/mu_w)**0.14
+        return check_result(self.logger, "YL", Nu, range_flag(Re), return_flag)
 
-        return 0.2121*Re**0.78*Pr**(1/3)*(mu_f/mu_w)**0.14
-
-    def Okada_cal(self, Re, Pr, ang_corrugated):
+    def Okada_cal(self, Re, Pr, ang_corrugated, return_flag=False):
         """Okada拟合的努塞尔计算公式
         适用范围: Re=700-25000
 
@@ -62,21 +70,15 @@ class Nu_SP_class(object):
         :ang_corrugated: 波纹角 ° 可选值有: 30、45、60、75
         :returns: TODO
         """
-
-        if ang_corrugated == 30:
-            Nu = 0.157 * Re**0.66*Pr**0.4
-        elif ang_corrugated == 45:
-            Nu = 0.249 * Re**0.64*Pr**0.4
-        elif ang_corrugated == 60:
-            Nu = 0.327 * Re**0.65*Pr**0.4
-        elif ang_corrugated == 75:
-            Nu = 0.478 * Re**0.62*Pr**0.4
-        else:
-            self.logger.error("Okada 努塞尔拟合公式仅适用于波纹角为30°、45°、60°、75°")
-            sys.exit()
-        return Nu
-
-    def Gulenoglu_C_1_cal(self, Re, Pr, mu, mu_w, phi):
+        ang = np.asarray(ang_corrugated, dtype=float)
+        cond = [np.isclose(ang, a) for a in (30, 45, 60, 75)]
+        C = np.select(cond, [0.157, 0.249, 0.327, 0.478], np.nan)
+        m = np.select(cond, [0.66, 0.64, 0.65, 0.62], np.nan)
+        Nu = C * Re**m*Pr**0.4
+        flag = choice_flag(ang, (30, 45, 60, 75), ANGLE_OUT)
+        return check_result(self.logger, "Okada", Nu, flag, return_flag)
+
+    def Gulenoglu_C_1_cal(self, Re, Pr, mu, mu_w, phi, return_flag=False):
         """Gulenoglu-C 努塞尔计算公式
         适用范围: Re=300-5000,波纹角30°,工质为水
 
@@ -90,20 +92,15 @@ class Nu_SP_class(object):
         Experimental comparison of performances of three different plates for gasketed plate heat exchangers[J]. 
         International Journal of Thermal Sciences, 2014, 75: 249-256.
         """
-        if 300 < Re < 5000:
-            if phi == 1.17:
-                Nu = 0.32867*Re**0.68*Pr**(0.1/3)*(mu/mu_w)**0.14
-            elif phi == 1.288:
-                Nu = 0.17422*Re**0.7*Pr**(0.1/3)*(mu/mu_w)**0.14
-            else:
-                self.logger.error("Gulenoglu-C 努塞尔计算公式仅适用于phi=1.17或1.288")
-                sys.exit()
-        else:
-            self.logger.error("Gulenoglu-C 努塞尔计算公式仅适用于Re=300-5000,波纹角30°,工质为水")
-            sys.exit()
-        return Nu
-
-    def Gulenoglu_C_2_cal(self, Re, Pr, mu, mu_w, phi):
+        phi = np.asarray(phi, dtype=float)
+        cond = [np.isclose(phi, 1.17), np.isclose(phi, 1.288)]
+        C = np.select(cond, [0.32867, 0.17422], np.nan)
+        m = np.select(cond, [0.68, 0.7], np.nan)
+        Nu = C*Re**m*Pr**(0.1/3)*(mu/mu_w)**0.14
+        flag = range_flag(Re, 300, 5000) | choice_flag(phi, (1.17, 1.288), PHI_OUT)
+        return check_result(self.logger, "Gulenoglu-C 1", Nu, flag, return_flag)
+
+    def Gulenoglu_C_2_cal(self, Re, Pr, mu, mu_w, phi, return_flag=False):
         """Gulenoglu-C 努塞尔计算公式
         适用范围: Re=300-5000,波纹角30°,工质为水
 
@@ -117,18 +114,15 @@ class Nu_SP_class(object):
         Experimental comparison of performances of three different plates for gasketed plate heat exchangers[J]. 
         International Journal of Thermal Sciences, 2014, 75: 249-256.
         """
-        if 300 < Re < 5000:
-            if phi == 1.17:
-                Nu = 0.3277*Re**0.675*Pr**(0.1/3)*(mu/mu_w)**0.14
-            elif phi == 1.288:
-                Nu = 0.17422*Re**0.7*Pr**(0.1/3)*(mu/mu_w)**0.14
-        else:
-            self.logger.error("Gulenoglu-C 努塞尔计算公式仅适用于Re=300-5000,波纹角30°,工质为水")
-            sys.exit()
-
-        return Nu
-
-    def LinJunYU_cal(self, Re, Pr, mu_m, mu_w):
+        phi = np.asarray(phi, dtype=float)
+        cond = [np.isclose(phi, 1.17), np.isclose(phi, 1.288)]
+        C = np.select(cond, [0.3277, 0.17422], np.nan)
+        m = np.select(cond, [0.675, 0.7], np.nan)
+        Nu = C*Re**m*Pr**(0.1/3)*(mu/mu_w)**0.14
+        flag = range_flag(Re, 300, 5000) | choice_flag(phi, (1.17, 1.288), PHI_OUT)
+        return check_result(self.logger, "Gulenoglu-C 2", Nu, flag, return_flag)
+
+    def LinJunYU_cal(self, Re, Pr, mu_m, mu_w, return_flag=False):
         """Lin-Jun-YU 努塞尔计算公式
         适用范围: Re=1000-3000,工质为水/r245fa,v型角度 β SPHE 50° BPHE 60°,
         表面放大系数φ SPHE 1.16 BPHE 1.14,波纹纵横比ʘ SPHE 0.27 BPHE 0.25
@@ -142,14 +136,10 @@ class Nu_SP_class(object):
         Condensation heat transfer characteristics of R245fa in a shell and plate heat exchanger for high-temperature heat pumps,
         International Journal of Heat and Mass Transfer, 127, 2018, 730-739.
         """
-        if 1000 < Re < 3000:
-            return 0.0508*Re**0.7304*Pr**0.33(mu_m/mu_w)**0.14
-        else:
-            self.logger.error(
-                "Lin-Jun-YU 努塞尔计算公式仅适用于Re=1000-3000,工质为水/r245fa,v型角度 β SPHE 50° BPHE 60°,表面放大系数φ SPHE 1.16 BPHE 1.14,波纹纵横比ʘ SPHE 0.27 BPHE 0.25")
-            sys.exit()
+        Nu = 0.0508*Re**0.7304*Pr**0.33*(mu_m/mu_w)**0.14
+        return check_result(self.logger, "Lin-Jun-YU", Nu, range_flag(Re, 1000, 3000), return_flag)
 
-    def Alklaibi_cal(self, Re, Pr, phi):
+    def Alklaibi_cal(self, Re, Pr, phi, return_flag=False):
         """Alklaibi 努塞尔计算公式
             适用范围 Re 300~1000, Pr 5.5~6.5, φ 0~0.3%, β 30°， 工作介质制冷剂（MWCNT/水纳米流体）/水的板式换热器
 
@@ -161,12 +151,8 @@ class Nu_SP_class(object):
             Experimental investigation on the performance of hybrid Fe3O4 coated MWCNT/Water nanofluid as a coolant of a Plate heat exchanger,
             International Journal of Thermal Sciences, 171,2022.
             """
-        if 300 < Re < 1000:
-            return 0.1735*Re**0.4655*Pr**0.4*(1+phi)**0.692
-        else:
-            self.logger.error(
-                "Alklaibi 努塞尔计算公式仅适用于Re 300~1000,Pr 5.5~6.5,φ 0~0.3%,β 30°， 工作介质制冷剂（MWCNT/水纳米流体）/水的板式换热器")
-            sys.exit()
+        Nu = 0.1735*Re**0.4655*Pr**0.4*(1+phi)**0.692
+        return check_result(self.logger, "Alklaibi", Nu, range_flag(Re, 300, 1000), return_flag)
 
     # def Tapacob_cal(self,Re,Pr,h,L_s,T_in,T_out,d_e,d_0):
     #     """Tapacob 努塞尔计算公式
@@ -192,7 +178,7 @@ class Nu_SP_class(object):
     #     e=math.e
     #     return 1.5*Re**n*Pr**0.4*y*e**(-x)*e**m
 
-    def He_Qing_Qiong_cold(self, Re, Pr, mu_f, mu_w):
+    def He_Qing_Qiong_cold(self, Re, Pr, mu_f, mu_w, return_flag=False):
         """He-Qing-Qiong 努塞尔计算公式
         适用范围：波纹夹角45°，横波波距30mm，纵波波距16mm，纵波波高1.5mm，工质为水、油
         适用于冷侧
@@ -204,16 +190,14 @@ class Nu_SP_class(object):
 
         来源：[12] 何庆琼.复合波纹板式换热器换热与阻力特性研究[D].山东大学,2007.
         """
-        if Re < 500 and Re > 50:
-            Nu = 0.3942*Re**0.5473*Pr**0.4*(mu_f/mu_w)**0.14
-        elif Re < 20000 and Re > 2000:
-            Nu = 0.1579*Re**0.6463*Pr**0.4
-        else:
-            self.logger.error("He-Qing-Qiong 努塞尔计算公式仅适用于Re 50~500, 2000~20000")
-            sys.exit()
-        return Nu
-
-    def HeQQ_hot_cal(self, Re, Pr, mu_f, mu_w):
+        laminar = (Re < 500) & (Re > 50)
+        Nu = np.where(laminar,
+                      0.3942*Re**0.5473*Pr**0.4*(mu_f/mu_w)**0.14,
+                      0.1579*Re**0.6463*Pr**0.4)
+        flag = np.where(laminar, 0, range_flag(Re, 2000, 20000))
+        return check_result(self.logger, "He-Qing-Qiong", Nu, flag, return_flag)
+
+    def HeQQ_hot_cal(self, Re, Pr, mu_f, mu_w, return_flag=False):
         """He-Qing-Qiong 努塞尔计算公式
         适用范围：波纹夹角45°，横波波距30mm，纵波波距16mm，纵波波高1.5mm，工质为水、油
         适用于热侧
@@ -225,17 +209,14 @@ class Nu_SP_class(object):
 
         来源：[12] 何庆琼.复合波纹板式换热器换热与阻力特性研究[D].山东大学,2007.
         """
-        if Re < 500 and Re > 50:
-            Nu = 0.3942*Re**0.5473*Pr**0.3*(mu_f/mu_w)**0.14
-        elif Re < 20000 and Re > 2000:
-            Nu = 0.1579*Re**0.6463*Pr**0.3
-        else:
-            self.logger.error(
-                "He-Qing-Qiong 努塞尔计算公式仅适用于Re 50~500, 2000~20000 波纹夹角45°，横波波距30mm，纵波波距16mm，纵波波高1.5mm，工质为水、油")
-            sys.exit()
-        return Nu
-
-    def Saranmanduh_Borjigin_cal(self, Re, Pr, Lambda, ff):
+        laminar = (Re < 500) & (Re > 50)
+        Nu = np.where(laminar,
+                      0.3942*Re**0.5473*Pr**0.3*(mu_f/mu_w)**0.14,
+                      0.1579*Re**0.6463*Pr**0.3)
+        flag = np.where(laminar, 0, range_flag(Re, 2000, 20000))
+        return check_result(self.logger, "He-Qing-Qiong", Nu, flag, return_flag)
+
+    def Saranmanduh_Borjigin_cal(self, Re, Pr, Lambda, ff, return_flag=False):
         """
         Saranmanduh Borjigin nu 计算公式
         适用范围：Re 3000~100000,气-气板式换热器
@@ -249,13 +230,10 @@ class Nu_SP_class(object):
         Heat recovery from kitchen by using range hood with gas-gas plate heat exchanger,
         Case Studies in Thermal Engineering, 49,2023.
         """
-        if 3000 < Re < 100000:
-            return (0.5*ff*(Re-1000)*Pr)/(1.07+12.7*(0.5*ff)**0.5*(Pr**(2/3)-1))
-        else:
-            self.logger.error("Saranmanduh Borjigin nu 计算公式仅适用于Re 3000~100000")
-            sys.exit()
+        Nu = (0.5*ff*(Re-1000)*Pr)/(1.07+12.7*(0.5*ff)**0.5*(Pr**(2/3)-1))
+        return check_result(self.logger, "Saranmanduh Borjigin", Nu, range_flag(Re, 3000, 100000), return_flag)
 
-    def Pantzali_MN_cal(self, Re, Pr):
+    def Pantzali_MN_cal(self, Re, Pr, return_flag=False):
         """
         Pantzali, M.N. 等人努塞尔数计算公式
         适用范围：纳米流体作为冷却剂在板式换热器，
@@ -267,9 +245,10 @@ class Nu_SP_class(object):
         Investigating the efficacy of nanofluids as coolants in plate heat exchangers (PHE)[J]. 
         Chemical Engineering Science, 2009, 64(14): 3290-3300.
         """
-        return 0.247*Re**(0.66)*Pr**0.4
+        Nu = 0.247*Re**(0.66)*Pr**0.4
+        return check_result(self.logger, "Pantzali", Nu, range_flag(Re), return_flag)
 
-    def MM_cal(self, Re, Pr, ang_corrugated, projection_coefficient, mu_f, mu_w):
+    def MM_cal(self, Re, Pr, ang_corrugated, projection_coefficient, mu_f, mu_w, return_flag=False):
         """Muley和Manglik拟合的努塞尔计算公式
         适用范围:Re>1000
 
@@ -281,13 +260,22 @@ class Nu_SP_class(object):
         :mu_w: 不确定
         :returns: TODO
         """
-        if 30< ang_corrugated < 60:
-            return (0.2668-0.006967*ang_corrugated+7.244e-5*ang_corrugated**2)*(20.78-50.94*projection_coefficient+41.16*projection_coefficient**2-10.15*projection_coefficient**3)*Re**{0.728+0.0543*math.sin[(math.pi*ang_corrugated)/45+3.7]}*Pr**(1/3)*(mu_f/mu_w)*0.14
-        else:
-            self.logger.error("Muley和Manglik拟合的努塞尔计算公式仅适用于波纹角30°~60°")
-            sys.exit()
-
-    def Nu_SK_cal(self, C1, C2, Re, Pr, Refrigerant, State):
+        ang = ang_corrugated
+        phi = projection_coefficient
+        Nu = (0.2668-0.006967*ang+7.244e-5*ang**2)*(20.78-50.94*phi+41.16*phi**2-10.15*phi**3) \
+            * Re**(0.728+0.0543*np.sin((math.pi*ang)/45+3.7))*Pr**(1/3)*(mu_f/mu_w)**0.14
+        flag = range_flag(Re, 1000) | between_flag(ang, 30, 60, ANGLE_OUT)
+        return check_result(self.logger, "Muley和Manglik", Nu, flag, return_flag)
+
+    # Song和Kim单相经验公式系数: (制冷剂, 状态) -> (Re 范围, Pr 范围, C1, C2)
+    SK_SP_COEF = {
+        ('R-32', 'Vapor'): ((2935, 6311), (1.414, 1.446), 0.07109, 0.7775),
+        ('R-32', 'Liquid'): ((364.9, 911.9), (1.841, 1.861), 0.01801, 0.9495),
+        ('R-410A', 'Vapor'): ((3189, 6136), (1.678, 1.696), 0.01068, 0.09907),
+        ('R-410A', 'Liquid'): ((346.1, 975.4), (2.374, 2.384), 0.0151, 0.9477),
+    }
+
+    def Nu_SK_cal(self, C1, C2, Re, Pr, Refrigerant, State, return_flag=False):
         """Song和Kim拟合的努塞尔计算公式
         适用条件：1.制冷剂：R-32和R-410A；2.单相流冷凝板式换热器
 
@@ -297,43 +285,16 @@ class Nu_SP_class(object):
         :Pr:液态普朗特数
         :returns:TODO
         """
-        if Refrigerant == 'R-32':
-            if State == 'Vapor':
-                if 2935 < Re < 6311 and 1.414 < Pr < 1.446:
-                    C1 = 0.07109
-                    C2 = 0.7775
-                else:
-                    self.logger.error("输入参数不在适用范围内")
-                    sys.exit()
-            elif State == 'Liquid':
-                if 364.9 < Re < 911.9 and 1.841 < Pr < 1.861:
-                    C1 = 0.01801
-                    C2 = 0.9495
-                else:
-                    self.logger.error("输入参数不在适用范围内")
-                    sys.exit()
-        elif Refrigerant == 'R-410A':
-            if State == 'Vapor':
-                if 3189 < Re < 6136 and 1.678 < Pr < 1.696:
-                    C1 = 0.01068
-                    C2 = 0.09907
-                else:
-                    self.logger.error("输入参数不在适用范围内")
-                    sys.exit()
-            elif State == 'Liquid':
-                if 346.1 < Re < 975.4 and 2.374 < Pr < 2.384:
-                    C1 = 0.0151
-                    C2 = 0.9477
-                else:
-                    self.logger.error("输入参数不在适用范围内")
-                    sys.exit()
+        if (Refrigerant, State) in self.SK_SP_COEF:
+            (Re_lo, Re_hi), (Pr_lo, Pr_hi), C1, C2 = self.SK_SP_COEF[(Refrigerant, State)]
+            flag = range_flag(Re, Re_lo, Re_hi) | between_flag(Pr, Pr_lo, Pr_hi, PR_OUT)
         else:
-            self.logger.error("制冷剂输入错误")
-            sys.exit()
+            C1 = C2 = np.nan
+            flag = np.full(np.broadcast(Re, Pr).shape, OPTION_OUT)
 
-        return C1*Re**C2*Pr**(1/3)
+        return check_result(self.logger, "Song和Kim", C1*Re**C2*Pr**(1/3), flag, return_flag)
 
-    def Nu_Chisholm_cal(self, Re, Pr, ang_corrugated, projection_coefficient):
+    def Nu_Chisholm_cal(self, Re, Pr, ang_corrugated, projection_coefficient, return_flag=False):
         """Chisholm拟合的努塞尔计算公式
         适用范围: 1.1000<Re<40000 2. 波纹角30°~80°
 
@@ -343,33 +304,33 @@ class Nu_SP_class(object):
         :projection_coefficient: 面积投影系数   
         :returns: TODO
         """
-        if 30< ang_corrugated < 80 and 1000 < Re < 40000:
-            return 0.72*Re**0.59*projection_coefficient**0.41*(ang_corrugated/30)**0.66*Pr**0.4
-        else:
-            self.logger.error("Chisholm nu 计算公式仅适用于Re 1000~40000 波纹角30°~80°")
-            sys.exit()
+        Nu = 0.72*Re**0.59*projection_coefficient**0.41*(ang_corrugated/30)**0.66*Pr**0.4
+        flag = range_flag(Re, 1000, 40000) | between_flag(ang_corrugated, 30, 80, ANGLE_OUT)
+        return check_result(self.logger, "Chisholm", Nu, flag, return_flag)
 
-    def Nu_R_D_V_cal(self, Re, Pr):
+    def Nu_R_D_V_cal(self, Re, Pr, return_flag=False):
         """ Ray D R,Das D K,Vajjha R S拟合的努塞尔计算公式
         适用范围: 1. Al2O3/EG:Water(~5 vol.%) 2. 4<Pr<27 3. 150<Re<1500
         :Re: 雷诺数
         :Pr: 普朗特数
         :returns: TODO
         """
-        if 150 < Re < 1500 and 4 < Pr < 27:
-            return 0.3053*Re**0.75*Pr**0.3
-        else:
-            self.logger.error("Ray D R,Das D K,Vajjha R S nu 计算公式仅适用于Re 150~1500 4<Pr<27")
-            sys.exit()
+        Nu = 0.3053*Re**0.75*Pr**0.3
+        flag = range_flag(Re, 150, 1500) | between_flag(Pr, 4, 27, PR_OUT)
+        return check_result(self.logger, "Ray D R,Das D K,Vajjha R S", Nu, flag, return_flag)
 
 class NU_TP_class(object):
 
-    """两相努塞尔计算类"""
+    """两相努塞尔计算类
+
+    与 Nu_SP_class 相同, 超出适用范围的元素返回 NaN, return_flag=True 时同时返回越界原因编码
+    """
 
     def __init__(self):
         """TODO: to be defined. """
+        self.logger = logging.getLogger(__name__)
 
-    def Nu_Wang_cal(self, Cp_f, Delta_T, gamma, Re_L, Pr_l, rho_l, rho_g):
+    def Nu_Wang_cal(self, Cp_f, Delta_T, gamma, Re_L, Pr_l, rho_l, rho_g, return_flag=False):
         """ Wang 将拟合的怒塞尔计算公式
         适用条件: 1. 2500 < Re < 5000 2. 冷凝
         [1] HU S, MA X, ZHOU W. Condensation heat transfer of ethanol-water vapor in a plate heat exchanger[J/OL]. Applied Thermal Engineering, 2017, 113: 1047-1055. DOI:10.1016/j.applthermaleng.2016.11.013.
@@ -382,14 +343,17 @@ class NU_TP_class(object):
         :rho_l: 液态密度 kg/m^3
         :rho_g: 气态密度 kg/m^3
         """
-        if 2500 < Re_L < 5000:
-            H = Cp_f*Delta_T/gamma  # H 表示冷凝膜对冷凝传热影响的无量纲参数
-            return 0.00115*(Re_L/H)**0.983*Pr_l**0.33*(rho_l/rho_g)**0.248
-        else:
-            self.logger.error("Wang nu 计算公式仅适用于Re 2500~5000")
-            sys.exit()
+        H = Cp_f*Delta_T/gamma  # H 表示冷凝膜对冷凝传热影响的无量纲参数
+        Nu = 0.00115*(Re_L/H)**0.983*Pr_l**0.33*(rho_l/rho_g)**0.248
+        return check_result(self.logger, "Wang", Nu, range_flag(Re_L, 2500, 5000), return_flag)
+
+    # Song和Kim两相经验公式系数: 制冷剂 -> (Re_eq 范围, Pr_l 范围, Co 范围, C1, C2, C3)
+    SK_TP_COEF = {
+        'R-32': ((732.1, 3797), (1.855, 1.988), (0.042, 0.889), 0.4514, 0.7442, 0.5059),
+        'R-410A': ((732.1, 3797), (1.855, 1.988), (0.042, 0.889), 0.9237, 0.6316, 0.5927),
+    }
 
-    def Nu_SK_cal(self, C1, C2, C3, Re_eq, Pr_l, Co, Refrigerant):
+    def Nu_SK_cal(self, C1, C2, C3, Re_eq, Pr_l, Co, Refrigerant, return_flag=False):
         """Song和Kim拟合的努塞尔计算公式
         适用条件：1.制冷剂：R-32和R-410A；2.两相流冷凝板式换热器
 
@@ -402,31 +366,16 @@ class NU_TP_class(object):
         :Refrigerant:制冷剂
         :returns:TODO
         """
-        if Refrigerant == 'R-32':
-
-            if 732.1 < Re_eq < 3797 and 1.855 < Pr_l < 1.988 and 0.042 < Co < 0.889:
-                C1 = 0.4514
-                C2 = 0.7442
-                C3 = 0.5059
-            else:
-                self.logger.error("输入参数不在适用范围内")
-                sys.exit()
-
-        elif Refrigerant == 'R-410A':
-            if 732.1 < Re_eq < 3797 and 1.855 < Pr_l < 1.988 and 0.042 < Co < 0.889:
-                C1 = 0.9237
-                C2 = 0.6316
-                C3 = 0.5927
-            else:
-                self.logger.error("输入参数不在适用范围内")
-                sys.exit()
-
+        if Refrigerant in self.SK_TP_COEF:
+            (Re_lo, Re_hi), (Pr_lo, Pr_hi), (Co_lo, Co_hi), C1, C2, C3 = self.SK_TP_COEF[Refrigerant]
+            flag = range_flag(Re_eq, Re_lo, Re_hi) | between_flag(Pr_l, Pr_lo, Pr_hi, PR_OUT) \
+                | between_flag(Co, Co_lo, Co_hi, CO_OUT)
         else:
-            self.logger.error("制冷剂输入错误")
-            sys.exit()
-        return C1*Re_eq**C2*Co**C3 * Pr_l**(1/3)
+            C1 = C2 = C3 = np.nan
+            flag = np.full(np.broadcast(Re_eq, Pr_l, Co).shape, OPTION_OUT)
+        return check_result(self.logger, "Song和Kim", C1*Re_eq**C2*Co**C3 * Pr_l**(1/3), flag, return_flag)
 
-    def Nu_Behrozifard_cal(self, D, L, Re, Pr):
+    def Nu_Behrozifard_cal(self, D, L, Re, Pr, return_flag=False):
         """Behrozifard拟合的努塞尔计算公式
         适用范围: 1.Re<2300 
 
@@ -436,13 +385,10 @@ class NU_TP_class(object):
         :Pr: 普朗特数
         :returns: TODO
         """
-        if Re < 2300:
-            return 3.66+[0.0668*(D/L)*Re*Pr]/{1+0.04[(D/L)*Pr]**(2/3)}
-        else:
-            self.logger.error("Behrozifard nu 计算公式仅适用于Re < 2300")
-            sys.exit()
+        Nu = 3.66+(0.0668*(D/L)*Re*Pr)/(1+0.04*((D/L)*Pr)**(2/3))
+        return check_result(self.logger, "Behrozifard", Nu, range_flag(Re, None, 2300), return_flag)
 
-    def Nu_Wang_zq_cal(self, Re_eq, Re_lo, Pr, Fr, Bd):
+    def Nu_Wang_zq_cal(self, Re_eq, Re_lo, Pr, Fr, Bd, return_flag=False):
         """王志奇拟合的努塞尔计算公式
         适用范围: 1.100<Re<1000 
 
@@ -453,8 +399,5 @@ class NU_TP_class(object):
         :Bd: 表面张力对传热的影响系数
         :returns: TODO
         """
-        if 100 < Re_eq < 1000:
-            return 2.2891*Re_eq**1.44*Re_lo**(-0.84)*Pr**(1/3)*Fr**(-0.478)*Bd**(0.757)
-        else:
-            self.logger.error("王志奇 nu 计算公式仅适用于Re 100~1000")
-            sys.exit()
+        Nu = 2.2891*Re_eq**1.44*Re_lo**(-0.84)*Pr**(1/3)*Fr**(-0.478)*Bd**(0.757)
+        return check_result(self.logger, "王志奇", Nu, range_flag(Re_eq, 100, 1000), return_flag)
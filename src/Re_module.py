@@ -82,4 +82,4 @@ class Re_class(object):
         :X_m: 干度 kg
         :returns: Re_eq 等效雷诺数
         """
-        return q_h/A(1-X_m)*D_h/mu_l
+        return q_h/A*(1-X_m)*D_h/mu_l
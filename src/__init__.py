@@ -0,0 +1,97 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 14:36:08 +0800
+LastEditTime : 2026-10-18 14:36:08 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/__init__.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 换热器校核计算库接口
+# 导入本包不读取配置文件、不配置日志、不加载 numpy/rich, 以下名称在首次访问时才导入对应子模块
+
+import importlib
+
+_EXPORTS = {
+    "ConfigParser": "config_module",
+    "INPUT_KEYS": "batch_module",
+    "config_to_batch": "batch_module",
+    "columns_to_batch": "batch_module",
+    "Thermal_batch_cal": "batch_module",
+    "Thermal_iter_batch_cal": "batch_module",
+    "Hydraulic_batch_cal": "batch_module",
+    "Rating_batch_cal": "batch_module",
+    "Rating_cal": "batch_module",
+    "Rating_cases_cal": "batch_module",
+    "Thermal_cal": "batch_module",
+    "Hydraulic_cal": "batch_module",
+    "March_batch_cal": "march_module",
+    "March_cal": "march_module",
+    "condense_to_batch": "condense_module",
+    "Compare_batch_cal": "compare_module",
+    "Compare_cal": "compare_module",
+    "Heat_exchanger_network": "network_module",
+    "Network_cal": "network_module",
+    "Surrogate_table": "surrogate_module",
+    "Transient_batch_cal": "transient_module",
+    "Transient_cal": "transient_module",
+    "transient_to_batch": "transient_module",
+    "SURROGATE_AXES": "surrogate_module",
+    "Condense_batch_cal": "condense_module",
+    "Condense_cal": "condense_module",
+    "Nu_SP_class": "Nu_module",
+    "NU_TP_class": "Nu_module",
+    "f_SP_class": "F_module",
+    "f_TP_class": "F_module",
+    "Re_class": "Re_module",
+    "property_tables": "property_module",
+    "load_property_table": "property_module",
+    "size_area": "sizing_module",
+    "plate_count": "sizing_module",
+    "run_sweep": "sweep_module",
+    "write_sweep": "sweep_module",
+    "optimize_geometry": "optimize_module",
+    "evaluate_geometry": "optimize_module",
+    "run_stream": "stream_module",
+    "run_server": "server_module",
+    "Calculation_server": "server_module",
+    "calibrate": "calibration_module",
+    "Rating_sensitivity_batch_cal": "sensitivity_module",
+    "Rating_sensitivity_cal": "sensitivity_module",
+    "Dual": "dual_module",
+    "run_montecarlo": "montecarlo_module",
+    "Stream_stats": "montecarlo_module",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value  # 缓存, 之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
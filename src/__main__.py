@@ -26,240 +26,429 @@ Description  :
  -----------------------------------------------------------------------
 '''
 
-import math
+import argparse
+import sys
+from pathlib import Path
 
-from rich import print
-
-from config_module import ConfigParser
-from F_module import f_SP_class
-from logger_config import setup_logger
-from Nu_module import *
-from Re_module import *
-
-logger = setup_logger(True)
-CP = ConfigParser()  # 实例化 ConfigParser 类
-
-
-def Pr_cal(cp, k, mu):
-    """计算普朗特数
-
-    :cp: 比热 jk/kg·K
-    :k: 导热系数 W/(m·k)
-    :mu: 动力粘度
-
-    :returns: Pr 普朗特数
-
-    """
-    return cp * mu / k
-
-
-# 计算平壁换热系数
-def k_plane_cal(h_h, h_c, sigma, k_s):
-    """计算平壁的换热系数
-
-    :h_h: 热侧表面传热系数
-    :h_c: 冷侧表面传热系数
-    :sigma: 固体厚度
-    :k_s: 固体导热率 (W/(m·k))
-    :returns: k 返回平壁换热系数
-
-    """
-    k = 1 / (1 / h_h + sigma / k_s + 1 / h_c)
-    return k
-
-
-# 计算表面换热系数
-def h_cal(Nu, k_f, D_h):
-    """计算液体表面换热系数
-
-    :Nu: 努塞尔数 
-    :k_f: 液体导热率 (W/(m·k))
-    :D_h: 水力直径
-    :returns: h_cal 表面换热系数
-    """
-    return Nu * k_f / D_h
-
-
-class D_h_class(object):
-    """计算水力直径类"""
-
-    def __init__(self):
-        """无 """
-
-    def common_cal(self, A, U):
-        """水力直径通用计算方法
-
-        :A: 截面积 m^2
-        :U: 周长 m
-        :returns: D_h 水力直径 m
-
-        """
-        return 4 * A / U
-
-    def Corrugate_cal(self, L_w, d_corrugate):
-        """波纹板换水力直径计算
-        来源于 《热交换原理与设计》史美中 135 页
-        :L_w: 板有效宽度 m
-        :d_corrugate: 波纹深度 m
-        :returns: D_h 水力直径 m
-
-        """
-
-        return 4 * L_w * d_corrugate / (2 * (d_corrugate + L_w))
-
-
-def lmtd_cal(t_hin, t_hout, t_cin, t_cout):
-    DeltaT_in = t_hin - t_cin
-    DeltaT_out = t_hout - t_cout
-    DeltaT_max = max(DeltaT_in, DeltaT_out)
-    DeltaT_min = min(DeltaT_in, DeltaT_out)
-    DeltaT_m = math.log((DeltaT_max - DeltaT_min) / (DeltaT_max / DeltaT_min))
-    logger.info(f"LMTD 为：{DeltaT_m}")
-    return DeltaT_m
-
-
-# 判断获取最大和最小热容量: qc_max, qc_min
-def judge(q_hm, cp_h, q_cm, cp_c):
-    qc_h = q_hm * cp_h
-    qc_c = q_cm * cp_c
-    qc_max = max(qc_h, qc_c)
-    qc_min = min(qc_h, qc_c)
-    return qc_max, qc_min
-
-
-# 计算 NTU
-def ntu_cal(k, A, qc_min):
-    res_ntu = k * A / qc_min
-    logger.info(f"NTU 为：{res_ntu}")
-    return res_ntu
-
-
-# 计算 R_c
-def R_c(qc_max, qc_min):
-    return qc_min / qc_max
+if not __package__:
+    # 以 python src 方式运行时按包导入, 使模块内的相对导入可用
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    __package__ = Path(__file__).resolve().parent.name
+    __import__(__package__)
 
+import numpy as np
+from rich import print
 
-# 计算 epsilon
-def epsilon_cal(FD_num, phase_change, ntu, R_c):
-    '''
-    名称 编号 英文名称
-    顺流：1 parallel flow
-    逆流：2 counter flow
-    '''
-    if FD_num == 1:
-        if phase_change:
-            R_c = 0
-        res_epsilon = (1 - math.exp(-ntu * (1 + R_c))) / (1 + R_c)
-    if FD_num == 2:
-        if phase_change:
-            R_c = 0
-        res_epsilon = (1 - math.exp(-ntu * (1 - R_c))) / (1 - R_c * math.exp(-ntu * (1 - R_c)))
-    logger.info(f"epsilon 为：{res_epsilon}")
-    return res_epsilon
-
-
-def Delta_P(f, L, D_h, rho, v):
-    """计算压降
-
-    :f: 摩擦因子，通过经验公式估算
-    :L: 流动长度，通常为板式换热器的通道长度 m
-    :D_h: 水力直径 m
-    :rho: 密度 kg/m^3
-    :v: 流速 m/s
-    :returns: 压降 Pa
-
-    """
-    return f * L / D_h * rho * v**2 / 2
-
-
-cd = CP.init_config_file()  # 初始化配置文件，获取配置文件中的参数 config_dict : cd
-t_hin = cd["BC"]["Temp_heat_inlet"]
-#  t_hout = cd["BC"]["Temp_heat_outlet"]
-t_cin = cd["BC"]["Temp_cool_inlet"]
-#  t_cout = cd["BC"]["Temp_cool_outlet"]
-
-q_hm = cd["BC"]["Mass_flow_heat"]
-q_cm = cd["BC"]["Mass_flow_cool"]
-
-FD = cd["SP"]["Flow_direction"]
-D_h = cd["SP"]["Hydraulic_diameter"]
-A = cd["SP"]["Cross_sectional_area"]
-L_w = cd["SP"]["Effective_width"]
-d_corrugate = cd["SP"]["Ripple_depth"]
-sigma = cd["SP"]["Plate_thickness"]
-
-k_s = cd["SPP"]["Thermal_conductivity"]
-
-rho_h = cd["FHSPPP"]["Density"]
-cp_h = cd["FHSPPP"]["Specific_heat_capacity"]
-k_fh = cd["FHSPPP"]["Thermal_conductivity"]
-mu_h = cd["FHSPPP"]["Dynamic_viscosity"]
-h_h = cd["FHSPPP"]["Enthalpy"]
-
-rho_c = cd["FCSPPP"]["Density"]
-cp_c = cd["FCSPPP"]["Specific_heat_capacity"]
-k_fc = cd["FCSPPP"]["Thermal_conductivity"]
-mu_c = cd["FCSPPP"]["Dynamic_viscosity"]
-h_c = cd ["FCSPPP"]["Enthalpy"]
-
-
-def Thermal_cal():
-    qc_max, qc_min = judge(q_hm, cp_h, q_cm, cp_c)
-    rc = R_c(qc_max, qc_min)
-    Dh_class = D_h_class()
-    D_h = Dh_class.Corrugate_cal(L_w, d_corrugate)
-
-    Re = Re_class()
-    Re_h = Re.common_cal(q_hm, A, mu_h, rho_h)
-    Re_c = Re.common_cal(q_cm, A, mu_c, rho_c)
-
-    Pr_h = Pr_cal(cp_h, k_fh, mu_h)
-    Pr_c = Pr_cal(cp_c, k_fc, mu_c)
-
-    Nu_SP = Nu_SP_class()
-    Nu_h = Nu_SP.Okada_cal(Re_h, Pr_h, 60)
-    Nu_c = Nu_SP.Okada_cal(Re_c, Pr_c, 60)
-
-    h_h = h_cal(Nu_h, k_fh, D_h)
-    h_c = h_cal(Nu_c, k_fc, D_h)
-
-    k = k_plane_cal(h_h, h_c, sigma, k_s)
-    ntu = ntu_cal(k, A, qc_min)
-    epsilon = epsilon_cal(FD, False, ntu, rc)
-
-    # tmtd = lmtd_cal(t_hin, t_hout, t_cin, t_cout)
-
-    Phi_res = epsilon * qc_min * (t_hin - t_cin)
-    t_hout_res = t_hin - Phi_res / (q_hm * cp_h)
-    t_cout_res = t_cin + Phi_res / (q_cm * cp_c)
-
-    return Phi_res, t_hout_res, t_cout_res
-
-
-def Hydraulic_cal():
-    Re = Re_class()
-    Re_h = Re.common_cal(q_hm, A, mu_h, rho_h)
-    Re_c = Re.common_cal(q_cm, A, mu_c, rho_c)
-
-    v_h = q_hm / rho_h / D_h
-    v_c = q_cm / rho_c / D_h
-
-    F_class = f_SP_class()
-    f_h = F_class.YY_Hsich_cal(Re_h)
-    f_c = F_class.YY_Hsich_cal(Re_c)
-
-    Delta_P_h = Delta_P(f_h, 0.25, D_h, rho_h, v_h)
-    Delta_P_c = Delta_P(f_c, 0.25, D_h, rho_c, v_c)
-
-    return Delta_P_h, Delta_P_c
-
-
-Phi, t_hout, t_cout = Thermal_cal()
-Delta_P_h, Delta_P_c = Hydraulic_cal()
-print(f"换热量：{round(Phi,4)} W")
-print(f"热侧出口温度：{round(t_hout,4)} °C")
-print(f"冷侧出口温度：{round(t_cout,4)} °C")
-print(f"热侧压降：{round(Delta_P_h, 4)} Pa")
-print(f"冷侧压降：{round(Delta_P_c, 4)} Pa")
-
-#
+from . import cache_module as cache
+from . import instrument_module as instrument
+from . import jit_module as jit
+from .batch_module import Rating_cal, Rating_cases_cal, config_to_batch
+from .calibration_module import calibrate
+from .compare_module import F_CORRELATIONS, NU_CORRELATIONS, Compare_cal, run_compare_stream
+from .condense_module import Condense_cal
+from .config_module import ConfigParser
+from .io_module import read_csv, write_csv
+from .logger_config import setup_logger
+from .march_module import March_cal
+from .montecarlo_module import MC_OUTPUTS, parse_uncertainty_spec, run_montecarlo
+from .network_module import EXAMPLE_NETWORK, Heat_exchanger_network
+from .optimize_module import OPT_OBJECTIVES, optimize_geometry, parse_bound_spec
+from .sizing_module import plate_count, size_area
+from .sensitivity_module import SENSITIVITY_OUTPUTS, Rating_sensitivity_cal
+from .server_module import run_server
+from .stream_module import run_stream
+from .surrogate_module import SURROGATE_METHODS, SURROGATE_OUTPUTS, Surrogate_table, parse_range_spec
+from .sweep_module import parse_sweep_spec, run_sweep, write_sweep
+from .transient_module import run_transient
+
+
+def sweep(cd, args):
+    axes = dict(parse_sweep_spec(spec) for spec in args.sweep)
+    if args.output:
+        total, n_bad = write_sweep(cd, axes, args.output, workers=args.workers, chunk_size=args.chunk_size)
+        print(f"参数扫描完成：共 {total} 个工况，其中 {n_bad} 个超出经验公式适用范围")
+        print(f"扫描结果已写入：{args.output}")
+    else:
+        columns = run_sweep(cd, axes, workers=args.workers, chunk_size=args.chunk_size)
+        n_bad = int((columns["flag"] != 0).sum())
+        print(f"参数扫描完成：共 {len(columns['flag'])} 个工况，其中 {n_bad} 个超出经验公式适用范围")
+        print(",".join(columns))
+        for row in zip(*columns.values()):
+            print(",".join(f"{v:.6g}" for v in row))
+
+
+def montecarlo(cd, args):
+    uncertainties = dict(parse_uncertainty_spec(spec) for spec in args.uncertainty)
+    res = run_montecarlo(cd, uncertainties, args.samples, seed=args.seed, workers=args.workers,
+                         chunk_size=args.chunk_size)
+    print(f"蒙特卡洛计算完成：共 {res['n_samples']} 个样本，其中 {res['n_flagged']} 个超出经验公式适用范围")
+    for name in MC_OUTPUTS:
+        stats = res[name]
+        percentiles = "，".join(f"{k[1:]}% 分位 {v:.6g}" for k, v in stats.items() if k.startswith("p"))
+        print(f"{name}：均值 {stats['mean']:.6g}，标准差 {stats['std']:.6g}，{percentiles}，无效样本 {stats['n_nan']}")
+
+
+def calibration(cd, args):
+    for res in calibrate(cd, read_csv(args.calibrate)):
+        params = "，".join(f"{k} = {v:.6g}" for k, v in res["params"].items())
+        print(f"{res['correlation']} 拟合结果：{params}")
+        print(f"  有效数据 {res['rows']} 行，迭代 {res['iterations']} 次，"
+              f"均方根残差 {res['rmse_initial']:.6g} → {res['rmse']:.6g}")
+
+
+def design(cd, args):
+    target, _, value = args.design.partition("=")
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"无法识别的设计目标: {args.design}")
+    A, converged = size_area(config_to_batch(cd), target.strip(), value)
+    if not converged:
+        print(f"无法达到设计目标：{args.design}")
+        return
+    print(f"所需换热面积：{round(float(A), 6)} m^2")
+    if args.plate_area:
+        print(f"所需板片数：{int(plate_count(A, args.plate_area))}")
+
+
+def march(cd, args):
+    res = March_cal(cd, args.segments)
+    print(f"沿程分段计算：共 {args.segments} 段")
+    print(f"换热量：{round(res['Phi'],4)} W")
+    print(f"热侧出口温度：{round(res['t_hout'],4)} °C")
+    print(f"冷侧出口温度：{round(res['t_cout'],4)} °C")
+    print(f"热侧压降：{round(res['Delta_P_h'], 4)} Pa")
+    print(f"冷侧压降：{round(res['Delta_P_c'], 4)} Pa")
+    if args.output:
+        write_csv(args.output, {"x": res["x"], "T_h": res["T_h"], "T_c": res["T_c"]})
+        print(f"沿程温度分布已写入：{args.output}")
+
+
+def condense(cd, args):
+    n_seg = args.segments or 50
+    res = Condense_cal(cd, n_seg)
+    print(f"冷凝校核：共 {n_seg} 段")
+    print(f"换热量：{round(res['Phi'],4)} W")
+    print(f"出口干度：{round(res['X_out'],4)}")
+    print(f"冷侧出口温度：{round(res['t_cout'],4)} °C")
+    print(f"热侧压降：{round(res['Delta_P_h'], 4)} Pa")
+    print(f"冷侧压降：{round(res['Delta_P_c'], 4)} Pa")
+    if args.output:
+        write_csv(args.output, {"x": res["x"], "X": res["X"], "T_c": res["T_c"]})
+        print(f"沿程干度与冷侧温度分布已写入：{args.output}")
+
+
+def optimize(cd, args):
+    bounds = dict(parse_bound_spec(spec) for spec in args.bound or ())
+    angles = bounds.pop("ang", None) or (30, 45, 60, 75)
+    res = optimize_geometry(cd, args.optimize, duty=args.duty, max_dp=args.max_dp, bounds=bounds, angles=angles,
+                            generations=args.generations, seed=args.seed, workers=args.workers)
+    state = "满足约束" if res["feasible"] else "未满足约束"
+    print(f"几何优化完成 ({state})：{res['generations']} 代，{res['evaluations']} 次计算")
+    for key, v in res["geometry"].items():
+        print(f"{key} = {v:.6g}")
+    print(f"换热量：{res['Phi']:.6g} W (约束 ≥ {res['duty']:.6g} W)")
+    print(f"热侧压降：{res['Delta_P_h']:.6g} Pa，冷侧压降：{res['Delta_P_c']:.6g} Pa")
+    print(f"换热面积：{res['area']:.6g} m^2，板片质量：{res['mass']:.6g} kg")
+
+
+def compare(cd, args):
+    if args.compare:
+        if not args.output:
+            raise ValueError("对工况文件做经验公式比较需要指定 --output")
+        total = run_compare_stream(cd, args.compare, args.output, args.chunk_size)
+        print(f"经验公式比较完成：共 {total} 个工况，结果已写入：{args.output}")
+        return
+    res = Compare_cal(cd)
+    print("努塞尔数公式,换热量 W,热侧出口温度 °C,冷侧出口温度 °C,有效")
+    for name in NU_CORRELATIONS:
+        print(f"{name},{res[f'Phi.{name}']:.6g},{res[f't_hout.{name}']:.6g},{res[f't_cout.{name}']:.6g},"
+              f"{res[f'valid.{name}']}")
+    print("摩擦因子公式,热侧压降 Pa,热侧有效,冷侧压降 Pa,冷侧有效")
+    for name in F_CORRELATIONS:
+        print(f"{name},{res[f'Delta_P_h.{name}']:.6g},{res[f'valid_h.{name}']},"
+              f"{res[f'Delta_P_c.{name}']:.6g},{res[f'valid_c.{name}']}")
+    for quantity in ("Phi", "Delta_P_h", "Delta_P_c"):
+        print(f"{quantity} 包络：{res[f'{quantity}_min']:.6g} ~ {res[f'{quantity}_max']:.6g}，"
+              f"均值 {res[f'{quantity}_mean']:.6g}，相对离散度 {res[f'{quantity}_spread']:.4g}，"
+              f"有效公式 {res[f'{quantity}_n_valid']} 个")
+
+
+def surrogate_build(cd, args):
+    ranges = dict(parse_range_spec(spec) for spec in args.range or ())
+    table = Surrogate_table.build(cd, ranges)
+    table.save(args.surrogate_build)
+    grid = "×".join(str(a.size) for a in table.axes)
+    print(f"代理表格建立完成：网格 {grid}，已保存至：{args.surrogate_build}")
+    print("插值方法,输出,最大绝对误差,最大相对误差")
+    for method, errors in table.error.items():
+        for name, err in errors.items():
+            print(f"{method},{name},{err['abs']:.4g},{err['rel']:.4g}")
+
+
+def surrogate(cd, args):
+    table = Surrogate_table.load(args.surrogate, cd)
+    bi = config_to_batch(cd)
+    res = table.query(bi["q_hm"], bi["q_cm"], bi["t_hin"], bi["t_cin"], method=args.method)
+    errors = table.error[args.method]
+    print(f"代理表格查询 ({args.method} 插值)，括号内为校核点最大绝对误差")
+    for name, label, unit in zip(SURROGATE_OUTPUTS, ("换热量", "热侧出口温度", "冷侧出口温度", "热侧压降", "冷侧压降"),
+                                 ("W", "°C", "°C", "Pa", "Pa")):
+        print(f"{label}：{float(res[name]):.6g} {unit} (±{errors[name]['abs']:.2g})")
+
+
+def network(cd, args):
+    path = Path(args.network)
+    if not path.exists():
+        path.write_text(EXAMPLE_NETWORK, encoding="utf-8")
+        print(f"网络文件不存在，已生成示例：{path}")
+    net = Heat_exchanger_network.load(path, cd)
+    if args.points:
+        if not args.output:
+            raise ValueError("对工况文件做网络计算需要指定 --output")
+        columns = read_csv(args.points)
+        sources = {name: {key: columns[col] for key, col in (("flow", f"q.{name}"), ("temp", f"T.{name}"))
+                          if col in columns} for name in net.sources}
+        res = net.rate(sources)
+        write_csv(args.output, {**columns, **res})
+        print(f"网络计算完成：共 {len(res['Phi'])} 个工况点，结果已写入：{args.output}")
+        return
+    res = {k: v.item() for k, v in net.rate().items()}
+    print("换热器,换热量 W,热侧压降 Pa,冷侧压降 Pa,越界原因编码")
+    for name, *_ in net.units:
+        print(f"{name},{res[f'Phi.{name}']:.6g},{res[f'Delta_P_h.{name}']:.6g},{res[f'Delta_P_c.{name}']:.6g},"
+              f"{res[f'flag.{name}']}")
+    print("流股,流量 kg/s,温度 °C")
+    for name in net.streams:
+        print(f"{name},{res[f'q.{name}']:.6g},{res[f'T.{name}']:.6g}")
+    print(f"总换热量：{res['Phi']:.6g} W")
+
+
+def sensitivity(cd):
+    res = Rating_sensitivity_cal(cd)
+    jac = res["jacobian"]
+    print("输入," + ",".join(f"d{out}" for out in SENSITIVITY_OUTPUTS))
+    for key in jac[SENSITIVITY_OUTPUTS[0]]:
+        print(key + "," + ",".join(f"{jac[out][key]:.6g}" for out in SENSITIVITY_OUTPUTS))
+
+
+def run_cases(CP, args):
+    case_list = CP.load_cases()
+    res = Rating_cases_cal(case_list)
+    n_bad = int((res["flag"] != 0).sum())
+    print(f"多工况计算完成：共 {len(case_list)} 个工况，其中 {n_bad} 个超出经验公式适用范围")
+    if args.output:
+        write_csv(args.output, {"case": np.arange(len(case_list)), **res})
+        print(f"多工况结果已写入：{args.output} (case 列为工况序号)")
+        return
+    for i, (name, _) in enumerate(case_list):
+        print(f"{name}：换热量 {res['Phi'][i]:.6g} W，热侧出口温度 {res['t_hout'][i]:.6g} °C，"
+              f"冷侧出口温度 {res['t_cout'][i]:.6g} °C，热侧压降 {res['Delta_P_h'][i]:.6g} Pa，"
+              f"冷侧压降 {res['Delta_P_c'][i]:.6g} Pa")
+
+
+def run(parser, args, CP, cd):
+    if args.serve:
+        run_server(cd, args.serve, workers=args.workers)
+        return
+
+    if args.cases:
+        try:
+            run_cases(CP, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.stream:
+        if not args.output:
+            parser.error("流式计算需要指定 --output")
+        try:
+            total = run_stream(cd, args.stream, args.output, args.chunk_size)
+        except ImportError as e:
+            parser.error(str(e))
+        print(f"流式计算完成：共 {total} 个工况，结果已写入：{args.output}")
+        return
+
+    if args.transient:
+        if not args.output:
+            parser.error("瞬态计算需要指定 --output")
+        try:
+            n_t, m = run_transient(cd, args.transient, args.output, args.chunk_size, args.segments or 20,
+                                   holdup=not args.no_holdup)
+        except (ValueError, ImportError) as e:
+            parser.error(str(e))
+        print(f"瞬态计算完成：{m} 台换热器，共 {n_t} 个时刻，结果已写入：{args.output}")
+        return
+
+    if args.sweep:
+        try:
+            sweep(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.uncertainty:
+        try:
+            montecarlo(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.calibrate:
+        try:
+            calibration(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.design:
+        try:
+            design(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.compare is not None:
+        try:
+            compare(cd, args)
+        except (ValueError, ImportError) as e:
+            parser.error(str(e))
+        return
+
+    if args.optimize:
+        try:
+            optimize(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.network:
+        try:
+            network(cd, args)
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+        return
+
+    if args.surrogate_build:
+        try:
+            surrogate_build(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.surrogate:
+        try:
+            surrogate(cd, args)
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+        return
+
+    if args.sensitivity:
+        sensitivity(cd)
+        return
+
+    if args.condense:
+        try:
+            condense(cd, args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if args.segments:
+        march(cd, args)
+        return
+
+    res = Rating_cal(cd)
+    print(f"换热量：{round(res['Phi'],4)} W")
+    print(f"热侧出口温度：{round(res['t_hout'],4)} °C")
+    print(f"冷侧出口温度：{round(res['t_cout'],4)} °C")
+    print(f"热侧压降：{round(res['Delta_P_h'], 4)} Pa")
+    print(f"冷侧压降：{round(res['Delta_P_c'], 4)} Pa")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="换热器校核计算 (根据经验公式)")
+    parser.add_argument("-s", "--sweep", action="append", metavar="KEY=VALUES",
+                        help="扫描参数, 可多次指定, 如 BC.Mass_flow_heat=0.1:0.5:9 或 SP.Flow_direction=1,2")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="扫描及蒙特卡洛计算进程数, 默认为 CPU 核数")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="扫描、流式及蒙特卡洛计算时每块工况数")
+    parser.add_argument("-o", "--output", help="扫描或流式计算结果输出路径 (CSV 或 Parquet)")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="ADDRESS",
+                        help="以常驻服务方式运行, 在本机 HTTP 上提供 JSON-RPC 2.0 接口 (rating、sizing、sweep), "
+                        "ADDRESS 为 HOST:PORT (默认 127.0.0.1:8765) 或 unix:套接字路径")
+    parser.add_argument("--cases", action="store_true",
+                        help="计算参数文件中全部 [[case]] 工况, 各工况继承基准参数, 结果输出到屏幕或 --output")
+    parser.add_argument("--stream", metavar="INPUT",
+                        help="流式批量校核, 分块读取工况文件 (CSV 或 Parquet) 并将结果写入 --output")
+    parser.add_argument("--transient", metavar="INPUT",
+                        help="瞬态计算, 读取按时间排序的运行记录 (time 列为时刻 s, 每个时刻每台换热器一行) "
+                        "并将逐时刻出口温度、换热量与板片温度写入 --output; 单元数由 --segments 指定 (默认 20)")
+    parser.add_argument("--no-holdup", action="store_true", help="瞬态计算时不计流道内流体的热容, 只计板片热容")
+    parser.add_argument("-u", "--uncertainty", action="append", metavar="KEY=SIGMA",
+                        help="蒙特卡洛不确定度传递, 可多次指定, 如 BC.Temp_heat_inlet=0.5、BC.Mass_flow_heat=2%%、"
+                        "FHSPPP.Density=1%%:uniform (正态分布为标准差, 均匀分布为半宽)")
+    parser.add_argument("--samples", type=int, default=100000, help="蒙特卡洛样本数")
+    parser.add_argument("--seed", type=int, default=0, help="蒙特卡洛随机数种子")
+    parser.add_argument("-c", "--calibrate", metavar="CSV",
+                        help="根据实测数据 CSV 拟合经验公式系数, 列名同配置键, "
+                        "实测值列为 BC.Temp_heat_outlet、BC.Temp_cool_outlet、Delta_P_h、Delta_P_c")
+    parser.add_argument("-d", "--design", metavar="TARGET=VALUE",
+                        help="设计计算, 求达到目标所需的换热面积, TARGET 可为 Phi、t_hout、t_cout")
+    parser.add_argument("--plate-area", type=float, help="设计计算时单张板片换热面积 m^2, 用于计算板片数")
+    parser.add_argument("-n", "--segments", type=int,
+                        help="沿流动方向分段计算的段数, 指定 --output 时输出沿程温度分布")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="计算换热量、出口温度与压降对各配置项的导数 (前向自动微分)")
+    parser.add_argument("--condense", action="store_true",
+                        help="热侧冷凝校核, 两相物性取配置 [FHTPPP], 沿程推进干度, 段数由 --segments 指定 (默认 50)")
+    parser.add_argument("--compare", nargs="?", const="", metavar="INPUT",
+                        help="比较全部单相努塞尔数与摩擦因子经验公式, 给出有效性与包络; "
+                        "指定工况文件 (CSV 或 Parquet) 时逐块计算并写入 --output")
+    parser.add_argument("--optimize", choices=OPT_OBJECTIVES,
+                        help="几何优化 (差分进化), 目标为板片质量 mass、换热面积 area 或两侧压降之和 pressure")
+    parser.add_argument("--duty", type=float, help="几何优化的换热量下限 W, 默认为当前几何的换热量")
+    parser.add_argument("--max-dp", type=float, help="几何优化的单侧压降上限 Pa")
+    parser.add_argument("--bound", action="append", metavar="KEY=RANGE",
+                        help="几何优化变量范围, 可多次指定, 如 SP.Effective_width=0.1:0.3、plates=10:60、ang_corrugated=45,60")
+    parser.add_argument("--generations", type=int, default=1000, help="几何优化最大代数")
+    parser.add_argument("--network", metavar="FILE",
+                        help="换热器网络计算, 读取网络文件 (TOML, 不存在时生成示例), 各换热器参数在本配置基础上覆盖")
+    parser.add_argument("--points", metavar="CSV",
+                        help="网络计算的工况点文件, 列名 q.<流股>、T.<流股> 覆盖来源流股的流量与温度, 结果写入 --output")
+    parser.add_argument("--surrogate-build", metavar="DIR",
+                        help="对当前几何建立代理响应面表格 (两侧流量与入口温度网格) 并保存到目录")
+    parser.add_argument("--range", action="append", metavar="KEY=LO:HI",
+                        help="代理表格网格范围, 可多次指定, 如 BC.Mass_flow_heat=0.05:0.3; "
+                        "默认流量为配置值 0.5~1.5 倍, 入口温度为配置值 ±10 °C")
+    parser.add_argument("--surrogate", metavar="DIR", help="以代理表格查询当前配置工况")
+    parser.add_argument("--method", choices=SURROGATE_METHODS, default="linear", help="代理表格插值方法")
+    parser.add_argument("--jit", action="store_true", help="使用 numba 编译的融合计算核加速热力计算 (需安装 numba)")
+    parser.add_argument("--cache", action="store_true",
+                        help=f"缓存单工况、多工况及沿程计算结果, 相同输入直接读取 (缓存于 {cache.DEFAULT_PATH})")
+    parser.add_argument("--clear-cache", action="store_true", help="计算前清空计算结果缓存 (同时开启缓存)")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="开启计算链路统计 (计数、分段计时、数值分布), 结束时写入 JSON 文件")
+    args = parser.parse_args()
+
+    setup_logger(True)
+    CP = ConfigParser()  # 实例化 ConfigParser 类
+    cd = CP.init_config_file()  # 初始化配置文件，获取配置文件中的参数 config_dict : cd
+
+    if args.cache or args.clear_cache:
+        cache.enable()
+        if args.clear_cache:
+            cache.clear()
+    if args.jit:
+        jit.enable()
+    if args.profile:
+        instrument.enable()
+    try:
+        run(parser, args, CP, cd)
+    finally:
+        if args.profile:
+            instrument.export_json(args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 09:40:12 +0800
+LastEditTime : 2026-10-18 09:40:12 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/batch_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import numpy as np
+
+from . import cache_module as cache
+from . import instrument_module as instrument
+from . import jit_module as jit
+from .F_module import f_SP_class
+from .fixed_point_module import anderson_solve
+from .Nu_module import Nu_SP_class
+from .property_module import SIDE_SECTIONS, property_tables, update_properties
+from .Re_module import Re_class
+from .thermal_module import (D_h_class, Delta_P, Pr_cal, R_c, epsilon_cal, h_cal, judge, k_plane_cal,
+                            ntu_cal)
+from .valid_module import NOT_CONVERGED
+
+# 批量计算输入名称与配置文件 (section, key) 的对应关系
+INPUT_KEYS = {
+    "t_hin": ("BC", "Temp_heat_inlet"),  # 热侧入口温度 摄氏度
+    "t_cin": ("BC", "Temp_cool_inlet"),  # 冷侧入口温度 摄氏度
+    "q_hm": ("BC", "Mass_flow_heat"),  # 热侧流量 kg/s
+    "q_cm": ("BC", "Mass_flow_cool"),  # 冷侧流量 kg/s
+    "FD": ("SP", "Flow_direction"),  # 流动方式, 见 thermal_module.FLOW_DIRECTIONS
+    "N_pass": ("SP", "Number_of_passes"),  # 流程数或串联壳程数
+    "D_h": ("SP", "Hydraulic_diameter"),  # 水力直径 m
+    "A": ("SP", "Cross_sectional_area"),  # 截面积 m^2
+    "L_w": ("SP", "Effective_width"),  # 板有效宽度 m
+    "d_corrugate": ("SP", "Ripple_depth"),  # 波纹深度 m
+    "sigma": ("SP", "Plate_thickness"),  # 板厚度 m
+    "k_s": ("SPP", "Thermal_conductivity"),  # 固体导热率
+    "rho_h": ("FHSPPP", "Density"),
+    "cp_h": ("FHSPPP", "Specific_heat_capacity"),
+    "k_fh": ("FHSPPP", "Thermal_conductivity"),
+    "mu_h": ("FHSPPP", "Dynamic_viscosity"),
+    "rho_c": ("FCSPPP", "Density"),
+    "cp_c": ("FCSPPP", "Specific_heat_capacity"),
+    "k_fc": ("FCSPPP", "Thermal_conductivity"),
+    "mu_c": ("FCSPPP", "Dynamic_viscosity"),
+}
+
+# 旧配置文件中可能缺失的输入及其默认值
+INPUT_DEFAULTS = {"N_pass": 1}
+
+# 配置文件键 "Section.Key" 到批量输入名称的对应关系
+CONFIG_KEYS = {f"{section}.{key}": name for name, (section, key) in INPUT_KEYS.items()}
+
+
+def _config_value(cd, name):
+    """配置字典中某一输入的值, 旧配置文件缺失的输入取 INPUT_DEFAULTS"""
+    section, key = INPUT_KEYS[name]
+    if name in INPUT_DEFAULTS:
+        return cd[section].get(key, INPUT_DEFAULTS[name])
+    return cd[section][key]
+
+
+def config_to_batch(cd, **overrides):
+    """由配置字典生成批量计算输入
+
+    :cd: 配置字典 (ConfigParser.init_config_file 的返回值)
+    :overrides: 以 INPUT_KEYS 中的名称覆盖配置值，可为标量或数组
+    :returns: 输入名称到数组的字典，所有数组已广播为相同形状；
+              配置了物性表 (Property_table) 时流体物性取入口温度下的值，显式覆盖的物性除外
+
+    """
+    inputs = {name: _config_value(cd, name) for name in INPUT_KEYS}
+    inputs.update(overrides)
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in inputs.values()])
+    bi = dict(zip(inputs, arrays))
+    return update_properties(bi, property_tables(cd), bi["t_hin"], bi["t_cin"], keep=overrides)
+
+
+def cases_to_batch(cds):
+    """由多个工况的配置字典生成批量输入, 每个工况一行
+
+    :cds: 配置字典列表，各工况的物性表 (Property_table) 配置须相同
+    :returns: 批量输入字典；配置了物性表时流体物性取入口温度下的值
+
+    """
+    bi = {name: np.array([_config_value(cd, name) for cd in cds], dtype=float) for name in INPUT_KEYS}
+    return update_properties(bi, property_tables(cds[0]), bi["t_hin"], bi["t_cin"])
+
+
+def take_rows(bi, idx):
+    """取批量输入字典中的部分行"""
+    return {k: v[idx] for k, v in bi.items()}
+
+
+def column_inputs(columns):
+    """将数据列名映射为批量输入名称, 非输入列忽略
+
+    :columns: 列名到数组的字典，列名可为 "BC.Mass_flow_heat" 形式的配置键或 INPUT_KEYS 中的名称
+    :returns: 批量输入名称到数组的字典
+
+    """
+    inputs = {}
+    for col, values in columns.items():
+        name = CONFIG_KEYS.get(col, col)
+        if name in INPUT_KEYS:
+            inputs[name] = values
+    return inputs
+
+
+def columns_to_batch(cd, columns):
+    """由数据列生成批量计算输入, 缺失的输入取配置文件中的值
+
+    :cd: 配置字典
+    :columns: 列名到数组的字典，列名可为 "BC.Mass_flow_heat" 形式的配置键或 INPUT_KEYS 中的名称，
+              其余列忽略
+    :returns: 批量输入字典
+
+    """
+    return config_to_batch(cd, **column_inputs(columns))
+
+
+def Thermal_Nu_batch_cal(bi, Nu_h, Nu_c):
+    """由两侧努塞尔数批量计算换热量和出口温度
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :Nu_h: 热侧努塞尔数
+    :Nu_c: 冷侧努塞尔数
+    :returns: Phi 换热量 W, t_hout 热侧出口温度, t_cout 冷侧出口温度
+
+    """
+    t = instrument.start()
+    qc_max, qc_min = judge(bi["q_hm"], bi["cp_h"], bi["q_cm"], bi["cp_c"])
+    rc = R_c(qc_max, qc_min)
+    D_h = D_h_class().Corrugate_cal(bi["L_w"], bi["d_corrugate"])
+
+    h_h = h_cal(Nu_h, bi["k_fh"], D_h)
+    h_c = h_cal(Nu_c, bi["k_fc"], D_h)
+    t = instrument.lap("h", t, h_h, h_c)
+
+    k = k_plane_cal(h_h, h_c, bi["sigma"], bi["k_s"])
+    t = instrument.lap("k", t, k)
+    ntu = ntu_cal(k, bi["A"], qc_min)
+    t = instrument.lap("NTU", t, ntu)
+    epsilon = epsilon_cal(bi["FD"], False, ntu, rc, bi["N_pass"])
+    t = instrument.lap("epsilon", t, epsilon)
+
+    Phi = epsilon * qc_min * (bi["t_hin"] - bi["t_cin"])
+    t_hout = bi["t_hin"] - Phi / (bi["q_hm"] * bi["cp_h"])
+    t_cout = bi["t_cin"] + Phi / (bi["q_cm"] * bi["cp_c"])
+    instrument.lap("Phi", t, Phi)
+
+    return Phi, t_hout, t_cout
+
+
+def Thermal_batch_cal(bi, ang_corrugated=60, return_flag=False):
+    """批量热力计算, Re → Pr → Nu(Okada) → h → k → NTU → epsilon
+
+    开启 jit_module 加速时整条链路由编译后的融合核逐行计算
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :ang_corrugated: 波纹角 °
+    :return_flag: 为 True 时额外返回逐行越界原因编码 (两侧按位合并)
+    :returns: Phi 换热量 W, t_hout 热侧出口温度, t_cout 冷侧出口温度
+
+    """
+    instrument.count("Thermal_batch_cal.rows", np.size(bi["t_hin"]))
+    if jit.enabled and not instrument.enabled:
+        res = jit.Thermal_fused_cal(bi, ang_corrugated)
+        if res is not None:
+            return res + (np.zeros(np.shape(res[0]), dtype=np.int64),) if return_flag else res
+    t = instrument.start()
+    Re = Re_class()
+    Re_h = Re.common_cal(bi["q_hm"], bi["A"], bi["mu_h"], bi["rho_h"])
+    Re_c = Re.common_cal(bi["q_cm"], bi["A"], bi["mu_c"], bi["rho_c"])
+    t = instrument.lap("Re", t, Re_h, Re_c)
+
+    Pr_h = Pr_cal(bi["cp_h"], bi["k_fh"], bi["mu_h"])
+    Pr_c = Pr_cal(bi["cp_c"], bi["k_fc"], bi["mu_c"])
+    t = instrument.lap("Pr", t, Pr_h, Pr_c)
+
+    Nu_SP = Nu_SP_class()
+    Nu_h, flag_h = Nu_SP.Okada_cal(Re_h, Pr_h, ang_corrugated, return_flag=True)
+    Nu_c, flag_c = Nu_SP.Okada_cal(Re_c, Pr_c, ang_corrugated, return_flag=True)
+    instrument.lap("Nu", t, Nu_h, Nu_c)
+
+    res = Thermal_Nu_batch_cal(bi, Nu_h, Nu_c)
+    if return_flag:
+        return res + (flag_h | flag_c,)
+    return res
+
+
+def Thermal_iter_batch_cal(bi, tables, keep=(), ang_corrugated=60, tol=1e-6, max_iter=50):
+    """物性随温度变化时的批量热力计算
+
+    在出口温度 → 平均温度 → 物性 → Re/Nu → epsilon 之间做不动点迭代, 一阶 Anderson 加速,
+    每行独立收敛
+
+    :bi: 批量输入字典，物性作为迭代初值
+    :tables: property_module.property_tables 的返回值
+    :keep: 不随温度更新的物性输入名称
+    :ang_corrugated: 波纹角 °
+    :tol: 出口温度收敛判据 °C
+    :max_iter: 最大迭代次数
+    :returns: Phi, t_hout, t_cout, flag, 平均温度物性下的批量输入字典, 是否收敛
+
+    """
+    shape = np.shape(bi["t_hin"])
+    bi = {k: np.reshape(v, -1) for k, v in bi.items()}
+
+    def update(x, idx):
+        sub = take_rows(bi, idx)
+        sub = update_properties(sub, tables, (sub["t_hin"] + x[:, 0]) / 2, (sub["t_cin"] + x[:, 1]) / 2, keep)
+        _, t_hout, t_cout = Thermal_batch_cal(sub, ang_corrugated)
+        return np.column_stack([t_hout, t_cout])
+
+    _, t_hout0, t_cout0 = Thermal_batch_cal(bi, ang_corrugated)
+    x, converged, _ = anderson_solve(update, np.column_stack([t_hout0, t_cout0]), tol, max_iter)
+
+    bi = update_properties(bi, tables, (bi["t_hin"] + x[:, 0]) / 2, (bi["t_cin"] + x[:, 1]) / 2, keep)
+    Phi, t_hout, t_cout, flag = Thermal_batch_cal(bi, ang_corrugated, return_flag=True)
+    bi = {k: v.reshape(shape) for k, v in bi.items()}
+    return (Phi.reshape(shape), t_hout.reshape(shape), t_cout.reshape(shape), flag.reshape(shape), bi,
+            converged.reshape(shape))
+
+
+def Hydraulic_batch_cal(bi, L=0.25, return_flag=False):
+    """批量水力计算
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :L: 流动长度 m
+    :return_flag: 为 True 时额外返回逐行越界原因编码 (两侧按位合并)
+    :returns: Delta_P_h 热侧压降 Pa, Delta_P_c 冷侧压降 Pa
+
+    """
+    instrument.count("Hydraulic_batch_cal.rows", np.size(bi["q_hm"]))
+    t = instrument.start()
+    Re = Re_class()
+    Re_h = Re.common_cal(bi["q_hm"], bi["A"], bi["mu_h"], bi["rho_h"])
+    Re_c = Re.common_cal(bi["q_cm"], bi["A"], bi["mu_c"], bi["rho_c"])
+    t = instrument.lap("Re", t, Re_h, Re_c)
+
+    v_h = bi["q_hm"] / bi["rho_h"] / bi["D_h"]
+    v_c = bi["q_cm"] / bi["rho_c"] / bi["D_h"]
+
+    F_class = f_SP_class()
+    f_h, flag_h = F_class.YY_Hsich_cal(Re_h, return_flag=True)
+    f_c, flag_c = F_class.YY_Hsich_cal(Re_c, return_flag=True)
+    t = instrument.lap("f", t, f_h, f_c)
+
+    Delta_P_h = Delta_P(f_h, L, bi["D_h"], bi["rho_h"], v_h)
+    Delta_P_c = Delta_P(f_c, L, bi["D_h"], bi["rho_c"], v_c)
+    instrument.lap("Delta_P", t, Delta_P_h, Delta_P_c)
+
+    if return_flag:
+        return Delta_P_h, Delta_P_c, flag_h | flag_c
+    return Delta_P_h, Delta_P_c
+
+
+@cache.cached
+def Rating_batch_cal(bi, ang_corrugated=60, L=0.25, tables=None, keep=()):
+    """批量校核计算, 同时完成热力与水力计算
+
+    开启 cache_module 缓存时, 相同输入的重复调用直接返回缓存结果
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :ang_corrugated: 波纹角 °
+    :L: 流动长度 m
+    :tables: property_module.property_tables 的返回值，配置了物性表时物性取两侧平均温度下的值
+    :keep: 不随温度更新的物性输入名称
+    :returns: 结果名称到数组的字典: Phi、t_hout、t_cout、Delta_P_h、Delta_P_c 以及合并后的越界原因编码 flag
+
+    """
+    if tables and any(tables.values()):
+        Phi, t_hout, t_cout, flag_t, bi, converged = Thermal_iter_batch_cal(bi, tables, keep, ang_corrugated)
+        flag_t = flag_t | np.where(converged, 0, NOT_CONVERGED)
+    else:
+        Phi, t_hout, t_cout, flag_t = Thermal_batch_cal(bi, ang_corrugated, return_flag=True)
+    Delta_P_h, Delta_P_c, flag_h = Hydraulic_batch_cal(bi, L, return_flag=True)
+    return {"Phi": Phi, "t_hout": t_hout, "t_cout": t_cout,
+            "Delta_P_h": Delta_P_h, "Delta_P_c": Delta_P_c, "flag": flag_t | flag_h}
+
+
+def Rating_cases_cal(cases, ang_corrugated=60, L=0.25):
+    """多工况校核计算, 物性表配置相同的工况合并为一次批量计算
+
+    :cases: [(工况名称, 配置字典), ...]，见 ConfigParser.load_cases
+    :ang_corrugated: 波纹角 °
+    :L: 流动长度 m
+    :returns: 结果名称到数组的字典，见 Rating_batch_cal，行顺序与 cases 相同
+
+    """
+    groups = {}
+    for i, (_, cd) in enumerate(cases):
+        spec = tuple(cd[section].get("Property_table") for section in SIDE_SECTIONS.values())
+        groups.setdefault(spec, []).append(i)
+    out = {}
+    for idx in groups.values():
+        cds = [cases[i][1] for i in idx]
+        res = Rating_batch_cal(cases_to_batch(cds), ang_corrugated, L, tables=property_tables(cds[0]))
+        for name, v in res.items():
+            out.setdefault(name, np.zeros(len(cases), dtype=v.dtype))[idx] = v
+    return out
+
+
+def Rating_cal(cd):
+    """单工况校核计算
+
+    :cd: 配置字典
+    :returns: 结果名称到数值的字典，见 Rating_batch_cal
+
+    """
+    res = Rating_batch_cal(config_to_batch(cd), tables=property_tables(cd))
+    return {k: np.asarray(v).item() for k, v in res.items()}
+
+
+def Thermal_cal(cd):
+    """单工况热力计算
+
+    :cd: 配置字典
+    :returns: Phi 换热量 W, t_hout 热侧出口温度, t_cout 冷侧出口温度
+
+    """
+    res = Rating_cal(cd)
+    return res["Phi"], res["t_hout"], res["t_cout"]
+
+
+def Hydraulic_cal(cd):
+    """单工况水力计算
+
+    :cd: 配置字典
+    :returns: Delta_P_h 热侧压降 Pa, Delta_P_c 冷侧压降 Pa
+
+    """
+    res = Rating_cal(cd)
+    return res["Delta_P_h"], res["Delta_P_c"]
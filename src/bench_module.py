@@ -0,0 +1,262 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 20:14:57 +0800
+LastEditTime : 2026-10-18 20:14:57 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/bench_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 经验公式与端到端计算的吞吐量基准测试
+# 用法 (仓库根目录): python -m src.bench_module [--sizes 1,100,10000,1000000] [--save | --baseline FILE]
+
+import argparse
+import inspect
+import json
+import logging
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from . import jit_module as jit
+from .batch_module import INPUT_KEYS, Hydraulic_batch_cal, Thermal_batch_cal, config_to_batch
+from .F_module import f_SP_class, f_TP_class
+from .march_module import March_batch_cal
+from .Nu_module import NU_TP_class, Nu_SP_class
+from .Re_module import Re_class
+
+
+def _u(lo, hi):
+    """在 [lo, hi] 内均匀取值的参数生成器"""
+    return lambda n, rng: rng.uniform(lo, hi, n)
+
+
+def _c(value):
+    """常数参数生成器"""
+    return lambda n, rng: np.full(n, value, dtype=float) if not isinstance(value, str) else value
+
+
+# 各经验公式的测试参数, 取值均在公式适用范围内: 方法名 -> 参数生成器列表
+Re_turb, Pr_liq, mu_f, mu_w = _u(2000, 4000), _u(2, 7), _c(1e-3), _c(0.9e-3)
+CORRELATION_CASES = {
+    Nu_SP_class: {
+        "YL_cal": [Re_turb, Pr_liq, mu_f, mu_w],
+        "Okada_cal": [Re_turb, Pr_liq, _c(60)],
+        "Gulenoglu_C_1_cal": [Re_turb, Pr_liq, mu_f, mu_w, _c(1.17)],
+        "Gulenoglu_C_2_cal": [Re_turb, Pr_liq, mu_f, mu_w, _c(1.288)],
+        "LinJunYU_cal": [_u(1000, 3000), Pr_liq, mu_f, mu_w],
+        "Alklaibi_cal": [_u(300, 1000), _u(5.5, 6.5), _c(0.1)],
+        "He_Qing_Qiong_cold": [_u(2000, 20000), Pr_liq, mu_f, mu_w],
+        "HeQQ_hot_cal": [_u(2000, 20000), Pr_liq, mu_f, mu_w],
+        "Saranmanduh_Borjigin_cal": [_u(3000, 100000), _u(0.7, 1), _c(0.026), _c(0.05)],
+        "Pantzali_MN_cal": [Re_turb, Pr_liq],
+        "MM_cal": [Re_turb, Pr_liq, _c(45), _c(1.2), mu_f, mu_w],
+        "Nu_SK_cal": [_c(0), _c(0), _u(2935, 6311), _u(1.415, 1.445), _c('R-32'), _c('Vapor')],
+        "Nu_Chisholm_cal": [Re_turb, Pr_liq, _c(45), _c(1.2)],
+        "Nu_R_D_V_cal": [_u(150, 1500), _u(4, 27)],
+    },
+    NU_TP_class: {
+        "Nu_Wang_cal": [_c(4180), _c(10), _c(2.26e6), _u(2500, 5000), _u(2, 4), _c(960), _c(0.6)],
+        "Nu_SK_cal": [_c(0), _c(0), _c(0), _u(732.1, 3797), _u(1.86, 1.98), _u(0.05, 0.85), _c('R-32')],
+        "Nu_Behrozifard_cal": [_c(0.005), _c(0.5), _u(100, 2300), Pr_liq],
+        "Nu_Wang_zq_cal": [_u(100, 1000), _u(50, 500), Pr_liq, _c(1.0), _c(1.0)],
+    },
+    f_SP_class: {
+        "YY_Hsich_cal": [_u(10, 400)],
+        "LJY_cal": [_u(1000, 3000), _u(300, 900)],
+        "Gulenoglu_C_1_cal": [Re_turb, _c(1.17)],
+        "Gulenoglu_C_2_cal": [Re_turb, _c(1.288)],
+        "Alklaibi_cal": [_u(300, 1000), _c(0.1)],
+        "He_Qing_Qiong_cal": [_u(2000, 20000)],
+        "Amooie_FMM_cal": [_u(1, 1000), _c(1.2)],
+        "Pantzali_MN_cal": [Re_turb],
+        "MM_cal": [Re_turb, _c(45), _c(1.2)],
+        "Talik_cal": [_u(1450, 11460)],
+        "Pantzali_cal": [Re_turb],
+        "R_D_V_cal": [_u(120, 1000)],
+    },
+    f_TP_class: {
+        "Behrozifard_cal": [_c(64), _u(100, 2300), _c(1.0)],
+    },
+    Re_class: {
+        "common_cal": [_u(0.05, 0.5), _c(0.01), _c(1e-3), _c(998)],
+        "Re_eq_cal": [_u(0.05, 0.5), _c(0.01), _c(0.005), _c(2e-4), _c(1100), _c(30), _u(0.1, 0.9)],
+        "Re_L_cal": [_u(0.05, 0.5), _c(0.01), _c(0.005), _c(2e-4), _u(0.1, 0.9)],
+    },
+}
+
+# 端到端计算的配置, 取值使两侧 Re 落在 YY_Hsich 适用范围内
+END_TO_END_CONFIG = {
+    "t_hin": 80, "t_cin": 25, "q_hm": 0.15, "q_cm": 0.12, "FD": 2, "N_pass": 1, "D_h": 0.5, "A": 1, "L_w": 0.2,
+    "d_corrugate": 0.01, "sigma": 0.001, "k_s": 21, "rho_h": 135, "cp_h": 1350, "k_fh": 21, "mu_h": 0.01,
+    "rho_c": 135, "cp_c": 1350, "k_fc": 21, "mu_c": 0.01,
+}
+
+
+def missing_cases():
+    """返回没有测试参数的经验公式方法名, 用于保证新增公式被基准测试覆盖"""
+    missing = []
+    for cls, cases in CORRELATION_CASES.items():
+        for name, _ in inspect.getmembers(cls, inspect.isfunction):
+            if not name.startswith("_") and name not in cases:
+                missing.append(f"{cls.__name__}.{name}")
+    return missing
+
+
+def _time(func, min_time):
+    """先不计时调用一次 (排除编译、缓存建立等首次开销), 再重复调用 func 直到累计耗时不少于 min_time, 返回单次最短耗时"""
+    func()
+    best, total = np.inf, 0.0
+    while total < min_time:
+        t0 = perf_counter()
+        func()
+        dt = perf_counter() - t0
+        best, total = min(best, dt), total + dt
+    return best
+
+
+def _end_to_end_cases():
+    """端到端计算: Thermal_cal、Hydraulic_cal 与 March_cal 的批量实现, 安装 numba 时另测融合核"""
+    def make(func):
+        cd = {section: {} for section, _ in INPUT_KEYS.values()}
+        for name, (section, key) in INPUT_KEYS.items():
+            cd[section][key] = END_TO_END_CONFIG[name]
+
+        def args(n, rng):
+            return [cd, rng.uniform(0.12, 0.35, n), rng.uniform(0.12, 0.35, n)]
+
+        def call(cd, q_hm, q_cm):
+            return func(config_to_batch(cd, q_hm=q_hm, q_cm=q_cm))
+        return call, args
+    cases = {"Thermal_cal": make(Thermal_batch_cal), "Hydraulic_cal": make(Hydraulic_batch_cal),
+             "March_cal": make(March_batch_cal)}
+    if jit.available:
+        cases["Thermal_cal_jit"] = make(jit.Thermal_fused_cal)
+    return cases
+
+
+def _case_args(gens):
+    """由参数生成器列表构造参数生成函数"""
+    return lambda n, rng: [g(n, rng) for g in gens]
+
+
+def iter_cases():
+    """遍历所有基准测试项, 产生 (名称, 可调用对象, 参数生成函数)"""
+    for cls, cases in CORRELATION_CASES.items():
+        obj = cls()
+        for name, gens in cases.items():
+            yield f"{cls.__name__}.{name}", getattr(obj, name), _case_args(gens)
+    for name, (call, args) in _end_to_end_cases().items():
+        yield name, call, args
+
+
+def run_bench(sizes, min_time=0.2, scalar_max=10000, only=None, seed=0):
+    """运行基准测试
+
+    标量路径逐点以 Python 标量调用, 点数超过 scalar_max 时只测前 scalar_max 个点并按点数折算;
+    向量化路径以数组一次调用
+
+    :sizes: 批量大小列表
+    :min_time: 每项测试的最短累计计时 s
+    :scalar_max: 标量路径的最大测试点数
+    :only: 只运行名称包含该字符串的测试项
+    :seed: 随机数种子
+    :returns: 字典 "名称|路径|点数" -> 吞吐量 (点/秒)
+
+    """
+    rng = np.random.default_rng(seed)
+    results = {}
+    for name, func, gen in iter_cases():
+        if only and only not in name:
+            continue
+        for n in sizes:
+            args = gen(n, rng)
+            n_s = min(n, scalar_max)
+            scalar = [[a[i].item() if isinstance(a, np.ndarray) else a for a in args] for i in range(n_s)]
+            t_s = _time(lambda: [func(*p) for p in scalar], min_time)
+            results[f"{name}|scalar|{n}"] = n_s / t_s
+            t_v = _time(lambda: func(*args), min_time)
+            results[f"{name}|vector|{n}"] = n / t_v
+    return results
+
+
+def compare(results, baseline, threshold):
+    """与基准结果比较, 返回吞吐量下降超过 threshold 的项: 名称 -> (当前值, 基准值)"""
+    return {k: (v, baseline[k]) for k, v in results.items()
+            if k in baseline and v < baseline[k] * (1 - threshold)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="经验公式与端到端计算吞吐量基准测试")
+    parser.add_argument("--sizes", default="1,100,10000,1000000",
+                        help="批量大小列表, 逗号分隔, 如 1,100,10000,1000000,10000000")
+    parser.add_argument("--only", help="只运行名称包含该字符串的测试项")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每项测试的最短累计计时 s")
+    parser.add_argument("--scalar-max", type=int, default=10000, help="标量路径的最大测试点数")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="基准结果文件")
+    parser.add_argument("--save", action="store_true", help="将本次结果保存为基准结果")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定性能下降的相对阈值")
+    parser.add_argument("-o", "--output", help="将本次结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    from rich import print  # 仅命令行输出时加载 rich
+    from rich.table import Table
+
+    logging.disable(logging.WARNING)  # 基准测试不输出越界警告
+    for name in missing_cases():
+        print(f"[yellow]缺少基准测试参数：{name}[/yellow]")
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    results = run_bench(sizes, args.min_time, args.scalar_max, args.only)
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    table = Table("测试项", "路径", "点数", "吞吐量 (点/秒)", "基准", "变化")
+    for key, value in results.items():
+        name, path, n = key.split("|")
+        base = baseline.get(key)
+        change = f"{value / base - 1:+.1%}" if base else ""
+        table.add_row(name, path, n, f"{value:.4g}", f"{base:.4g}" if base else "", change)
+    print(table)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({**baseline, **results}, f, indent=2)
+        print(f"基准结果已保存：{args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for key, (value, base) in regressions.items():
+        print(f"[red]性能下降：{key} {value:.4g} < {base:.4g} 点/秒[/red]")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
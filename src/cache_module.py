@@ -0,0 +1,295 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 17:00:00 +0800
+LastEditTime : 2026-10-18 17:00:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/cache_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 计算结果缓存: 以完整输入 (几何、边界条件、物性、物性表、经验公式选项) 与计算程序版本的哈希为键,
+# 内存 LRU 一级缓存 + SQLite 磁盘二级缓存, 两级均按占用字节数淘汰最久未使用的结果。
+# 默认关闭; 关闭时被缓存的函数只做一次判断即直接计算
+
+import atexit
+import functools
+import hashlib
+import inspect
+import io
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .property_module import Property_table
+
+logger = logging.getLogger(__name__)
+
+enabled = False
+
+# 默认磁盘缓存路径
+DEFAULT_PATH = Path.home() / ".cache" / "Heat-Exchanger-Calibration-Calculator" / "cache.sqlite"
+
+_memory = OrderedDict()
+_memory_bytes = 0
+_memory_max = 256 * 2**20
+_store = None
+
+# 磁盘缓存命中时的访问时间先记在内存中, 累计到该数量、写入新结果或进程退出时批量更新
+TOUCH_BATCH = 256
+
+
+class Disk_store:
+    """SQLite 磁盘缓存, 总大小超过 max_bytes 时按最近访问时间淘汰
+
+    连接按进程打开, 多进程 (如参数扫描的工作进程) 可共用同一文件
+    """
+
+    def __init__(self, path, max_bytes=1024 * 2**20):
+        """
+        :path: SQLite 文件路径
+        :max_bytes: 磁盘缓存总大小上限 字节
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._pid = None
+        self._touched = {}
+
+    @property
+    def conn(self):
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results "
+                               "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self.flush()
+        return row[0]
+
+    def flush(self):
+        """批量写入尚未记录的访问时间"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        with self.conn:
+            self.conn.executemany("UPDATE results SET last_access = ? WHERE key = ?",
+                                  [(t, key) for key, t in touched.items()])
+
+    def put(self, key, blob):
+        if len(blob) > self.max_bytes:
+            return
+        self.flush()
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evict = []
+            for old_key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+                if total <= self.max_bytes:
+                    break
+                evict.append((old_key,))
+                total -= size
+            self.conn.executemany("DELETE FROM results WHERE key = ?", evict)
+
+    def clear(self):
+        self._touched.clear()
+        with self.conn:
+            self.conn.execute("DELETE FROM results")
+
+
+def enable(path=DEFAULT_PATH, memory_bytes=256 * 2**20, disk_bytes=1024 * 2**20):
+    """开启缓存
+
+    :path: 磁盘缓存文件路径, None 表示只使用内存缓存
+    :memory_bytes: 内存缓存大小上限 字节
+    :disk_bytes: 磁盘缓存大小上限 字节
+
+    """
+    global enabled, _store, _memory_max
+    enabled = True
+    _memory_max = memory_bytes
+    if _store is not None:
+        _store.flush()
+    _store = Disk_store(path, disk_bytes) if path else None
+
+
+@atexit.register
+def _flush_store():
+    """进程退出时写入尚未记录的访问时间"""
+    if _store is not None:
+        _store.flush()
+
+
+def disable():
+    """关闭缓存"""
+    global enabled
+    enabled = False
+
+
+def clear():
+    """清空内存缓存及磁盘缓存"""
+    global _memory_bytes
+    _memory.clear()
+    _memory_bytes = 0
+    if _store is not None:
+        _store.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """计算程序版本: 本包全部源文件内容的哈希, 源代码改动后旧结果自动失效"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _feed(h, obj):
+    """将对象按规范形式写入哈希, 数值统一为 float64, 字典按键排序; 无法规范化的对象抛出 TypeError"""
+    if obj is None:
+        h.update(b"N")
+    elif isinstance(obj, str):
+        h.update(b"S%d:" % len(obj.encode()) + obj.encode())
+    elif isinstance(obj, (bool, int, float, np.number, np.ndarray)):
+        a = np.ascontiguousarray(obj, dtype=float)
+        h.update(b"A" + repr(a.shape).encode())
+        h.update(a.tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"L%d:" % len(obj))
+        for v in obj:
+            _feed(h, v)
+    elif isinstance(obj, dict):
+        h.update(b"D%d:" % len(obj))
+        for k in sorted(obj, key=str):
+            _feed(h, str(k))
+            _feed(h, obj[k])
+    elif isinstance(obj, Property_table):
+        # 物性表按重采样后的表格内容哈希, 同名但内容不同的 CSV 物性表不会误命中
+        _feed(h, ["Property_table", obj.T_min, obj.T_max, obj.values])
+    else:
+        raise TypeError(f"无法计算缓存键的参数类型: {type(obj).__name__}")
+
+
+def result_key(name, arguments):
+    """计算缓存键
+
+    :name: 函数全名
+    :arguments: 参数名到参数值的字典 (已补全默认值)
+    :returns: 十六进制哈希字符串
+
+    """
+    h = hashlib.blake2b(digest_size=32)
+    _feed(h, [name, code_version(), arguments])
+    return h.hexdigest()
+
+
+def _dumps(result):
+    buf = io.BytesIO()
+    np.savez(buf, **result)
+    return buf.getvalue()
+
+
+def _loads(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        return {k: data[k] for k in data.files}
+
+
+def _remember(key, result):
+    global _memory_bytes
+    size = sum(v.nbytes for v in result.values())
+    if size > _memory_max:
+        return
+    if key in _memory:
+        _memory_bytes -= sum(v.nbytes for v in _memory.pop(key).values())
+    _memory[key] = result
+    _memory_bytes += size
+    while _memory_bytes > _memory_max:
+        _, old = _memory.popitem(last=False)
+        _memory_bytes -= sum(v.nbytes for v in old.values())
+
+
+def get(key):
+    """查询缓存, 未命中返回 None; 返回结果的副本"""
+    result = _memory.get(key)
+    if result is not None:
+        _memory.move_to_end(key)
+        return {k: v.copy() for k, v in result.items()}
+    if _store is not None:
+        blob = _store.get(key)
+        if blob is not None:
+            result = _loads(blob)
+            _remember(key, result)
+            return {k: v.copy() for k, v in result.items()}
+    return None
+
+
+def put(key, result):
+    """写入缓存, result 为名称到数组的字典"""
+    result = {k: np.array(v) for k, v in result.items()}
+    _remember(key, result)
+    if _store is not None:
+        _store.put(key, _dumps(result))
+
+
+def cached(func):
+    """缓存函数结果的装饰器, 函数返回值须为名称到数组的字典
+
+    参数无法规范化时 (如对偶数输入) 直接计算, 不使用缓存
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = result_key(name, bound.arguments)
+        except TypeError:
+            return func(*args, **kwargs)
+        result = get(key)
+        if result is not None:
+            logger.debug(f"{func.__qualname__} 命中缓存 {key[:12]}")
+            return result
+        result = func(*args, **kwargs)
+        put(key, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,189 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 16:47:05 +0800
+LastEditTime : 2026-10-18 16:47:05 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/calibration_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+
+import numpy as np
+
+from .batch_module import Thermal_Nu_batch_cal, columns_to_batch
+from .dual_module import Dual, deriv, value
+from .Re_module import Re_class
+from .thermal_module import Delta_P, Pr_cal
+
+logger = logging.getLogger(__name__)
+
+# 实测数据中的出口温度与压降列名
+MEASURED_COLUMNS = {
+    "t_hout": "BC.Temp_heat_outlet",
+    "t_cout": "BC.Temp_cool_outlet",
+    "Delta_P_h": "Delta_P_h",
+    "Delta_P_c": "Delta_P_c",
+}
+
+
+def least_squares_fit(residual, theta0, max_iter=100, tol=1e-12):
+    """Levenberg-Marquardt 非线性最小二乘
+
+    残差函数对整个数据集一次性向量化计算; 雅可比矩阵由前向模式对偶数在计算残差的同一次批量计算中得到,
+    不需要按参数逐列差分
+
+    :residual: 残差函数 theta -> 残差数组，theta 可为对偶数列表
+    :theta0: 参数初值
+    :max_iter: 最大迭代次数
+    :tol: 相对残差平方和变化量收敛判据
+    :returns: (参数, 残差平方和, 迭代次数)
+
+    """
+    def evaluate(theta):
+        r = residual(Dual.seed(list(theta)))
+        return value(r), np.broadcast_to(deriv(r, theta.size), (np.size(value(r)), theta.size))
+
+    theta = np.asarray(theta0, dtype=float)
+    r, J = evaluate(theta)
+    cost = r @ r
+    lam = 1e-3
+    for it in range(1, max_iter + 1):
+        g = J.T @ r
+        H = J.T @ J
+        while lam < 1e12:
+            delta = np.linalg.solve(H + lam * np.diag(np.diag(H)), -g)
+            r_new = residual(theta + delta)
+            cost_new = r_new @ r_new
+            if cost_new < cost:
+                break
+            lam *= 10
+        else:
+            break
+        converged = cost - cost_new <= tol * cost
+        theta, cost = theta + delta, cost_new
+        lam = max(lam / 10, 1e-12)
+        if converged:
+            break
+        r, J = evaluate(theta)
+    return theta, cost, it
+
+
+def calibrate_Okada(cd, columns, theta0=(0.327, 0.65)):
+    """拟合 Okada 形式努塞尔数公式 Nu = C * Re^m * Pr^0.4 的系数 C 与指数 m
+
+    以两侧出口温度的实测值与计算值之差为残差
+
+    :cd: 配置字典，数据中缺失的输入取配置值
+    :columns: 实测数据列字典，需包含 BC.Temp_heat_outlet 与 BC.Temp_cool_outlet
+    :theta0: (C, m) 初值，默认为 Okada 60° 波纹角系数
+    :returns: 拟合结果字典
+
+    """
+    bi = columns_to_batch(cd, columns)
+    t_hout = columns[MEASURED_COLUMNS["t_hout"]]
+    t_cout = columns[MEASURED_COLUMNS["t_cout"]]
+
+    Re = Re_class()
+    Re_h = Re.common_cal(bi["q_hm"], bi["A"], bi["mu_h"], bi["rho_h"])
+    Re_c = Re.common_cal(bi["q_cm"], bi["A"], bi["mu_c"], bi["rho_c"])
+    Pr_h_04 = Pr_cal(bi["cp_h"], bi["k_fh"], bi["mu_h"])**0.4
+    Pr_c_04 = Pr_cal(bi["cp_c"], bi["k_fc"], bi["mu_c"])**0.4
+
+    def residual(theta, rows=slice(None)):
+        C, m = theta
+        _, t_hout_cal, t_cout_cal = Thermal_Nu_batch_cal(bi, C * Re_h**m * Pr_h_04, C * Re_c**m * Pr_c_04)
+        return np.concatenate([(t_hout_cal - t_hout)[rows], (t_cout_cal - t_cout)[rows]])
+
+    # 剔除实测值缺失或初值下无法计算的行
+    rows = np.isfinite(residual(theta0).reshape(2, -1)).all(axis=0)
+    n_rows = int(np.count_nonzero(rows))
+    return _fit_result("Okada", lambda theta: residual(theta, rows), theta0, ("C", "m"), n_rows)
+
+
+def calibrate_YY_Hsich(cd, columns, L=0.25, theta0=(61000, -1.25)):
+    """拟合 YY_Hsich 形式摩擦因子公式 f = C * Re^n 的系数 C 与指数 n
+
+    以两侧压降的相对误差为残差，缺少某侧压降列时只使用另一侧
+
+    :cd: 配置字典，数据中缺失的输入取配置值
+    :columns: 实测数据列字典，需包含 Delta_P_h 或 Delta_P_c
+    :L: 流动长度 m
+    :theta0: (C, n) 初值，默认为 YY_Hsich 原始系数
+    :returns: 拟合结果字典
+
+    """
+    bi = columns_to_batch(cd, columns)
+    Re = Re_class()
+    sides = []
+    for side, q, rho, mu in (("h", "q_hm", "rho_h", "mu_h"), ("c", "q_cm", "rho_c", "mu_c")):
+        measured = columns.get(MEASURED_COLUMNS[f"Delta_P_{side}"])
+        if measured is None:
+            continue
+        v = bi[q] / bi[rho] / bi["D_h"]
+        Re_s = Re.common_cal(bi[q], bi["A"], bi[mu], bi[rho])
+        # 压降对系数 C 为线性, 先计算 C=1 时的压降
+        unit = Delta_P(1.0, L, bi["D_h"], bi[rho], v)
+        rows = np.isfinite(measured) & (measured > 0)
+        sides.append((Re_s[rows], unit[rows], measured[rows]))
+
+    def residual(theta):
+        C, n = theta
+        return np.concatenate([C * Re_s**n * unit / measured - 1 for Re_s, unit, measured in sides])
+
+    n_rows = sum(len(s[0]) for s in sides)
+    return _fit_result("YY_Hsich", residual, theta0, ("C", "n"), n_rows)
+
+
+def _fit_result(name, residual, theta0, names, n_rows):
+    """执行拟合并整理结果"""
+    if n_rows == 0:
+        raise ValueError(f"{name} 拟合没有可用的实测数据")
+    r0 = residual(np.asarray(theta0, dtype=float))
+    theta, cost, n_iter = least_squares_fit(residual, theta0)
+    logger.info(f"{name} 拟合完成: {dict(zip(names, theta))}, 迭代 {n_iter} 次")
+    return {
+        "correlation": name,
+        "params": dict(zip(names, theta.tolist())),
+        "rmse_initial": float(np.sqrt(r0 @ r0 / r0.size)),
+        "rmse": float(np.sqrt(cost / r0.size)),
+        "rows": n_rows,
+        "iterations": n_iter,
+    }
+
+
+def calibrate(cd, columns):
+    """根据实测数据中存在的列, 拟合所有可拟合的经验公式
+
+    :cd: 配置字典
+    :columns: 实测数据列字典
+    :returns: 拟合结果字典列表
+
+    """
+    results = []
+    if MEASURED_COLUMNS["t_hout"] in columns and MEASURED_COLUMNS["t_cout"] in columns:
+        results.append(calibrate_Okada(cd, columns))
+    if MEASURED_COLUMNS["Delta_P_h"] in columns or MEASURED_COLUMNS["Delta_P_c"] in columns:
+        results.append(calibrate_YY_Hsich(cd, columns))
+    if not results:
+        raise ValueError("实测数据中缺少出口温度 (BC.Temp_heat_outlet, BC.Temp_cool_outlet) 或压降 (Delta_P_h, Delta_P_c) 列")
+    return results
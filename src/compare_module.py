@@ -0,0 +1,205 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 15:20:44 +0800
+LastEditTime : 2026-10-18 15:20:44 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/compare_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 经验公式比较: 同一批工况下一次计算全部适用的单相努塞尔数与摩擦因子经验公式,
+# 给出各公式的换热量、压降及其有效性, 以及有效公式之间的包络 (最小、最大)、均值与相对离散度。
+# 各公式的结果沿新的首轴堆叠后只调用一次换热量与压降计算。
+# 未纳入比较的公式: YL (原文注明不能用)、Song和Kim 单相公式 (限定制冷剂与状态)、
+# Saranmanduh Borjigin (需要同一换热器的摩擦因数)、LJY 摩擦因子 (两相等效 Re)
+
+import logging
+
+import numpy as np
+
+from .batch_module import Thermal_Nu_batch_cal, column_inputs, config_to_batch
+from .F_module import f_SP_class
+from .io_module import Chunk_writer, iter_chunks
+from .Nu_module import Nu_SP_class
+from .Re_module import Re_class
+from .thermal_module import Delta_P, Pr_cal
+
+logger = logging.getLogger(__name__)
+
+# 参与比较的努塞尔数公式: 名称 -> 函数 (Nu_SP_class 实例, 参数字典) -> (Nu, flag)
+NU_CORRELATIONS = {
+    "Okada": lambda n, p: n.Okada_cal(p["Re"], p["Pr"], p["ang"], return_flag=True),
+    "Gulenoglu_C_1": lambda n, p: n.Gulenoglu_C_1_cal(p["Re"], p["Pr"], p["mu"], p["mu_w"], p["phi"], return_flag=True),
+    "Gulenoglu_C_2": lambda n, p: n.Gulenoglu_C_2_cal(p["Re"], p["Pr"], p["mu"], p["mu_w"], p["phi"], return_flag=True),
+    "LinJunYU": lambda n, p: n.LinJunYU_cal(p["Re"], p["Pr"], p["mu"], p["mu_w"], return_flag=True),
+    "Alklaibi": lambda n, p: n.Alklaibi_cal(p["Re"], p["Pr"], p["phi_v"], return_flag=True),
+    # 何庆琼公式冷热两侧 Pr 指数不同
+    "He_Qing_Qiong": lambda n, p: (n.HeQQ_hot_cal if p["side"] == "h" else n.He_Qing_Qiong_cold)(
+        p["Re"], p["Pr"], p["mu"], p["mu_w"], return_flag=True),
+    "Pantzali_MN": lambda n, p: n.Pantzali_MN_cal(p["Re"], p["Pr"], return_flag=True),
+    "MM": lambda n, p: n.MM_cal(p["Re"], p["Pr"], p["ang"], p["phi"], p["mu"], p["mu_w"], return_flag=True),
+    "Chisholm": lambda n, p: n.Nu_Chisholm_cal(p["Re"], p["Pr"], p["ang"], p["phi"], return_flag=True),
+    "R_D_V": lambda n, p: n.Nu_R_D_V_cal(p["Re"], p["Pr"], return_flag=True),
+}
+
+# 参与比较的摩擦因子公式: 名称 -> 函数 (f_SP_class 实例, 参数字典) -> (f, flag)
+F_CORRELATIONS = {
+    "YY_Hsich": lambda f, p: f.YY_Hsich_cal(p["Re"], return_flag=True),
+    "Gulenoglu_C_1": lambda f, p: f.Gulenoglu_C_1_cal(p["Re"], p["phi"], return_flag=True),
+    "Gulenoglu_C_2": lambda f, p: f.Gulenoglu_C_2_cal(p["Re"], p["phi"], return_flag=True),
+    "Alklaibi": lambda f, p: f.Alklaibi_cal(p["Re"], p["phi_v"], return_flag=True),
+    "He_Qing_Qiong": lambda f, p: f.He_Qing_Qiong_cal(p["Re"], return_flag=True),
+    "Amooie_FMM": lambda f, p: f.Amooie_FMM_cal(p["Re"], p["phi"], return_flag=True),
+    "Pantzali_MN": lambda f, p: f.Pantzali_MN_cal(p["Re"], return_flag=True),
+    "MM": lambda f, p: f.MM_cal(p["Re"], p["ang"], p["phi"], return_flag=True),
+    "Talik": lambda f, p: f.Talik_cal(p["Re"], return_flag=True),
+    "Pantzali": lambda f, p: f.Pantzali_cal(p["Re"], return_flag=True),
+    "R_D_V": lambda f, p: f.R_D_V_cal(p["Re"], return_flag=True),
+}
+
+
+def envelope(values, valid):
+    """有效公式之间的统计量
+
+    :values: 形状 (公式数, 行数) 的数组
+    :valid: 同形状的有效性掩码
+    :returns: min、max、mean、spread (相对离散度 (max - min) / |mean|)、n_valid 到数组的字典，
+              没有有效公式的行为 NaN
+
+    """
+    n_valid = np.count_nonzero(valid, axis=0)
+    some = n_valid > 0
+    lo = np.where(some, np.min(np.where(valid, values, np.inf), axis=0), np.nan)
+    hi = np.where(some, np.max(np.where(valid, values, -np.inf), axis=0), np.nan)
+    mean = np.where(some, np.sum(np.where(valid, values, 0.0), axis=0) / np.maximum(n_valid, 1), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = (hi - lo) / np.abs(mean)
+    return {"min": lo, "max": hi, "mean": mean, "spread": spread, "n_valid": n_valid}
+
+
+def _side_params(bi, side, Re, ang_corrugated, phi, phi_v, mu_ratio):
+    mu = bi[f"mu_{side}"]
+    return {"side": side, "Re": Re, "Pr": Pr_cal(bi[f"cp_{side}"], bi[f"k_f{side}"], mu), "mu": mu,
+            "mu_w": mu / mu_ratio, "ang": ang_corrugated, "phi": phi, "phi_v": phi_v}
+
+
+def _stack(funcs, obj, params):
+    """逐个计算公式并沿首轴堆叠, 返回 (值, 越界原因编码)"""
+    values, flags = zip(*(func(obj, params) for func in funcs.values()))
+    shape = np.shape(params["Re"])
+    return (np.stack([np.broadcast_to(v, shape) for v in values]),
+            np.stack([np.broadcast_to(f, shape) for f in flags]))
+
+
+def Compare_batch_cal(bi, ang_corrugated=60, phi=1.17, phi_v=0.0, mu_ratio=1.0, L=0.25):
+    """批量比较全部单相努塞尔数与摩擦因子经验公式
+
+    努塞尔数公式两侧采用同一公式; 物性取批量输入中的值, 不做平均温度迭代。
+    公式计算期间不输出适用范围警告, 有效性见 valid 列
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :ang_corrugated: 波纹角 °
+    :phi: 表面放大系数 (面积投影系数)
+    :phi_v: 纳米颗粒体积浓度 (Alklaibi 公式)
+    :mu_ratio: 主流与壁面动力粘度之比 mu/mu_w
+    :L: 流动长度 m
+    :returns: 列名到数组的字典:
+              Phi.<公式>、t_hout.<公式>、t_cout.<公式>、valid.<公式> (两侧均有效为 1)，
+              Delta_P_h.<公式>、valid_h.<公式>、Delta_P_c.<公式>、valid_c.<公式> (压降按单侧判断有效性)，
+              以及 Phi、Delta_P_h、Delta_P_c 的 _min、_max、_mean、_spread、_n_valid 包络统计
+
+    """
+    shape = np.broadcast(*bi.values()).shape
+    bi = {k: np.broadcast_to(v, shape) for k, v in bi.items()}
+    Re = Re_class()
+    Re_h = Re.common_cal(bi["q_hm"], bi["A"], bi["mu_h"], bi["rho_h"])
+    Re_c = Re.common_cal(bi["q_cm"], bi["A"], bi["mu_c"], bi["rho_c"])
+    p_h = _side_params(bi, "h", Re_h, ang_corrugated, phi, phi_v, mu_ratio)
+    p_c = _side_params(bi, "c", Re_c, ang_corrugated, phi, phi_v, mu_ratio)
+
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        Nu_SP, F_SP = Nu_SP_class(), f_SP_class()
+        Nu_h, flag_h = _stack(NU_CORRELATIONS, Nu_SP, p_h)
+        Nu_c, flag_c = _stack(NU_CORRELATIONS, Nu_SP, p_c)
+        f_h, flag_fh = _stack(F_CORRELATIONS, F_SP, p_h)
+        f_c, flag_fc = _stack(F_CORRELATIONS, F_SP, p_c)
+    finally:
+        logging.disable(previous)
+
+    # 各公式的努塞尔数沿首轴堆叠, 展平后一次计算换热量
+    k = len(NU_CORRELATIONS)
+    flat = {name: np.broadcast_to(v, (k,) + shape).ravel() for name, v in bi.items()}
+    Phi, t_hout, t_cout = (x.reshape((k,) + shape) for x in Thermal_Nu_batch_cal(flat, Nu_h.ravel(), Nu_c.ravel()))
+    valid = (flag_h == 0) & (flag_c == 0) & np.isfinite(Phi)
+
+    v_h = bi["q_hm"] / bi["rho_h"] / bi["D_h"]
+    v_c = bi["q_cm"] / bi["rho_c"] / bi["D_h"]
+    Delta_P_h = Delta_P(f_h, L, bi["D_h"], bi["rho_h"], v_h)
+    Delta_P_c = Delta_P(f_c, L, bi["D_h"], bi["rho_c"], v_c)
+    valid_fh = (flag_fh == 0) & np.isfinite(Delta_P_h)
+    valid_fc = (flag_fc == 0) & np.isfinite(Delta_P_c)
+
+    out = {}
+    for i, name in enumerate(NU_CORRELATIONS):
+        out.update({f"Phi.{name}": Phi[i], f"t_hout.{name}": t_hout[i], f"t_cout.{name}": t_cout[i],
+                    f"valid.{name}": valid[i].astype(np.int64)})
+    for i, name in enumerate(F_CORRELATIONS):
+        out.update({f"Delta_P_h.{name}": Delta_P_h[i], f"valid_h.{name}": valid_fh[i].astype(np.int64),
+                    f"Delta_P_c.{name}": Delta_P_c[i], f"valid_c.{name}": valid_fc[i].astype(np.int64)})
+    for quantity, values, mask in (("Phi", Phi, valid), ("Delta_P_h", Delta_P_h, valid_fh),
+                                   ("Delta_P_c", Delta_P_c, valid_fc)):
+        out.update({f"{quantity}_{stat}": v for stat, v in envelope(values, mask).items()})
+    return out
+
+
+def Compare_cal(cd, **options):
+    """按配置文件参数比较全部经验公式
+
+    :cd: 配置字典
+    :options: 见 Compare_batch_cal
+    :returns: 列名到标量的字典
+
+    """
+    return {name: v.item() for name, v in Compare_batch_cal(config_to_batch(cd), **options).items()}
+
+
+def run_compare_stream(cd, input_path, output_path, chunk_size=100000, **options):
+    """流式经验公式比较: 分块读取工况文件, 逐块比较并写出结果
+
+    :cd: 配置字典，缺失的输入取配置值
+    :input_path: 输入文件路径 (CSV 或 Parquet)，列名同 stream_module.run_stream
+    :output_path: 输出文件路径 (CSV 或 Parquet)
+    :chunk_size: 每块行数
+    :options: 见 Compare_batch_cal
+    :returns: 计算的工况总数
+
+    """
+    total = 0
+    with Chunk_writer(output_path) as writer:
+        for columns in iter_chunks(input_path, chunk_size):
+            result = Compare_batch_cal(config_to_batch(cd, **column_inputs(columns)), **options)
+            writer.write({**columns, **result})
+            total += len(columns[next(iter(columns))])
+            logger.info(f"已完成 {total} 个工况")
+    return total
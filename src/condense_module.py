@@ -0,0 +1,246 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 13:05:00 +0800
+LastEditTime : 2026-10-18 13:05:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/condense_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+
+import numpy as np
+
+from . import cache_module as cache
+from . import instrument_module as instrument
+from .batch_module import config_to_batch
+from .F_module import f_SP_class, f_TP_class
+from .fixed_point_module import anderson_solve
+from .Nu_module import NU_TP_class, Nu_SP_class
+from .property_module import property_tables, update_properties
+from .Re_module import Re_class
+from .thermal_module import D_h_class, Delta_P, Pr_cal, h_cal, k_plane_cal
+from .valid_module import NOT_CONVERGED, OPTION_OUT, QUALITY_OUT, check_result
+
+logger = logging.getLogger(__name__)
+
+# 冷凝计算输入名称与配置文件 [FHTPPP] 键的对应关系, 热侧为冷凝侧, 饱和温度取热侧入口温度
+TP_KEYS = {
+    "X_in": "Inlet_quality",  # 入口干度
+    "rho_l": "Liquid_density",  # 液态密度 kg/m^3
+    "rho_g": "Vapor_density",  # 气态密度 kg/m^3
+    "gamma": "Latent_heat",  # 汽化潜热 J/kg
+    "cp_l": "Liquid_specific_heat_capacity",  # 液态比热容
+    "k_l": "Liquid_thermal_conductivity",  # 液态导热率
+    "mu_l": "Liquid_dynamic_viscosity",  # 液态动力粘度
+    "Kp": "Friction_Kp",  # Behrozifard 摩擦因子系数
+    "m_f": "Friction_m",  # Behrozifard 摩擦因子指数
+}
+
+# 两相努塞尔公式
+TP_CORRELATIONS = ("SK", "Wang")
+
+# 沿程计算支持的冷侧流动方式: 顺流 1、逆流 2
+CONDENSE_DIRECTIONS = (1, 2)
+
+
+def condense_options(cd):
+    """读取配置中的冷凝计算选项
+
+    :cd: 配置字典
+    :returns: (两相努塞尔公式名称, 制冷剂名称)
+
+    """
+    if "FHTPPP" not in cd:
+        raise ValueError("配置文件缺少热侧两相物性参数 [FHTPPP], 无法进行冷凝校核")
+    correlation = cd["FHTPPP"].get("Correlation", "SK")
+    if correlation not in TP_CORRELATIONS:
+        raise ValueError(f"未知的两相努塞尔公式: {correlation}, 可选 {', '.join(TP_CORRELATIONS)}")
+    return correlation, cd["FHTPPP"].get("Refrigerant", "R-410A")
+
+
+def condense_to_batch(cd, **overrides):
+    """由配置字典生成冷凝计算的批量输入
+
+    :cd: 配置字典
+    :overrides: 以 INPUT_KEYS 或 TP_KEYS 中的名称覆盖配置值，可为标量或数组
+    :returns: 批量输入字典，包含 INPUT_KEYS 与 TP_KEYS 中的全部名称，所有数组已广播为相同形状
+
+    """
+    condense_options(cd)
+    tp = {name: cd["FHTPPP"][key] for name, key in TP_KEYS.items()}
+    tp.update({k: v for k, v in overrides.items() if k in TP_KEYS})
+    bi = config_to_batch(cd, **{k: v for k, v in overrides.items() if k not in TP_KEYS})
+    arrays = np.broadcast_arrays(*bi.values(), *[np.asarray(v, dtype=float) for v in tp.values()])
+    return dict(zip(list(bi) + list(tp), arrays))
+
+
+def _cold_profile(T_sat, t_cin, ntu, counter):
+    """热侧等温时冷侧节点温度, 每段温差按 exp(-NTU) 衰减
+
+    :ntu: 各段以冷侧热容量计的 NTU, 形状 (m, n_seg)
+    :counter: 各工况是否逆流, 逆流时冷侧从最后一个节点进入
+    :returns: 冷侧节点温度 (m, n_seg + 1)
+
+    """
+    zero = np.zeros((ntu.shape[0], 1))
+    forward = np.hstack([zero, np.cumsum(ntu, axis=1)])
+    backward = np.hstack([np.cumsum(ntu[:, ::-1], axis=1)[:, ::-1], zero])
+    decay = np.exp(-np.where(counter[:, None], backward, forward))
+    return T_sat[:, None] - (T_sat - t_cin)[:, None] * decay
+
+
+def _segment_state(bi, X, T_c, n_seg, correlation, refrigerant, ang_corrugated, tables, keep):
+    """各段局部两相与冷侧单相换热计算
+
+    :bi: 批量输入字典, 各数组形状 (m,)
+    :X: 热侧节点干度 (m, n_seg + 1)
+    :T_c: 冷侧节点温度 (m, n_seg + 1)
+    :returns: 各段批量输入 (冷侧物性取段平均温度), 各段 NTU, 各段两相等效 Re, flag
+
+    """
+    shape = (X.shape[0], n_seg)
+    seg = {k: np.broadcast_to(v[:, None], shape) for k, v in bi.items()}
+    if tables and tables.get("c") is not None:
+        seg = update_properties(seg, {"h": None, "c": tables["c"]}, None, (T_c[:, :-1] + T_c[:, 1:]) / 2, keep)
+    X_m = np.clip((X[:, :-1] + X[:, 1:]) / 2, 0, 1)
+
+    Re = Re_class()
+    Re_eq = Re.Re_eq_cal(seg["q_hm"], seg["A"], seg["D_h"], seg["mu_l"], seg["rho_l"], seg["rho_g"], X_m)
+    Pr_l = Pr_cal(seg["cp_l"], seg["k_l"], seg["mu_l"])
+    Nu_TP = NU_TP_class()
+    if correlation == "SK":
+        # 对流数 Co = ((1 - x)/x)^0.8 (rho_g/rho_l)^0.5
+        with np.errstate(divide="ignore"):
+            Co = ((1 - X_m) / X_m)**0.8 * np.sqrt(seg["rho_g"] / seg["rho_l"])
+        Nu_h, flag_h = Nu_TP.Nu_SK_cal(None, None, None, Re_eq, Pr_l, Co, refrigerant, return_flag=True)
+    else:
+        Re_L = Re.Re_L_cal(seg["q_hm"], seg["A"], seg["D_h"], seg["mu_l"], X_m)
+        Delta_T = seg["t_hin"] - (T_c[:, :-1] + T_c[:, 1:]) / 2
+        Nu_h, flag_h = Nu_TP.Nu_Wang_cal(seg["cp_l"], Delta_T, seg["gamma"], Re_L, Pr_l, seg["rho_l"], seg["rho_g"],
+                                         return_flag=True)
+
+    Re_c = Re.common_cal(seg["q_cm"], seg["A"], seg["mu_c"], seg["rho_c"])
+    Nu_c, flag_c = Nu_SP_class().Okada_cal(Re_c, Pr_cal(seg["cp_c"], seg["k_fc"], seg["mu_c"]), ang_corrugated,
+                                           return_flag=True)
+
+    D_h = D_h_class().Corrugate_cal(seg["L_w"], seg["d_corrugate"])
+    k = k_plane_cal(h_cal(Nu_h, seg["k_l"], D_h), h_cal(Nu_c, seg["k_fc"], D_h), seg["sigma"], seg["k_s"])
+    ntu = k * seg["A"] / n_seg / (seg["q_cm"] * seg["cp_c"])
+    flag = flag_h | flag_c | np.where(np.isin(seg["FD"], CONDENSE_DIRECTIONS), 0, OPTION_OUT)
+    return seg, np.where(flag & OPTION_OUT, np.nan, ntu), Re_eq, Re_c, flag
+
+
+def _quality_profile(bi, T_c):
+    """由冷侧节点温度和能量守恒得到热侧节点干度"""
+    Q = (bi["q_cm"] * bi["cp_c"])[:, None] * np.abs(np.diff(T_c, axis=1))
+    zero = np.zeros((Q.shape[0], 1))
+    return bi["X_in"][:, None] - np.hstack([zero, np.cumsum(Q, axis=1)]) / (bi["q_hm"] * bi["gamma"])[:, None]
+
+
+@cache.cached
+def Condense_batch_cal(bi, n_seg=50, L=0.25, correlation="SK", refrigerant="R-410A", ang_corrugated=60, tables=None,
+                       keep=(), tol=1e-8, max_iter=100):
+    """热侧冷凝的批量校核计算, 沿流动方向推进干度
+
+    热侧为饱和温度 (取热侧入口温度) 下的两相流, 冷侧为单相流。将换热面积与流动长度等分为 n_seg 段,
+    每段按段平均干度计算两相等效 Re (Re_eq_cal / Re_L_cal)、两相 Nu (Song和Kim 或 Wang) 与
+    Behrozifard 摩擦因子, 冷侧按 Okada 计算。热侧等温, 冷侧温度由各段 NTU 直接求出, 干度由能量守恒求出,
+    二者在干度、冷侧温度与局部换热系数之间做不动点迭代, 每个工况独立收敛, 各段计算对所有工况向量化。
+    出口前已完全冷凝 (出口干度小于 0) 的工况结果为 NaN 并标记 QUALITY_OUT。
+    开启 cache_module 缓存时, 相同输入的重复调用直接返回缓存结果
+
+    :bi: 批量输入字典, 见 condense_to_batch
+    :n_seg: 分段数
+    :L: 流动长度 m
+    :correlation: 两相努塞尔公式, 见 TP_CORRELATIONS
+    :refrigerant: 制冷剂名称, Song和Kim 公式使用
+    :ang_corrugated: 波纹角 °
+    :tables: property_module.property_tables 的返回值, 只用于冷侧物性
+    :keep: 不随温度更新的物性输入名称
+    :tol: 收敛判据, 干度与冷侧温度 (°C) 的最大变化量
+    :max_iter: 最大迭代次数
+    :returns: 结果名称到数组的字典: Phi、t_hout、t_cout、Delta_P_h、Delta_P_c、flag 同 Rating_batch_cal,
+              另有 X_out 出口干度, x 节点位置 m, X 热侧干度、T_c 冷侧温度沿程分布 (形状为输入形状加一维 n_seg + 1)
+
+    """
+    if correlation not in TP_CORRELATIONS:
+        raise ValueError(f"未知的两相努塞尔公式: {correlation}, 可选 {', '.join(TP_CORRELATIONS)}")
+    shape = np.shape(bi["t_hin"])
+    bi = {k: np.reshape(v, -1) for k, v in bi.items()}
+    m = bi["t_hin"].size
+    instrument.count("Condense_batch_cal.rows", m)
+    counter = bi["FD"] == 2
+
+    def update(x, idx):
+        sub = {k: v[idx] for k, v in bi.items()}
+        X, T_c = x[:, :n_seg + 1], x[:, n_seg + 1:]
+        _, ntu, _, _, _ = _segment_state(sub, X, T_c, n_seg, correlation, refrigerant, ang_corrugated, tables, keep)
+        T_c = _cold_profile(sub["t_hin"], sub["t_cin"], ntu, counter[idx])
+        return np.hstack([_quality_profile(sub, T_c), T_c])
+
+    t = instrument.start()
+    # 初值: 干度取入口干度, 冷侧温度取入口温度
+    x0 = np.hstack([np.repeat(bi["X_in"][:, None], n_seg + 1, axis=1),
+                    np.repeat(bi["t_cin"][:, None], n_seg + 1, axis=1)])
+    x, converged, _ = anderson_solve(update, x0, tol, max_iter)
+    X, T_c = x[:, :n_seg + 1], x[:, n_seg + 1:]
+    seg, ntu, Re_eq, Re_c, flag = _segment_state(bi, X, T_c, n_seg, correlation, refrigerant, ang_corrugated, tables,
+                                                 keep)
+    t = instrument.lap("condense", t, X, T_c)
+
+    # 压降: 热侧按均相密度, 冷侧同 Hydraulic_batch_cal
+    X_m = np.clip((X[:, :-1] + X[:, 1:]) / 2, 0, 1)
+    rho_m = 1 / (X_m / seg["rho_g"] + (1 - X_m) / seg["rho_l"])
+    f_h, flag_fh = f_TP_class().Behrozifard_cal(seg["Kp"], Re_eq, seg["m_f"], return_flag=True)
+    f_c, flag_fc = f_SP_class().YY_Hsich_cal(Re_c, return_flag=True)
+    Delta_P_h = np.sum(Delta_P(f_h, L / n_seg, seg["D_h"], rho_m, seg["q_hm"] / rho_m / seg["D_h"]), axis=1)
+    Delta_P_c = np.sum(Delta_P(f_c, L / n_seg, seg["D_h"], seg["rho_c"], seg["q_cm"] / seg["rho_c"] / seg["D_h"]),
+                       axis=1)
+    instrument.lap("Delta_P", t, Delta_P_h, Delta_P_c)
+
+    X_out = X[:, -1]
+    quality_flag = np.where((X_out >= 0) | ~np.isfinite(X_out), 0, QUALITY_OUT)
+    X_out = check_result(logger, "冷凝干度", X_out, quality_flag, False)
+    flag = (np.bitwise_or.reduce(flag | flag_fh | flag_fc, axis=1) | quality_flag
+            | np.where(converged, 0, NOT_CONVERGED))
+    ok = (flag & (QUALITY_OUT | NOT_CONVERGED)) == 0
+    Phi = np.where(ok, (bi["X_in"] - X_out) * bi["q_hm"] * bi["gamma"], np.nan)
+    t_cout = np.where(ok, np.where(counter, T_c[:, 0], T_c[:, -1]), np.nan)
+    return {"Phi": Phi.reshape(shape), "t_hout": bi["t_hin"].reshape(shape), "t_cout": t_cout.reshape(shape),
+            "X_out": X_out.reshape(shape), "Delta_P_h": Delta_P_h.reshape(shape),
+            "Delta_P_c": Delta_P_c.reshape(shape), "flag": flag.reshape(shape), "x": np.linspace(0, L, n_seg + 1),
+            "X": X.reshape(shape + (n_seg + 1,)), "T_c": T_c.reshape(shape + (n_seg + 1,))}
+
+
+def Condense_cal(cd, n_seg=50, L=0.25):
+    """单工况冷凝校核计算
+
+    :cd: 配置字典, 需包含 [FHTPPP] 两相物性参数
+    :n_seg: 分段数
+    :L: 流动长度 m
+    :returns: 结果名称到数值的字典, x、X、T_c 为沿程分布数组，见 Condense_batch_cal
+
+    """
+    correlation, refrigerant = condense_options(cd)
+    res = Condense_batch_cal(condense_to_batch(cd), n_seg, L, correlation, refrigerant, tables=property_tables(cd))
+    return {k: v if np.ndim(v) else np.asarray(v).item() for k, v in res.items()}
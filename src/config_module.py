@@ -26,8 +26,11 @@ Description  :
  -----------------------------------------------------------------------
 '''
 
-import toml
+import copy
+import hashlib
 import logging
+import marshal
+import sys
 from pathlib import Path
 
 
@@ -35,7 +38,8 @@ from pathlib import Path
 default_config = """ # 参数设置
 # 结构参数 Structural parameters
 [SP]
-Flow_direction = 2 # 顺流：1 parallel flow  逆流：2 counter flow
+Flow_direction = 2 # 顺流：1 parallel flow  逆流：2 counter flow  交叉流两侧均不混合：3  交叉流 Cmax 侧混合：4  交叉流 Cmin 侧混合：5  1-2 壳管式：6  N 流程板式：7
+Number_of_passes = 1 # 流程数 (Flow_direction = 7) 或串联壳程数 (Flow_direction = 6)
 Hydraulic_diameter = 0.5 # 水力直径 m
 Effective_width = 0.2 # 板有效宽度 m
 Ripple_depth = 0.01 # 波纹深度 m
@@ -63,6 +67,7 @@ Density = 135 # 密度 kg/m^3
 Specific_heat_capacity = 1350 # 比热容
 Thermal_conductivity = 21 # 导热率
 Dynamic_viscosity = 0.01 # 动力粘度
+# Property_table = "water" # 物性表: 内置 water 或 CSV 文件路径, 设置后物性随温度变化
 Enthalpy = 1000 # 焓
 
 # 单相热侧液体物性参数 fluid cool single phase physical parameter
@@ -71,19 +76,124 @@ Density = 135 # 密度 kg/m^3
 Specific_heat_capacity = 1350 # 比热容
 Thermal_conductivity = 21 # 导热率
 Dynamic_viscosity = 0.01 # 动力粘度
+# Property_table = "water" # 物性表: 内置 water 或 CSV 文件路径, 设置后物性随温度变化
 Enthalpy = 1000 # 焓
+
+# 热侧两相 (冷凝) 物性参数 fluid heat two phase physical parameter, 仅冷凝校核 (--condense) 时使用, 饱和温度取热侧入口温度
+[FHTPPP]
+Correlation = "SK" # 两相努塞尔公式: SK (Song和Kim)、Wang
+Refrigerant = "R-410A" # 制冷剂, Song和Kim 公式可选 R-32、R-410A
+Inlet_quality = 0.9 # 入口干度
+Liquid_density = 1010 # 液态密度 kg/m^3
+Vapor_density = 105 # 气态密度 kg/m^3
+Latent_heat = 165000 # 汽化潜热 J/kg
+Liquid_specific_heat_capacity = 1600 # 液态比热容
+Liquid_thermal_conductivity = 0.092 # 液态导热率
+Liquid_dynamic_viscosity = 0.00011 # 液态动力粘度
+Friction_Kp = 61000 # Behrozifard 摩擦因子系数 f = Kp / Re^m
+Friction_m = 1.25 # Behrozifard 摩擦因子指数
+
+# 多工况 (可选): 每个 [[case]] 只需写出与以上基准参数不同的项, 使用 --cases 批量计算全部工况
+# [[case]]
+# name = "大流量" # 工况名称
+# BC.Mass_flow_heat = 0.3
+# [[case]]
+# name = "大流量逆流"
+# inherit = "大流量" # 继承已定义的工况, 默认继承基准参数
+# SP.Flow_direction = 2
 """
 
+# 解析结果缓存文件 (与配置文件同目录的隐藏文件) 的格式版本, 格式变化时递增
+SIDECAR_VERSION = 1
+
+
+def _parse_toml(data):
+    """解析 TOML 文本, 优先使用标准库 tomllib (Python 3.11+), 否则使用 toml 包"""
+    try:
+        import tomllib
+    except ImportError:
+        import toml  # 仅在读取配置文件时加载
+        return toml.loads(data.decode('utf-8'))
+    return tomllib.loads(data.decode('utf-8'))
+
+
+def _merge(base, override):
+    """递归合并配置字典, override 中的值覆盖 base, 返回新字典"""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def resolve_cases(config):
+    """展开配置中的多工况 [[case]]
+
+    文件顶层的各参数表为基准工况; 每个 [[case]] 只需写出与基准不同的参数, 如 BC.Mass_flow_heat = 0.2,
+    name 为工况名称 (默认 case1、case2 ...), inherit 指定改为继承此前某个已命名工况。
+    没有 [[case]] 时只有基准工况
+
+    参数:
+        config (dict): 解析后的配置字典。
+    返回:
+        tuple: ([(工况名称, 配置字典), ...], 错误列表), 继承关系有误的工况记入错误列表并跳过。
+    """
+    base = {k: v for k, v in config.items() if k != 'case'}
+    entries = config.get('case')
+    if not entries:
+        return [("base", base)], []
+    resolved = {}
+    cases = []
+    errors = []
+    for i, entry in enumerate(entries, 1):
+        entry = dict(entry)
+        name = str(entry.pop('name', f"case{i}"))
+        parent = entry.pop('inherit', None)
+        if parent is not None and parent not in resolved:
+            errors.append(f"工况 {name} 继承的工况 {parent} 不存在或未在其之前定义")
+            continue
+        cd = _merge(resolved[parent] if parent is not None else base, entry)
+        resolved[name] = cd
+        cases.append((name, cd))
+    return cases, errors
+
+
+def validate_case(name, cd):
+    """检查工况是否包含全部计算输入且取值为数值
+
+    参数:
+        name (str): 工况名称。
+        cd (dict): 配置字典。
+    返回:
+        list: 错误信息列表, 为空表示通过。
+    """
+    from .batch_module import INPUT_DEFAULTS, INPUT_KEYS  # 仅在检查工况时加载
+
+    errors = []
+    for input_name, (section, key) in INPUT_KEYS.items():
+        value = cd.get(section, {}).get(key)
+        if value is None:
+            if input_name not in INPUT_DEFAULTS:
+                errors.append(f"工况 {name} 缺少配置项 {section}.{key}")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append(f"工况 {name} 的配置项 {section}.{key} 不是数值: {value!r}")
+    return errors
+
+
 class ConfigParser:
     """
     配置解析器类, 用于处理系统配置和本地配置文件的加载和生成。
     """
-    def __init__(self):
+    def __init__(self, path=None):
         """
         初始化配置解析器, 设置日志记录器, 获取边界参数路径。
+        参数:
+            path (str | Path): 边界参数文件路径, 默认为当前工作目录下的 参数设置文件.toml
         """
         self.logger = logging.getLogger(__name__)  # 加载日志记录器
-        self.local_config_path = Path.cwd() / '参数设置文件.toml'  # 获取参数文件路径
+        self.local_config_path = Path(path) if path else Path.cwd() / '参数设置文件.toml'  # 获取参数文件路径
         self.logger.info("边界参数初始化完成")
 
     def _load_toml(self, path):
@@ -92,21 +202,68 @@ class ConfigParser:
         参数:
             path (Path): 配置文件路径。
         返回:
-            dict: 配置字典。
+            dict: 配置字典 (不含 [[case]] 多工况), 读取失败时为 None。
+        """
+        parsed = self._load_parsed(path)
+        return None if parsed is None else parsed["base"]
+
+    def _load_parsed(self, path):
+        """
+        加载配置文件并展开、检查多工况, 结果缓存在同目录的隐藏文件 .<文件名>.cache 中。
+        缓存记录配置文件的修改时间、大小与内容哈希: 修改时间与大小不变时直接使用缓存,
+        否则比较内容哈希, 内容未变时仍使用缓存, 内容变化时重新解析。
+        参数:
+            path (Path): 配置文件路径。
+        返回:
+            dict: {"base": 基准配置, "cases": [(名称, 配置), ...], "errors": 检查错误列表}, 读取失败时为 None。
         """
         if not path.exists():
             self.logger.warning("边界参数文件不存在: " + str(path))
             return None
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                config = toml.load(f)
+            stat = path.stat()
+            sidecar = path.with_name("." + path.name + ".cache")
+            header = (SIDECAR_VERSION, sys.version_info[:2], stat.st_mtime_ns, stat.st_size)
+            cached = self._read_sidecar(sidecar)
+            if cached is not None and cached[0] == header:
+                self.logger.info("边界参数文件加载成功 (缓存): " + str(path))
+                return cached[2]
+
+            data = path.read_bytes()
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if cached is not None and cached[0][:2] == header[:2] and cached[1] == digest:
+                parsed = cached[2]
+            else:
+                config = _parse_toml(data)
+                cases, errors = resolve_cases(config)
+                errors += [e for name, cd in cases for e in validate_case(name, cd)]
+                parsed = {"base": {k: v for k, v in config.items() if k != 'case'}, "cases": cases, "errors": errors}
+            self._write_sidecar(sidecar, (header, digest, parsed))
             self.logger.info("边界参数文件加载成功: " + str(path))
-            return config
+            return parsed
         except Exception as e:
             self.logger.error("边界参数文件加载失败: " + f"{path} --> {e}")
             return None
 
+    def _read_sidecar(self, sidecar):
+        """读取解析结果缓存, 不存在或损坏时返回 None"""
+        try:
+            with open(sidecar, 'rb') as f:
+                return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def _write_sidecar(self, sidecar, content):
+        """写入解析结果缓存, 目录不可写或含 marshal 不支持的值 (如 TOML 日期) 时跳过"""
+        try:
+            tmp = sidecar.with_name(sidecar.name + ".tmp")
+            with open(tmp, 'wb') as f:
+                marshal.dump(content, f)
+            tmp.replace(sidecar)
+        except (OSError, ValueError) as e:
+            self.logger.debug("边界参数缓存写入失败: " + f"{sidecar} --> {e}")
+
     def init_default_config(self, path, config):
         """
         生成默认边界参数文件。
@@ -134,4 +291,27 @@ class ConfigParser:
         
         local_config = self._load_toml(self.local_config_path)  # 加载本地配置文件
 
-        return local_config
\ No newline at end of file
+        return local_config
+
+    def load_config_file(self):
+        """
+        只读取边界参数文件, 文件不存在时不创建默认文件, 供库调用使用。
+        返回:
+            dict: 配置字典, 读取失败时为 None。
+        """
+        return self._load_toml(self.local_config_path)
+
+    def load_cases(self):
+        """
+        读取边界参数文件中的全部工况。
+        返回:
+            list: [(工况名称, 配置字典), ...], 没有 [[case]] 时只有基准工况。
+        异常:
+            ValueError: 文件读取失败或工况缺少计算输入。
+        """
+        parsed = self._load_parsed(self.local_config_path)
+        if parsed is None:
+            raise ValueError(f"无法读取边界参数文件: {self.local_config_path}")
+        if parsed["errors"]:
+            raise ValueError("\n".join(parsed["errors"]))
+        return [tuple(case) for case in parsed["cases"]]
@@ -0,0 +1,369 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 15:30:00 +0800
+LastEditTime : 2026-10-18 15:30:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/dual_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 前向模式自动微分: 对偶数 Dual 同时携带数值与对各输入方向的导数,
+# 通过 numpy 的 __array_ufunc__/__array_function__ 协议直接流经现有的向量化计算链
+
+import numpy as np
+
+
+class Dual:
+    """对偶数数组
+
+    value 为数值数组, deriv 为导数数组, 形状为 value.shape + (n,), n 为求导方向数。
+    支持四则运算、乘方、常用 ufunc 以及 where/select/broadcast_arrays 等函数, 比较运算只作用于数值;
+    不支持的 numpy 函数直接报错, 不会静默丢弃导数
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, value, deriv):
+        self.value = np.asarray(value, dtype=float)
+        self.deriv = np.asarray(deriv, dtype=float)
+
+    @classmethod
+    def seed(cls, values):
+        """以若干数组为自变量构造对偶数, 第 k 个数组对第 k 个方向的导数为 1
+
+        导数数组为只读的广播视图, 不随批量大小占用额外内存
+
+        :values: 数组列表，形状相同
+        :returns: Dual 列表
+
+        """
+        eye = np.eye(len(values))
+        return [cls(v, np.broadcast_to(eye[k], np.shape(v) + (len(values),))) for k, v in enumerate(values)]
+
+    @property
+    def n(self):
+        return self.deriv.shape[-1]
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    @property
+    def size(self):
+        return self.value.size
+
+    def __len__(self):
+        return len(self.value)
+
+    def __repr__(self):
+        return f"Dual(value={self.value!r}, deriv={self.deriv!r})"
+
+    def _deriv_index(self, idx):
+        """数值下标对应的导数下标, 省略号之后补上方向维"""
+        idx = idx if isinstance(idx, tuple) else (idx,)
+        return idx + (slice(None),) if any(i is Ellipsis for i in idx) else idx
+
+    def __getitem__(self, idx):
+        return Dual(self.value[idx], self.deriv[self._deriv_index(idx)])
+
+    def __setitem__(self, idx, other):
+        if not self.deriv.flags.writeable:
+            self.deriv = self.deriv.copy()
+        self.value[idx] = value(other)
+        self.deriv[self._deriv_index(idx)] = _deriv(other, np.shape(self.value[idx]), self.n)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def copy(self):
+        return Dual(self.value.copy(), self.deriv.copy())
+
+    def reshape(self, *shape):
+        shape = shape[0] if len(shape) == 1 and isinstance(shape[0], tuple) else shape
+        value = self.value.reshape(shape)
+        return Dual(value, self.deriv.reshape(value.shape + (self.n,)))
+
+    def ravel(self):
+        return self.reshape(-1)
+
+    def astype(self, dtype):
+        """转换为整数或布尔类型时只保留数值"""
+        if np.issubdtype(dtype, np.floating):
+            return self.copy()
+        return self.value.astype(dtype)
+
+    def item(self):
+        """0 维对偶数原样返回, 保留导数"""
+        return self
+
+    def sum(self, axis=None):
+        return np.sum(self, axis=axis)
+
+    @property
+    def T(self):
+        return Dual(self.value.T, np.moveaxis(self.deriv.T, 0, -1))
+
+    # 运算符委托给 ufunc
+    def __add__(self, other): return np.add(self, other)
+    def __radd__(self, other): return np.add(other, self)
+    def __sub__(self, other): return np.subtract(self, other)
+    def __rsub__(self, other): return np.subtract(other, self)
+    def __mul__(self, other): return np.multiply(self, other)
+    def __rmul__(self, other): return np.multiply(other, self)
+    def __truediv__(self, other): return np.true_divide(self, other)
+    def __rtruediv__(self, other): return np.true_divide(other, self)
+    def __pow__(self, other): return np.power(self, other)
+    def __rpow__(self, other): return np.power(other, self)
+    def __neg__(self): return np.negative(self)
+    def __pos__(self): return self
+    def __abs__(self): return np.absolute(self)
+    def __lt__(self, other): return self.value < value(other)
+    def __le__(self, other): return self.value <= value(other)
+    def __gt__(self, other): return self.value > value(other)
+    def __ge__(self, other): return self.value >= value(other)
+    def __eq__(self, other): return self.value == value(other)
+    def __ne__(self, other): return self.value != value(other)
+
+    __hash__ = None
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or "out" in kwargs:
+            return NotImplemented
+        values = [value(x) for x in inputs]
+        if ufunc in _VALUE_ONLY:
+            return ufunc(*values, **kwargs)
+        rule = _UFUNC_RULES.get(ufunc)
+        if rule is None:
+            return NotImplemented
+        n = next(x.n for x in inputs if isinstance(x, Dual))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = ufunc(*values, **kwargs)
+            derivs = [x.deriv if isinstance(x, Dual) else None for x in inputs]
+            d = rule(out, *values, *derivs)
+        return Dual(out, _deriv(Dual(out, d) if d is not None else out, np.shape(out), n))
+
+    def __array_function__(self, func, types, args, kwargs):
+        impl = _FUNCTIONS.get(func)
+        if impl is None:
+            return NotImplemented
+        return impl(*args, **kwargs)
+
+
+def value(x):
+    """对偶数的数值部分, 其他对象原样返回"""
+    return x.value if isinstance(x, Dual) else x
+
+
+def as_float(x):
+    """转换为浮点数组, 对偶数原样返回"""
+    return x if isinstance(x, Dual) else np.asarray(x, dtype=float)
+
+
+def deriv(x, n=None):
+    """对偶数的导数部分, 普通数组返回 None 或 (n 给定时) 全零导数"""
+    if isinstance(x, Dual):
+        return x.deriv
+    return None if n is None else np.zeros(np.shape(x) + (n,))
+
+
+def _deriv(x, shape, n):
+    """x 的导数广播到 shape + (n,), 常数导数为 0"""
+    if isinstance(x, Dual):
+        return np.broadcast_to(x.deriv, tuple(shape) + (n,))
+    return np.zeros(tuple(shape) + (n,))
+
+
+def _e(x):
+    """数值数组末尾添加方向维, 用于与导数相乘"""
+    return np.asarray(x)[..., None]
+
+
+def _combine(*terms):
+    """合并导数项, 忽略常数 (None) 项"""
+    terms = [t for t in terms if t is not None]
+    if not terms:
+        return None
+    total = terms[0]
+    for t in terms[1:]:
+        total = total + t
+    return total
+
+
+def _scale(d, factor):
+    return None if d is None else d * _e(factor)
+
+
+def _power_rule(out, a, b, da, db):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_a = None if da is None else da * _e(np.where(b == 0, 0.0, b * np.power(a, b - 1.0)))
+        d_b = None if db is None else db * _e(np.where(out == 0, 0.0, out * np.log(np.where(a > 0, a, np.nan))))
+    return _combine(d_a, d_b)
+
+
+_UFUNC_RULES = {
+    np.add: lambda out, a, b, da, db: _combine(da, db),
+    np.subtract: lambda out, a, b, da, db: _combine(da, None if db is None else -db),
+    np.multiply: lambda out, a, b, da, db: _combine(_scale(da, b), _scale(db, a)),
+    np.true_divide: lambda out, a, b, da, db: _combine(_scale(da, 1 / b), _scale(db, -out / b)),
+    np.power: _power_rule,
+    np.negative: lambda out, a, da: -da,
+    np.positive: lambda out, a, da: da,
+    np.absolute: lambda out, a, da: _scale(da, np.sign(a)),
+    np.exp: lambda out, a, da: _scale(da, out),
+    np.expm1: lambda out, a, da: _scale(da, out + 1),
+    np.log: lambda out, a, da: _scale(da, 1 / a),
+    np.log1p: lambda out, a, da: _scale(da, 1 / (1 + a)),
+    np.sqrt: lambda out, a, da: _scale(da, 0.5 / out),
+    np.square: lambda out, a, da: _scale(da, 2 * a),
+    np.sin: lambda out, a, da: _scale(da, np.cos(a)),
+    np.cos: lambda out, a, da: _scale(da, -np.sin(a)),
+    np.tanh: lambda out, a, da: _scale(da, 1 - out**2),
+    np.maximum: lambda out, a, b, da, db: _combine(_scale(da, a >= b), _scale(db, a < b)),
+    np.minimum: lambda out, a, b, da, db: _combine(_scale(da, a <= b), _scale(db, a > b)),
+    np.floor: lambda out, a, da: None,
+    np.ceil: lambda out, a, da: None,
+}
+
+# 只作用于数值的 ufunc (比较、判断、取整等)
+_VALUE_ONLY = {np.isfinite, np.isnan, np.isinf, np.sign, np.greater, np.greater_equal, np.less, np.less_equal,
+               np.equal, np.not_equal, np.logical_and, np.logical_or, np.logical_not, np.signbit}
+
+
+def _n_of(*xs):
+    for x in xs:
+        if isinstance(x, Dual):
+            return x.n
+        if isinstance(x, (list, tuple)):
+            n = _n_of(*x)
+            if n is not None:
+                return n
+    return None
+
+
+def _where(cond, x, y):
+    n = _n_of(x, y)
+    shape = np.broadcast_shapes(np.shape(cond), np.shape(value(x)), np.shape(value(y)))
+    out = np.where(value(cond), value(x), value(y))
+    d = np.where(_e(value(cond)), _deriv(x, shape, n), _deriv(y, shape, n))
+    return Dual(out, d)
+
+
+def _select(condlist, choicelist, default=0):
+    n = _n_of(choicelist, default)
+    shape = np.broadcast_shapes(*[np.shape(c) for c in condlist], *[np.shape(value(c)) for c in choicelist],
+                                np.shape(value(default)))
+    out = np.select(condlist, [value(c) for c in choicelist], value(default))
+    d = np.select([_e(c) for c in condlist], [_deriv(c, shape, n) for c in choicelist], _deriv(default, shape, n))
+    return Dual(out, d)
+
+
+def _broadcast_to(x, shape, **kwargs):
+    if not isinstance(x, Dual):
+        return np.broadcast_to(x, shape)
+    shape = tuple(np.atleast_1d(shape)) if not isinstance(shape, tuple) else shape
+    return Dual(np.broadcast_to(x.value, shape), np.broadcast_to(x.deriv, shape + (x.n,)))
+
+
+def _broadcast_arrays(*args, **kwargs):
+    shape = np.broadcast_shapes(*[np.shape(value(a)) for a in args])
+    return [_broadcast_to(a, shape) for a in args]
+
+
+def _reshape(x, shape, **kwargs):
+    return x.reshape(shape) if isinstance(x, Dual) else np.reshape(x, shape)
+
+
+def _concatenate(arrays, axis=0, **kwargs):
+    n = _n_of(arrays)
+    return Dual(np.concatenate([value(a) for a in arrays], axis=axis),
+                np.concatenate([_deriv(a, np.shape(value(a)), n) for a in arrays], axis=axis if axis >= 0 else axis - 1))
+
+
+def _stack_like(func):
+    def impl(arrays, *args, **kwargs):
+        n = _n_of(arrays)
+        values = [value(a) for a in arrays]
+        out = func(values, *args, **kwargs)
+        # 在导数的每个方向上分别组合, 保证与数值的组合方式完全一致
+        d = np.stack([func([_deriv(a, np.shape(v), n)[..., k] for a, v in zip(arrays, values)], *args, **kwargs)
+                      for k in range(n)], axis=-1)
+        return Dual(out, d)
+    return impl
+
+
+def _axis_func(func):
+    def impl(x, axis=None, **kwargs):
+        if axis is None:
+            x = x.ravel()
+            axis = 0
+        axis = axis if axis >= 0 else axis + x.ndim
+        return Dual(func(x.value, axis=axis, **kwargs), func(x.deriv, axis=axis, **kwargs))
+    return impl
+
+
+def _clip(x, a_min, a_max, **kwargs):
+    out = np.clip(value(x), value(a_min), value(a_max))
+    inside = (out == value(x))
+    return Dual(out, _deriv(x, out.shape, x.n) * _e(inside))
+
+
+def _zeros_like(x, *args, **kwargs):
+    return Dual(np.zeros_like(x.value, dtype=float), np.zeros(x.deriv.shape))
+
+
+def _ones_like(x, *args, **kwargs):
+    return Dual(np.ones_like(x.value, dtype=float), np.zeros(x.deriv.shape))
+
+
+def _full_like(x, fill_value, *args, **kwargs):
+    return Dual(np.full_like(x.value, fill_value, dtype=float), np.zeros(x.deriv.shape))
+
+
+_FUNCTIONS = {
+    np.where: _where,
+    np.select: _select,
+    np.broadcast_to: _broadcast_to,
+    np.broadcast_arrays: _broadcast_arrays,
+    np.reshape: _reshape,
+    np.ravel: lambda x, *a, **k: x.ravel(),
+    np.copy: lambda x, *a, **k: x.copy(),
+    np.shape: lambda x: x.shape,
+    np.ndim: lambda x: x.ndim,
+    np.size: lambda x, axis=None: x.size if axis is None else x.shape[axis],
+    np.concatenate: _concatenate,
+    np.stack: _stack_like(np.stack),
+    np.column_stack: _stack_like(np.column_stack),
+    np.hstack: _stack_like(np.hstack),
+    np.sum: _axis_func(np.sum),
+    np.cumsum: _axis_func(np.cumsum),
+    np.diff: _axis_func(np.diff),
+    np.clip: _clip,
+    np.zeros_like: _zeros_like,
+    np.ones_like: _ones_like,
+    np.full_like: _full_like,
+    np.isclose: lambda a, b, *args, **kwargs: np.isclose(value(a), value(b), *args, **kwargs),
+    np.count_nonzero: lambda x, *args, **kwargs: np.count_nonzero(value(x), *args, **kwargs),
+}
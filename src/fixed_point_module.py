@@ -0,0 +1,76 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 10:18:26 +0800
+LastEditTime : 2026-10-18 10:18:26 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/fixed_point_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import numpy as np
+
+
+def anderson_solve(func, x0, tol=1e-6, max_iter=50):
+    """批量不动点迭代 x = G(x), 采用一阶 Anderson (多维割线) 加速
+
+    每行独立判断收敛, 已收敛的行不再参与计算, 只对未收敛的行调用 G
+
+    :func: 函数 (x, idx) -> G(x)，x 形状为 (len(idx), m)，idx 为参与计算的行号
+    :x0: 初值，形状 (n, m)
+    :tol: 收敛判据, 每行 |G(x) - x| 的最大分量小于 tol
+    :max_iter: 最大迭代次数
+    :returns: (解, 是否收敛, 各行迭代次数)
+
+    """
+    x = np.array(x0, dtype=float)
+    n = x.shape[0]
+    converged = np.zeros(n, dtype=bool)
+    n_iter = np.zeros(n, dtype=np.int64)
+    active = np.arange(n)
+    x_prev = g_prev = f_prev = None
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        xa = x[active]
+        g = func(xa, active)
+        f = g - xa
+        n_iter[active] += 1
+
+        done = np.max(np.abs(f), axis=1) < tol
+        # 计算失败 (NaN) 的行停止迭代, 保持未收敛
+        failed = ~np.all(np.isfinite(f), axis=1)
+        x_new = g.copy()
+        if f_prev is not None:
+            df = f - f_prev
+            dg = g - g_prev
+            denom = np.einsum("ij,ij->i", df, df)
+            gamma = np.divide(np.einsum("ij,ij->i", df, f), denom, out=np.zeros_like(denom), where=denom > 0)
+            x_new -= gamma[:, None] * dg
+        x[active] = np.where(done[:, None], g, x_new)
+        converged[active[done]] = True
+
+        keep = ~(done | failed)
+        active = active[keep]
+        x_prev, g_prev, f_prev = x_new[keep], g[keep], f[keep]
+
+    return x, converged, n_iter
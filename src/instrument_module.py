@@ -0,0 +1,137 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 17:08:44 +0800
+LastEditTime : 2026-10-18 17:08:44 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/instrument_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 计算链路的计数、分段计时与数值分布统计
+# 默认关闭; 关闭时 start() 返回 None, lap() 与 count() 只做一次判断即返回, 不产生其他开销
+
+import json
+from time import perf_counter
+
+import numpy as np
+
+from .dual_module import value as dual_value
+
+enabled = False
+
+# 数值分布统计的对数分箱: 1e-6 ~ 1e9, 每个数量级 10 个箱
+HIST_EDGES = np.logspace(-6, 9, 151)
+
+_counters = {}
+_timings = {}
+_histograms = {}
+
+
+def enable():
+    """开启统计"""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """关闭统计"""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """清空已收集的统计数据"""
+    _counters.clear()
+    _timings.clear()
+    _histograms.clear()
+
+
+def count(name, n=1):
+    """计数器累加"""
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name, values):
+    """记录数值分布: 个数、NaN 个数、最小值、最大值、总和以及对数分箱直方图, 对偶数只记录数值部分"""
+    if not enabled:
+        return
+    values = np.ravel(dual_value(values))
+    finite = values[np.isfinite(values)]
+    h = _histograms.get(name)
+    if h is None:
+        h = _histograms[name] = {"count": 0, "nan": 0, "nonpositive": 0, "min": np.inf, "max": -np.inf,
+                                 "sum": 0.0, "bins": np.zeros(len(HIST_EDGES) - 1, dtype=np.int64)}
+    h["count"] += values.size
+    h["nan"] += values.size - finite.size
+    if finite.size:
+        h["min"] = min(h["min"], float(finite.min()))
+        h["max"] = max(h["max"], float(finite.max()))
+        h["sum"] += float(finite.sum())
+        h["nonpositive"] += int(np.count_nonzero(finite <= 0))
+        h["bins"] += np.histogram(finite[finite > 0], HIST_EDGES)[0]
+
+
+def start():
+    """开始分段计时, 统计关闭时返回 None"""
+    return perf_counter() if enabled else None
+
+
+def lap(stage, t0, *values):
+    """结束一段计时并记录该段输出值的分布
+
+    :stage: 分段名称
+    :t0: 上一次 start() 或 lap() 的返回值，为 None 时直接返回
+    :values: 该段的输出值
+    :returns: 下一段的计时起点
+
+    """
+    if t0 is None:
+        return None
+    t = _timings.setdefault(stage, [0, 0.0])
+    t[0] += 1
+    t[1] += perf_counter() - t0
+    for v in values:
+        observe(stage, v)
+    return perf_counter()
+
+
+def snapshot():
+    """以字典形式导出统计数据"""
+    return {
+        "counters": dict(_counters),
+        "timings": {k: {"calls": c, "seconds": s} for k, (c, s) in _timings.items()},
+        "histograms": {
+            k: {**{f: h[f] for f in ("count", "nan", "nonpositive", "sum")},
+                "min": h["min"] if h["min"] <= h["max"] else None,
+                "max": h["max"] if h["min"] <= h["max"] else None,
+                "bin_edges": HIST_EDGES[np.flatnonzero(h["bins"])].tolist(),
+                "bin_counts": h["bins"][h["bins"] > 0].tolist()}
+            for k, h in _histograms.items()
+        },
+    }
+
+
+def export_json(path):
+    """将统计数据写入 JSON 文件, 直方图只保留非空箱 (bin_edges 为箱的下边界)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=2)
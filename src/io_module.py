@@ -0,0 +1,144 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 10:33:52 +0800
+LastEditTime : 2026-10-18 10:33:52 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/io_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+# 按 Parquet 格式读写的文件后缀
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def is_parquet(path):
+    """根据文件后缀判断是否为 Parquet 文件"""
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def _import_parquet():
+    """按需导入 pyarrow, 未安装时给出提示"""
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("读写 Parquet 文件需要安装 pyarrow: pip install pyarrow") from e
+    return pyarrow, pq
+
+
+def read_csv(path):
+    """读取带表头的数值 CSV 文件
+
+    :path: 文件路径
+    :returns: 列名到数组的字典
+
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = [name.strip() for name in f.readline().split(",")]
+        data = np.loadtxt(f, delimiter=",", ndmin=2)
+    return {name: data[:, i] for i, name in enumerate(header)}
+
+
+def write_csv(path, columns):
+    """将计算结果写入 CSV 文件
+
+    :path: 输出路径
+    :columns: 列名到数组的字典
+
+    """
+    data = np.column_stack(list(columns.values()))
+    np.savetxt(path, data, delimiter=",", header=",".join(columns), comments="", fmt="%.10g")
+
+
+def iter_chunks(path, chunk_size):
+    """按固定行数分块读取 CSV 或 Parquet 文件, 内存占用与文件大小无关
+
+    :path: 文件路径，后缀为 .parquet/.pq 时按 Parquet 读取，否则按 CSV 读取
+    :chunk_size: 每块行数
+    :returns: 生成器，每次产生一个列名到数组的字典
+
+    """
+    if is_parquet(path):
+        _, pq = _import_parquet()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield {name: np.asarray(col.to_numpy(zero_copy_only=False), dtype=float)
+                   for name, col in zip(batch.schema.names, batch.columns)}
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        header = [name.strip() for name in f.readline().split(",")]
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                break
+            data = np.loadtxt(lines, delimiter=",", ndmin=2)
+            yield {name: data[:, i] for i, name in enumerate(header)}
+
+
+class Chunk_writer(object):
+    """分块写入 CSV 或 Parquet 文件, 第一块确定列名"""
+
+    def __init__(self, path):
+        """
+        :path: 输出路径，后缀为 .parquet/.pq 时按 Parquet 写入，否则按 CSV 写入
+        """
+        self.path = path
+        self.parquet = is_parquet(path)
+        self._file = None
+        self._writer = None
+
+    def write(self, columns):
+        """写入一块数据
+
+        :columns: 列名到数组的字典
+
+        """
+        if self.parquet:
+            pyarrow, pq = _import_parquet()
+            table = pyarrow.table(columns)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+            return
+
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write(",".join(columns) + "\n")
+        np.savetxt(self._file, np.column_stack(list(columns.values())), delimiter=",", fmt="%.10g")
+
+    def close(self):
+        """关闭输出文件"""
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,246 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 16:02:51 +0800
+LastEditTime : 2026-10-18 16:02:51 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/jit_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 可选的本地代码加速: 安装 numba 时将 Re → Pr → Nu(Okada) → h → k → NTU → epsilon → Phi 整条热力计算链
+# 编译为逐行融合的并行循环, 每行只读取一次输入、写出一次结果, 不产生中间数组。
+# 默认关闭, 调用 enable() 开启; 未安装 numba 时 enable() 给出提示并继续使用 NumPy 计算。
+# 对偶数输入、开启计算链路统计或波纹角不在 Okada 可选值内时仍走 NumPy 路径。
+# numba 只在开启加速或首次调用计算核时导入, 不增加程序启动时间
+
+import importlib.util
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+available = importlib.util.find_spec("numba") is not None
+enabled = False
+numba = None
+
+# Okada 公式系数: 波纹角 -> (C, m), 与 Nu_SP_class.Okada_cal 一致
+OKADA_COEF = {30: (0.157, 0.66), 45: (0.249, 0.64), 60: (0.327, 0.65), 75: (0.478, 0.62)}
+
+# 与 thermal_module 一致的极限判据与交叉流级数参数
+_R_EPS = 1e-9
+_SERIES_TOL = 1e-10
+_SERIES_TERMS = 2000
+
+# 融合核的输入顺序
+KERNEL_INPUTS = ("t_hin", "t_cin", "q_hm", "q_cm", "FD", "N_pass", "A", "L_w", "d_corrugate", "sigma", "k_s",
+                 "rho_h", "cp_h", "k_fh", "mu_h", "rho_c", "cp_c", "k_fc", "mu_c")
+
+
+# 已登记、尚未编译的计算核 [(函数, 编译选项), ...]
+_pending = []
+
+
+def _jit(**options):
+    """登记为计算核, 首次经 _compile() 使用时编译为本地代码 (除零按 NumPy 规则得到 inf/NaN);
+    编译前及未安装 numba 时保持为 Python 函数"""
+    def register(func):
+        _pending.append((func, options))
+        return func
+    return register
+
+
+prange = range
+
+
+def _import_numba():
+    """导入 numba 并换上其并行循环, 未安装时返回 None"""
+    global numba, prange
+    if numba is None and available:
+        import numba as module
+        numba, prange = module, module.prange
+    return numba
+
+
+def _compile():
+    """编译全部已登记的计算核, 以编译结果替换所在模块中的同名函数; 已编译的不再重复处理"""
+    if not _pending or _import_numba() is None:
+        return
+    while _pending:
+        func, options = _pending.pop()
+        func.__globals__[func.__name__] = numba.njit(cache=True, error_model="numpy", **options)(func)
+
+
+def enable():
+    """开启加速计算, 未安装 numba 时返回 False"""
+    global enabled
+    if _import_numba() is None:
+        logger.warning("未安装 numba, 继续使用 NumPy 计算 (pip install numba)")
+        return False
+    enabled = True
+    return True
+
+
+def disable():
+    """关闭加速计算"""
+    global enabled
+    enabled = False
+
+
+@_jit()
+def _eps_series_row(eps_p, R, N):
+    """N 个相同单元总体逆流串联, 见 thermal_module._eps_series"""
+    if eps_p >= 1:
+        return 1.0
+    if abs(1 - R) < _R_EPS:
+        a = 1 + (N - 1) * eps_p
+        return N * eps_p / a + (1 - R) * N * (N - 1) * eps_p**2 / (2 * a**2)
+    z = ((1 - eps_p * R) / (1 - eps_p))**N
+    return (z - 1) / (z - R)
+
+
+@_jit()
+def _eps_parallel_row(ntu, R):
+    return -math.expm1(-ntu * (1 + R)) / (1 + R)
+
+
+@_jit()
+def _eps_shell_1_2_row(ntu, R):
+    s = math.sqrt(1 + R**2)
+    d = -math.expm1(-ntu * s)
+    if d == 0:
+        return 0.0
+    return 2 / (1 + R + s * (2 - d) / d)
+
+
+@_jit()
+def _eps_cross_unmixed_row(ntu, R):
+    """交叉流两侧均不混合的级数解, 见 thermal_module._eps_cross_unmixed"""
+    if R < _R_EPS or ntu <= 0:
+        return -math.expm1(-ntu)
+    x, y = ntu, R * ntu
+    if not math.isfinite(y):
+        return math.nan
+    log_x, log_y = math.log(x), math.log(y)
+    cdf_x = cdf_y = total = 0.0
+    rest_x, rest_y = x, y
+    for n in range(_SERIES_TERMS):
+        lg = math.lgamma(n + 1)
+        cdf_x += math.exp(n * log_x - x - lg)
+        cdf_y += math.exp(n * log_y - y - lg)
+        P_x = max(1 - cdf_x, 0.0)
+        P_y = max(1 - cdf_y, 0.0)
+        total += P_x * P_y
+        rest_x -= P_x
+        rest_y -= P_y
+        if min(rest_x, rest_y) <= _SERIES_TOL * y:
+            break
+    return total / y
+
+
+@_jit()
+def _epsilon_row(code, ntu, R, N):
+    """单行效能, 流动方式编号见 thermal_module.FLOW_DIRECTIONS"""
+    if code == 1:
+        return _eps_parallel_row(ntu, R)
+    if code == 2:
+        if abs(1 - R) < _R_EPS:
+            return ntu / (1 + ntu) + (1 - R) * ntu**2 / (2 * (1 + ntu)**2)
+        e = math.expm1(-ntu * (1 - R))
+        return -e / ((1 - R) - R * e)
+    if code == 3:
+        return _eps_cross_unmixed_row(ntu, R)
+    if code == 4:
+        if R < _R_EPS:
+            return -math.expm1(-ntu)
+        return -math.expm1(R * math.expm1(-ntu)) / R
+    if code == 5:
+        g = ntu if R < _R_EPS else -math.expm1(-R * ntu) / R
+        return -math.expm1(-g)
+    if code == 6:
+        return _eps_series_row(_eps_shell_1_2_row(ntu / N, R), R, N)
+    if code == 7:
+        return _eps_series_row(_eps_parallel_row(ntu / N, R), R, N)
+    return math.nan
+
+
+@_jit(parallel=True)
+def _thermal_kernel(t_hin, t_cin, q_hm, q_cm, FD, N_pass, A, L_w, d_corrugate, sigma, k_s,
+                    rho_h, cp_h, k_fh, mu_h, rho_c, cp_c, k_fc, mu_c, C, m, Phi, t_hout, t_cout):
+    """逐行融合的热力计算, 结果写入 Phi、t_hout、t_cout"""
+    for i in prange(Phi.size):
+        qc_h = q_hm[i] * cp_h[i]
+        qc_c = q_cm[i] * cp_c[i]
+        qc_max = max(qc_h, qc_c)
+        qc_min = min(qc_h, qc_c)
+        D_h = 4 * L_w[i] * d_corrugate[i] / (2 * (d_corrugate[i] + L_w[i]))
+
+        Re_h = rho_h[i] * (q_hm[i] / rho_h[i] / A[i]) * A[i] / mu_h[i]
+        Re_c = rho_c[i] * (q_cm[i] / rho_c[i] / A[i]) * A[i] / mu_c[i]
+        # C * Re^m * Pr^0.4, 合并为一次指数运算
+        Nu_h = C * math.exp(m * math.log(Re_h) + 0.4 * math.log(cp_h[i] * mu_h[i] / k_fh[i]))
+        Nu_c = C * math.exp(m * math.log(Re_c) + 0.4 * math.log(cp_c[i] * mu_c[i] / k_fc[i]))
+        h_h = Nu_h * k_fh[i] / D_h
+        h_c = Nu_c * k_fc[i] / D_h
+
+        k = 1 / (1 / h_h + sigma[i] / k_s[i] + 1 / h_c)
+        ntu = k * A[i] / qc_min
+        eps = _epsilon_row(FD[i], ntu, qc_min / qc_max, N_pass[i])
+
+        Phi[i] = eps * qc_min * (t_hin[i] - t_cin[i])
+        t_hout[i] = t_hin[i] - Phi[i] / qc_h
+        t_cout[i] = t_cin[i] + Phi[i] / qc_c
+
+
+def _flat(v, shape, n):
+    """将输入展为长度 n 的一维浮点数组, 单值输入用零步长视图, 不复制"""
+    a = np.asarray(v, dtype=float)
+    if a.size == 1:
+        return np.broadcast_to(a.reshape(-1), (n,))
+    return np.ascontiguousarray(np.broadcast_to(a, shape)).reshape(n)
+
+
+def Thermal_fused_cal(bi, ang_corrugated=60, kernel=None):
+    """融合核批量热力计算, 与 batch_module.Thermal_batch_cal 的 NumPy 路径结果一致
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :ang_corrugated: 波纹角 °
+    :kernel: 计算核，默认为编译后的 _thermal_kernel
+    :returns: (Phi, t_hout, t_cout)；输入含对偶数、波纹角为数组或不在 Okada 可选值内时返回 None
+
+    """
+    if np.ndim(ang_corrugated) != 0:
+        return None
+    coef = next((c for a, c in OKADA_COEF.items() if math.isclose(float(ang_corrugated), a, abs_tol=1e-8)), None)
+    values = [bi[name] for name in KERNEL_INPUTS]
+    if coef is None or not all(isinstance(v, (np.ndarray, np.generic, int, float)) for v in values):
+        return None
+    shape = np.broadcast_shapes(*(np.shape(v) for v in values))
+    n = math.prod(shape)
+    args = [_flat(v, shape, n) for v in values]
+    out = [np.empty(n) for _ in range(3)]
+    if kernel is None:
+        _compile()
+        kernel = _thermal_kernel
+    kernel(*args, *coef, *out)
+    return tuple(o.reshape(shape)[()] for o in out)
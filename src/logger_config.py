@@ -28,7 +28,6 @@
 
 import logging
 import logging.config
-from rich.logging import RichHandler  # 导入rich库的日志处理模块
 
 
 # --------------------------------------------------------------------------------
@@ -49,6 +48,8 @@ def setup_logger(verbose):
     2. 使用RichHandler配置日志格式，包括消息格式、日期格式等。
     3. 获取并返回名为'pytexmk.py'的日志记录器实例。
     """
+    from rich.logging import RichHandler  # 导入rich库的日志处理模块, 仅在配置日志时加载
+
     FORMAT = "%(message)s"
 
     # 如果设置了verbose 选项，则将日志级别设置为INFO，以便输出更多信息
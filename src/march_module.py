@@ -0,0 +1,246 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 11:20:00 +0800
+LastEditTime : 2026-10-18 11:20:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/march_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import numpy as np
+
+from . import cache_module as cache
+from . import instrument_module as instrument
+from .batch_module import Thermal_batch_cal, config_to_batch
+from .F_module import f_SP_class
+from .fixed_point_module import anderson_solve
+from .Nu_module import Nu_SP_class
+from .property_module import property_tables, update_properties
+from .Re_module import Re_class
+from .thermal_module import D_h_class, Delta_P, Pr_cal, epsilon_cal, h_cal, judge, k_plane_cal
+from .valid_module import NOT_CONVERGED, OPTION_OUT
+
+# 沿程分段模型支持的流动方式: 顺流 1、逆流 2
+MARCH_DIRECTIONS = (1, 2)
+
+
+def _solve_banded(l, u, ab, b):
+    """批量带状线性方程组求解, 不选主元的高斯消元
+
+    分段模型的方程组每行对角元为 1, 其余元素绝对值之和不超过 1, 无需选主元
+
+    :l: 下带宽
+    :u: 上带宽
+    :ab: 带状存储的系数矩阵, 形状 (l + u + 1, n, m), ab[u + i - j, j] = a[i, j], m 为工况数
+    :b: 右端项, 形状 (n, m)
+    :returns: 解, 形状 (n, m)
+
+    """
+    ab = ab.copy()
+    b = b.copy()
+    n = b.shape[0]
+    for k in range(n - 1):
+        for i in range(k + 1, min(k + l, n - 1) + 1):
+            f = ab[u + i - k, k] / ab[u, k]
+            for j in range(k + 1, min(k + u, n - 1) + 1):
+                ab[u + i - j, j] -= f * ab[u + k - j, j]
+            b[i] -= f * b[k]
+    x = np.empty_like(b)
+    for k in range(n - 1, -1, -1):
+        s = b[k]
+        for j in range(k + 1, min(k + u, n - 1) + 1):
+            s = s - ab[u + k - j, j] * x[j]
+        x[k] = s / ab[u, k]
+    return x
+
+
+def _segment_inputs(bi, T_h, T_c, tables, keep):
+    """各段的批量输入, 物性取段内两侧平均温度下的值
+
+    :bi: 批量输入字典, 各数组形状 (m,)
+    :T_h: 热侧节点温度 (m, n_seg + 1)
+    :T_c: 冷侧节点温度 (m, n_seg + 1)
+    :returns: 各数组形状 (m, n_seg) 的批量输入字典
+
+    """
+    shape = (T_h.shape[0], T_h.shape[1] - 1)
+    seg = {k: np.broadcast_to(v[:, None], shape) for k, v in bi.items()}
+    if tables:
+        seg = update_properties(seg, tables, (T_h[:, :-1] + T_h[:, 1:]) / 2, (T_c[:, :-1] + T_c[:, 1:]) / 2, keep)
+    return seg
+
+
+def _segment_coefficients(seg, n_seg, ang_corrugated):
+    """各段传热系数
+
+    :seg: 各段批量输入
+    :returns: s_h, s_c 两侧温降系数 (段换热量 / 该侧热容量 / 段入口温差), C_h, C_c 两侧热容量, flag
+
+    """
+    Re = Re_class()
+    Re_h = Re.common_cal(seg["q_hm"], seg["A"], seg["mu_h"], seg["rho_h"])
+    Re_c = Re.common_cal(seg["q_cm"], seg["A"], seg["mu_c"], seg["rho_c"])
+    Pr_h = Pr_cal(seg["cp_h"], seg["k_fh"], seg["mu_h"])
+    Pr_c = Pr_cal(seg["cp_c"], seg["k_fc"], seg["mu_c"])
+
+    Nu_SP = Nu_SP_class()
+    Nu_h, flag_h = Nu_SP.Okada_cal(Re_h, Pr_h, ang_corrugated, return_flag=True)
+    Nu_c, flag_c = Nu_SP.Okada_cal(Re_c, Pr_c, ang_corrugated, return_flag=True)
+
+    D_h = D_h_class().Corrugate_cal(seg["L_w"], seg["d_corrugate"])
+    k = k_plane_cal(h_cal(Nu_h, seg["k_fh"], D_h), h_cal(Nu_c, seg["k_fc"], D_h), seg["sigma"], seg["k_s"])
+
+    C_h = seg["q_hm"] * seg["cp_h"]
+    C_c = seg["q_cm"] * seg["cp_c"]
+    C_max, C_min = judge(seg["q_hm"], seg["cp_h"], seg["q_cm"], seg["cp_c"])
+    # 每段按同流向的局部 epsilon-NTU 精确解计算, 物性不变时与整体模型结果一致
+    epsilon = epsilon_cal(seg["FD"], False, k * seg["A"] / n_seg / C_min, C_min / C_max)
+    supported = np.isin(seg["FD"], MARCH_DIRECTIONS)
+    epsilon = np.where(supported, epsilon, np.nan)
+    flag = flag_h | flag_c | np.where(supported, 0, OPTION_OUT)
+    return epsilon * C_min / C_h, epsilon * C_min / C_c, C_h, C_c, flag
+
+
+def _assemble(FD, t_hin, t_cin, s_h, s_c):
+    """组装节点温度的带状方程组
+
+    未知量按 [T_h0, T_c0, T_h1, T_c1, ..., T_hN, T_cN] 排列, 段 j 的换热量为 s·C·(T_h 入口 - T_c 入口):
+    顺流两侧入口均为节点 j, 逆流冷侧入口为节点 j + 1, 两点边值问题整体求解而不是打靶
+
+    :returns: l, u, ab, b, 见 _solve_banded
+
+    """
+    m, n_seg = s_h.shape
+    n = 2 * (n_seg + 1)
+    l, u = 3, 2
+    ab = np.zeros((l + u + 1, n, m))
+    b = np.zeros((n, m))
+    j = np.arange(n_seg)
+    counter = (FD == 2)[None, :]
+    s_h, s_c = s_h.T, s_c.T
+
+    def put(rows, cols, values):
+        ab[u + rows[:, None] - cols[:, None], cols[:, None], np.arange(m)] = values
+
+    ab[u, :] = 1
+    b[0] = t_hin
+    # 热侧: T_h[j+1] - (1 - s_h) T_h[j] - s_h T_c[入口] = 0, 位于第 2j + 2 行
+    put(2 * j + 2, 2 * j, -(1 - s_h))
+    put(2 * j + 2, 2 * j + 1, np.where(counter, 0, -s_h))
+    put(2 * j + 2, 2 * j + 3, np.where(counter, -s_h, 0))
+    # 冷侧: 顺流 T_c[j+1] - (1 - s_c) T_c[j] - s_c T_h[j] = 0, 位于第 2j + 3 行;
+    #       逆流 T_c[j] - (1 - s_c) T_c[j+1] - s_c T_h[j] = 0, 位于第 2j + 1 行
+    put(2 * j + 3, 2 * j + 1, np.where(counter, 0, -(1 - s_c)))
+    put(2 * j + 3, 2 * j, np.where(counter, 0, -s_c))
+    put(2 * j + 1, 2 * j + 3, np.where(counter, -(1 - s_c), 0))
+    put(2 * j + 1, 2 * j, np.where(counter, -s_c, 0))
+    # 冷侧入口边界: 顺流 T_c0 = t_cin 位于第 1 行, 逆流 T_cN = t_cin 位于最后一行
+    b[1] = np.where(counter[0], 0, t_cin)
+    b[-1] = np.where(counter[0], t_cin, 0)
+    return l, u, ab, b
+
+
+@cache.cached
+def March_batch_cal(bi, n_seg=100, L=0.25, ang_corrugated=60, tables=None, keep=(), tol=1e-6, max_iter=50):
+    """沿流动方向分段的批量校核计算
+
+    将换热面积与流动长度 L 等分为 n_seg 段, 每段按局部物性计算 Re、Nu(Okada)、摩擦因子(YY_Hsich) 和传热系数,
+    节点温度由带状方程组一次求出; 配置了物性表时在节点温度与局部物性之间做不动点迭代, 每个工况独立收敛。
+    只支持顺流和逆流, 其余流动方式结果为 NaN 并标记 OPTION_OUT。
+    开启 cache_module 缓存时, 相同输入的重复调用直接返回缓存结果
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :n_seg: 分段数
+    :L: 流动长度 m
+    :ang_corrugated: 波纹角 °
+    :tables: property_module.property_tables 的返回值
+    :keep: 不随温度更新的物性输入名称
+    :tol: 节点温度收敛判据 °C
+    :max_iter: 最大迭代次数
+    :returns: 结果名称到数组的字典: Phi、t_hout、t_cout、Delta_P_h、Delta_P_c、flag 同 Rating_batch_cal,
+              另有 x 节点位置 m, T_h、T_c 节点温度 (形状为输入形状加一维 n_seg + 1)
+
+    """
+    shape = np.shape(bi["t_hin"])
+    bi = {k: np.reshape(v, -1) for k, v in bi.items()}
+    m = bi["t_hin"].size
+    instrument.count("March_batch_cal.rows", m)
+    instrument.count("March_batch_cal.segments", m * n_seg)
+    tables = tables if tables and any(tables.values()) else None
+
+    def solve(T, idx):
+        sub = {k: v[idx] for k, v in bi.items()}
+        T_h, T_c = T[:, 0::2], T[:, 1::2]
+        seg = _segment_inputs(sub, T_h, T_c, tables, keep)
+        s_h, s_c, _, _, _ = _segment_coefficients(seg, n_seg, ang_corrugated)
+        return _solve_banded(*_assemble(sub["FD"], sub["t_hin"], sub["t_cin"], s_h, s_c)).T
+
+    t = instrument.start()
+    # 初值: 整体模型出口温度间的线性分布
+    _, t_hout, t_cout = Thermal_batch_cal(bi, ang_corrugated)
+    w = np.linspace(0, 1, n_seg + 1)
+    counter = (bi["FD"] == 2)[:, None]
+    T0 = np.empty((m, 2 * (n_seg + 1)))
+    T0[:, 0::2] = bi["t_hin"][:, None] + (t_hout - bi["t_hin"])[:, None] * w
+    T0[:, 1::2] = np.where(counter, t_cout[:, None] + (bi["t_cin"] - t_cout)[:, None] * w,
+                           bi["t_cin"][:, None] + (t_cout - bi["t_cin"])[:, None] * w)
+    T0 = np.where(np.isfinite(T0), T0, np.column_stack([bi["t_hin"], bi["t_cin"]] * (n_seg + 1)))
+    if tables:
+        T, converged, _ = anderson_solve(solve, T0, tol, max_iter)
+    else:
+        T, converged = T0, np.ones(m, dtype=bool)
+    T = solve(T, np.arange(m))
+    t = instrument.lap("march", t, T)
+
+    T_h, T_c = T[:, 0::2], T[:, 1::2]
+    seg = _segment_inputs(bi, T_h, T_c, tables, keep)
+    _, _, C_h, C_c, flag = _segment_coefficients(seg, n_seg, ang_corrugated)
+    Phi = np.sum(C_h * (T_h[:, :-1] - T_h[:, 1:]), axis=1)
+
+    Re = Re_class()
+    F_class = f_SP_class()
+    dP = {}
+    for side, q, rho, mu in (("h", "q_hm", "rho_h", "mu_h"), ("c", "q_cm", "rho_c", "mu_c")):
+        f, flag_f = F_class.YY_Hsich_cal(Re.common_cal(seg[q], seg["A"], seg[mu], seg[rho]), return_flag=True)
+        dP[side] = np.sum(Delta_P(f, L / n_seg, seg["D_h"], seg[rho], seg[q] / seg[rho] / seg["D_h"]), axis=1)
+        flag = flag | flag_f
+    instrument.lap("Delta_P", t, dP["h"], dP["c"])
+
+    flag = np.bitwise_or.reduce(flag, axis=1) | np.where(converged, 0, NOT_CONVERGED)
+    t_cout = np.where(counter[:, 0], T_c[:, 0], T_c[:, -1])
+    return {"Phi": Phi.reshape(shape), "t_hout": T_h[:, -1].reshape(shape), "t_cout": t_cout.reshape(shape),
+            "Delta_P_h": dP["h"].reshape(shape), "Delta_P_c": dP["c"].reshape(shape), "flag": flag.reshape(shape),
+            "x": np.linspace(0, L, n_seg + 1), "T_h": T_h.reshape(shape + (n_seg + 1,)),
+            "T_c": T_c.reshape(shape + (n_seg + 1,))}
+
+
+def March_cal(cd, n_seg=100, L=0.25):
+    """单工况沿程分段校核计算
+
+    :cd: 配置字典
+    :n_seg: 分段数
+    :L: 流动长度 m
+    :returns: 结果名称到数值的字典, x、T_h、T_c 为沿程分布数组，见 March_batch_cal
+
+    """
+    res = March_batch_cal(config_to_batch(cd), n_seg, L, tables=property_tables(cd))
+    return {k: v if np.ndim(v) else np.asarray(v).item() for k, v in res.items()}
@@ -0,0 +1,251 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 14:10:00 +0800
+LastEditTime : 2026-10-18 14:10:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/montecarlo_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_module import CONFIG_KEYS, Rating_batch_cal, config_to_batch
+from .property_module import property_tables
+
+logger = logging.getLogger(__name__)
+
+# 统计的结果量
+MC_OUTPUTS = ("Phi", "t_hout", "t_cout", "Delta_P_h", "Delta_P_c")
+
+# 输入分布
+DISTRIBUTIONS = ("normal", "uniform")
+
+
+def parse_uncertainty_spec(spec):
+    """解析单个输入不确定度
+
+    支持的写法:
+        BC.Temp_heat_inlet=0.5             正态分布, 标准差 0.5 (与配置值同单位)
+        BC.Mass_flow_heat=2%               正态分布, 标准差为配置值的 2%
+        FHSPPP.Density=1%:uniform          均匀分布, 半宽为配置值的 1%
+
+    :spec: 不确定度字符串
+    :returns: (配置键, (幅值, 是否为相对值, 分布))
+
+    """
+    key, sep, value = spec.partition("=")
+    key = key.strip()
+    if not sep or key not in CONFIG_KEYS:
+        raise ValueError(f"无法识别的不确定度参数: {spec}，可选键: {', '.join(CONFIG_KEYS)}")
+    value, _, dist = value.partition(":")
+    dist = dist.strip() or "normal"
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"无法识别的分布: {dist}，可选: {', '.join(DISTRIBUTIONS)}")
+    value = value.strip()
+    relative = value.endswith("%")
+    try:
+        size = float(value.rstrip("%"))
+    except ValueError:
+        raise ValueError(f"无法识别的不确定度参数: {spec}")
+    return key, (size / 100 if relative else size, relative, dist)
+
+
+class Stream_stats:
+    """流式统计量: 均值、标准差与分位数, 内存占用与样本数无关
+
+    均值与方差用 Welford/Chan 公式逐块合并; 分位数由固定分箱的直方图插值得到,
+    箱宽为 (hi - lo) / n_bins, 落在 [lo, hi] 之外的样本计入两端溢出箱, 溢出箱按实际最小、最大值插值。
+    相同分箱的统计量可以合并, 用于多进程汇总。NaN 样本单独计数, 不参与统计
+    """
+
+    def __init__(self, lo, hi, n_bins=16384):
+        """
+        :lo: 直方图下限
+        :hi: 直方图上限
+        :n_bins: 分箱数
+        """
+        self.lo, self.hi, self.n_bins = float(lo), float(hi), n_bins
+        self.width = (self.hi - self.lo) / n_bins
+        self.counts = np.zeros(n_bins + 2, dtype=np.int64)
+        self.n = 0
+        self.n_nan = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _merge_moments(self, n, mean, M2):
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.M2 += M2 + delta**2 * self.n * n / total
+        self.n = total
+
+    def update(self, x):
+        """加入一批样本"""
+        x = np.ravel(np.asarray(x, dtype=float))
+        finite = np.isfinite(x)
+        self.n_nan += int(x.size - np.count_nonzero(finite))
+        x = x[finite]
+        if x.size == 0:
+            return
+        mean = x.mean()
+        self._merge_moments(x.size, mean, float(np.sum((x - mean)**2)))
+        idx = np.clip(np.floor((x - self.lo) / self.width) + 1, 0, self.n_bins + 1).astype(np.int64)
+        self.counts += np.bincount(idx, minlength=self.n_bins + 2)
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+
+    def merge(self, other):
+        """合并分箱相同的另一统计量"""
+        if (other.lo, other.hi, other.n_bins) != (self.lo, self.hi, self.n_bins):
+            raise ValueError("只能合并分箱相同的统计量")
+        self.n_nan += other.n_nan
+        if other.n == 0:
+            return
+        self._merge_moments(other.n, other.mean, other.M2)
+        self.counts += other.counts
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        """样本标准差"""
+        return float(np.sqrt(self.M2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def quantile(self, q):
+        """分位数, q 取 0~1, 可为数组"""
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        # 各箱的左右边界, 两端溢出箱以实际最小、最大值为界
+        left = np.concatenate([[min(self.min, self.lo)], self.lo + self.width * np.arange(self.n_bins + 1)])
+        right = np.concatenate([left[1:], [max(self.max, self.hi)]])
+        cum = np.cumsum(self.counts)
+        target = q * self.n
+        i = np.minimum(np.searchsorted(cum, target, side="left"), self.n_bins + 1)
+        below = np.where(i > 0, cum[i - 1], 0)
+        frac = np.divide(target - below, self.counts[i], out=np.zeros_like(target), where=self.counts[i] > 0)
+        return np.clip(left[i] + frac * (right[i] - left[i]), self.min, self.max)
+
+    def summary(self, percentiles=(2.5, 50, 97.5)):
+        """统计结果字典: n、n_nan、mean、std、min、max 及各百分位数 (键为 p2.5 形式)"""
+        res = {"n": self.n, "n_nan": self.n_nan, "mean": float(self.mean) if self.n else np.nan, "std": self.std,
+               "min": float(self.min) if self.n else np.nan, "max": float(self.max) if self.n else np.nan}
+        for p, v in zip(percentiles, self.quantile(np.asarray(percentiles) / 100)):
+            res[f"p{p:g}"] = float(v)
+        return res
+
+
+def _mc_samples(cd, uncertainties, seed, index, size):
+    """生成第 index 块的输入样本并计算, 随机数流只由 seed 与块号决定, 与进程数无关"""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    overrides = {}
+    for key, (amp, relative, dist) in uncertainties.items():
+        section, name = key.split(".")
+        nominal = cd[section][name]
+        scale = amp * abs(nominal) if relative else amp
+        noise = rng.standard_normal(size) if dist == "normal" else rng.uniform(-1, 1, size)
+        overrides[CONFIG_KEYS[key]] = nominal + scale * noise
+    bi = config_to_batch(cd, **overrides)
+    # 随机样本不会重复, 不写入结果缓存
+    return Rating_batch_cal.__wrapped__(bi, tables=property_tables(cd), keep=overrides)
+
+
+def _mc_chunk(cd, uncertainties, seed, index, size, edges):
+    """计算一块样本并累加到流式统计量, 供进程池调用
+
+    :returns: (结果名称到 Stream_stats 的字典, 超出经验公式适用范围的样本数)
+
+    """
+    res = _mc_samples(cd, uncertainties, seed, index, size)
+    return _accumulate(res, edges)
+
+
+def _accumulate(res, edges):
+    stats = {}
+    for name in MC_OUTPUTS:
+        stats[name] = Stream_stats(*edges[name])
+        stats[name].update(res[name])
+    return stats, int(np.count_nonzero(res["flag"]))
+
+
+def _edges(res):
+    """由首块样本确定直方图范围: 样本范围向两侧各扩展一倍"""
+    edges = {}
+    for name in MC_OUTPUTS:
+        x = np.asarray(res[name], dtype=float)
+        x = x[np.isfinite(x)]
+        lo, hi = (x.min(), x.max()) if x.size else (0.0, 1.0)
+        pad = (hi - lo) or max(abs(lo), 1.0) * 1e-6
+        edges[name] = (lo - pad, hi + pad)
+    return edges
+
+
+def run_montecarlo(cd, uncertainties, n_samples, seed=0, workers=None, chunk_size=100000,
+                   percentiles=(2.5, 50, 97.5)):
+    """蒙特卡洛不确定度传递: 对输入按给定分布抽样并批量校核计算, 流式统计各结果量
+
+    样本按块生成与计算, 每块只保留流式统计量, 内存占用与样本总数无关。各块随机数由 seed 与块号派生,
+    统计量按块号顺序合并, 因此结果只取决于 seed 与 chunk_size, 与进程数无关
+
+    :cd: 配置字典
+    :uncertainties: 配置键到 (幅值, 是否为相对值, 分布) 的字典, 见 parse_uncertainty_spec
+    :n_samples: 样本总数
+    :seed: 随机数种子
+    :workers: 进程数, None 表示 CPU 核数, 1 表示在当前进程计算
+    :chunk_size: 每块样本数
+    :percentiles: 输出的百分位数
+    :returns: 字典, 键为 MC_OUTPUTS 中的结果名称 (值为 Stream_stats.summary 的结果)
+              以及 n_samples 样本总数、n_flagged 超出经验公式适用范围的样本数
+
+    """
+    bounds = [(i, min(chunk_size, n_samples - start)) for i, start in enumerate(range(0, n_samples, chunk_size))]
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"蒙特卡洛计算共 {n_samples} 个样本, 分为 {len(bounds)} 块, {workers} 个进程")
+
+    first = _mc_samples(cd, uncertainties, seed, *bounds[0])
+    edges = _edges(first)
+    stats, n_flagged = _accumulate(first, edges)
+    del first
+
+    def merge(parts):
+        nonlocal n_flagged
+        for part_stats, part_flagged in parts:
+            for name in MC_OUTPUTS:
+                stats[name].merge(part_stats[name])
+            n_flagged += part_flagged
+
+    args = [(cd, uncertainties, seed, index, size, edges) for index, size in bounds[1:]]
+    if workers == 1 or not args:
+        merge(_mc_chunk(*a) for a in args)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            merge(pool.map(_mc_chunk, *zip(*args)))
+
+    res = {name: stats[name].summary(percentiles) for name in MC_OUTPUTS}
+    res.update(n_samples=n_samples, n_flagged=n_flagged)
+    return res
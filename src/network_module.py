@@ -0,0 +1,431 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 19:05:47 +0800
+LastEditTime : 2026-10-18 19:05:47 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/network_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 换热器网络: 多台板式换热器由流股 (stream) 连接, 流股可分流 (split) 与混合 (mix), 求全部流股的流量与温度。
+# 流量由来源流量与分流比确定; 给定流量且物性不随温度变化时, 每台换热器的出口温度是两侧入口温度的线性函数
+# (系数由 epsilon-NTU 模型给出), 混合器为按质量流量的加权平均, 因此全网温度为一个稀疏线性方程组。
+# 方程组按依赖关系分解为强连通分量 (块三角形式): 无循环的部分按拓扑顺序直接代入,
+# 存在回流 (如进出料换热) 的分量整体求解。多个工况点沿末轴向量化计算。
+# 配置了物性表时, 物性取各换热器两侧进出口平均温度下的值, 在流股温度上做 Anderson 加速的不动点迭代
+
+import logging
+
+import numpy as np
+
+from .batch_module import Hydraulic_batch_cal, Thermal_batch_cal, config_to_batch
+from .config_module import _parse_toml, resolve_cases, validate_case
+from .fixed_point_module import anderson_solve
+from .property_module import property_tables, update_properties
+from .valid_module import NOT_CONVERGED
+
+logger = logging.getLogger(__name__)
+
+# 网络文件示例
+EXAMPLE_NETWORK = """# 换热器网络: 流股以名称连接, 每个流股恰有一个来源 (source、换热器出口、分流或混合出口)
+[[source]]
+stream = "H0" # 流股名称
+flow = 0.3 # 质量流量 kg/s
+temp = 80 # 温度 摄氏度
+
+[[source]]
+stream = "C0"
+flow = 0.2
+temp = 25
+
+[[split]]
+name = "S1" # 分流名称, 默认 split1、split2 ...
+inlet = "H0"
+outlets = ["H1", "H2"]
+fractions = [0.5, 0.5] # 各出口流量占比, 之和为 1
+
+[[unit]]
+name = "E1" # 换热器名称, 其余参数写法同 [[case]], 只需写出与基准参数不同的项
+hot = ["H1", "H3"] # 热侧 [入口, 出口] 流股
+cold = ["C0", "C1"] # 冷侧 [入口, 出口] 流股
+
+[[unit]]
+name = "E2"
+hot = ["H2", "H4"]
+cold = ["C1", "C2"]
+SP.Cross_sectional_area = 0.5
+
+[[mix]]
+name = "M1"
+inlets = ["H3", "H4"]
+outlet = "H5"
+"""
+
+
+def _blocks(deps):
+    """依赖图的强连通分量 (Tarjan 算法, 非递归), 按依赖在前的顺序排列
+
+    :deps: 各节点所依赖节点序号的列表
+    :returns: 强连通分量列表，每个分量为节点序号列表
+
+    """
+    n = len(deps)
+    index = [None] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    blocks = []
+    counter = 0
+    for root in range(n):
+        if index[root] is not None:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(deps[root]))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if index[w] is None:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(deps[w])))
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                if low[v] == index[v]:
+                    block = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        block.append(w)
+                        if w == v:
+                            break
+                    blocks.append(block[::-1])
+    return blocks
+
+
+def _solve_dense(A, b):
+    """批量求解稠密方程组, 奇异 (如无出口的循环) 的工况点结果为 NaN"""
+    try:
+        return np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        x = np.full(b.shape, np.nan)
+        for i in range(b.shape[0]):
+            try:
+                x[i] = np.linalg.solve(A[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+        return x
+
+
+def _solve_blocks(blocks, rows, m):
+    """按块三角形式求解 x_s = const_s + Σ coef·x_dep
+
+    :blocks: _blocks 的返回值
+    :rows: 各流股的 (const, [(dep, coef), ...])，const 与 coef 为标量或形状 (m,) 的数组
+    :m: 工况点数
+    :returns: 形状 (流股数, m) 的解
+
+    """
+    x = np.empty((len(rows), m))
+    for block in blocks:
+        if len(block) == 1 and all(dep != block[0] for dep, _ in rows[block[0]][1]):
+            const, terms = rows[block[0]]
+            value = const
+            for dep, coef in terms:
+                value = value + coef * x[dep]
+            x[block[0]] = value
+            continue
+        pos = {s: i for i, s in enumerate(block)}
+        A = np.zeros((m, len(block), len(block)))
+        A[:, range(len(block)), range(len(block))] = 1
+        b = np.zeros((m, len(block)))
+        for i, s in enumerate(block):
+            const, terms = rows[s]
+            b[:, i] += const
+            for dep, coef in terms:
+                if dep in pos:
+                    A[:, i, pos[dep]] -= coef
+                else:
+                    b[:, i] += coef * x[dep]
+        x[block] = _solve_dense(A, b).T
+    return x
+
+
+class Heat_exchanger_network(object):
+    """换热器网络
+
+    :cd: 基准配置字典，各换热器在此基础上覆盖参数; 物性表取基准配置中的设置
+    :spec: 网络定义字典 (source、unit、split、mix 列表)，格式见 EXAMPLE_NETWORK
+    """
+
+    def __init__(self, cd, spec):
+        self.tables = property_tables(cd)
+        units = [dict(entry) for entry in spec.get("unit", ())]
+        if not units:
+            raise ValueError("网络中没有换热器 [[unit]]")
+        # 换热器参数的写法与继承关系同 [[case]]
+        for i, unit in enumerate(units, 1):
+            unit["name"] = str(unit.get("name", f"unit{i}"))
+        ports = {unit["name"]: (unit.pop("hot", None), unit.pop("cold", None)) for unit in units}
+        cases, errors = resolve_cases({**cd, "case": units})
+        if len(ports) < len(units):
+            errors.append("换热器名称重复")
+        errors += [e for name, unit_cd in cases for e in validate_case(name, unit_cd)]
+
+        self.streams = []
+        index = {}
+        producer = {}
+        consumed = set()
+
+        def stream(name, role, produced=False):
+            """登记流股并返回序号, produced 为 True 表示流股由 role 产生, 否则为 role 的入口"""
+            if not isinstance(name, str):
+                errors.append(f"{role} 的流股名称应为字符串: {name!r}")
+                return 0
+            if name not in index:
+                index[name] = len(self.streams)
+                self.streams.append(name)
+            if produced:
+                if name in producer:
+                    errors.append(f"流股 {name} 有多个来源: {producer[name]}、{role}")
+                producer[name] = role
+            else:
+                if name in consumed:
+                    errors.append(f"流股 {name} 被多处使用, 分流请使用 [[split]]")
+                consumed.add(name)
+            return index[name]
+
+        self.sources = {}
+        for entry in spec.get("source", ()):
+            try:
+                name = entry["stream"]
+                self.sources[name] = (stream(name, f"来源 {name}", True), float(entry["flow"]), float(entry["temp"]))
+            except (KeyError, TypeError, ValueError):
+                errors.append(f"来源定义有误 (需要 stream、flow、temp): {entry}")
+
+        self.units = []
+        for name, unit_cd in cases:
+            hot, cold = ports[name]
+            if not (isinstance(hot, list) and len(hot) == 2 and isinstance(cold, list) and len(cold) == 2):
+                errors.append(f"换热器 {name} 的 hot、cold 应为 [入口, 出口] 流股名称")
+                continue
+            role = f"换热器 {name}"
+            self.units.append((name, stream(hot[0], role), stream(cold[0], role),
+                               stream(hot[1], role, True), stream(cold[1], role, True), unit_cd))
+
+        self.splits = []
+        for i, entry in enumerate(spec.get("split", ()), 1):
+            name = str(entry.get("name", f"split{i}"))
+            outlets, fractions = entry.get("outlets", []), entry.get("fractions", [])
+            if "inlet" not in entry or not outlets or len(outlets) != len(fractions):
+                errors.append(f"分流 {name} 需要 inlet、outlets 以及与 outlets 等长的 fractions")
+                continue
+            if abs(sum(fractions) - 1) > 1e-9:
+                errors.append(f"分流 {name} 的 fractions 之和不为 1")
+            role = f"分流 {name}"
+            self.splits.append((name, stream(entry["inlet"], role), [stream(s, role, True) for s in outlets],
+                                [float(f) for f in fractions]))
+
+        self.mixes = []
+        for i, entry in enumerate(spec.get("mix", ()), 1):
+            name = str(entry.get("name", f"mix{i}"))
+            if not entry.get("inlets") or "outlet" not in entry:
+                errors.append(f"混合 {name} 需要 inlets 与 outlet")
+                continue
+            role = f"混合 {name}"
+            self.mixes.append((name, [stream(s, role) for s in entry["inlets"]], stream(entry["outlet"], role, True)))
+
+        errors += [f"流股 {name} 没有来源" for name in self.streams if name not in producer]
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        # 各换热器的固定输入, 形状 (换热器数, 1), 与工况点沿末轴广播
+        bis = [config_to_batch(unit[-1]) for unit in self.units]
+        self.bi = {k: np.array([bi[k] for bi in bis])[:, None] for k in bis[0]}
+        self._hot_in, self._cold_in, self._hot_out, self._cold_out = (
+            np.array([unit[i] for unit in self.units]) for i in range(1, 5))
+        self._flow_rows, deps = self._structure()
+        self.blocks = _blocks(deps)
+
+    @classmethod
+    def load(cls, path, cd):
+        """读取网络文件 (TOML)
+
+        :path: 文件路径
+        :cd: 基准配置字典
+        :returns: Heat_exchanger_network
+
+        """
+        with open(path, 'rb') as f:
+            return cls(cd, _parse_toml(f.read()))
+
+    def _structure(self):
+        """流量方程 (与工况无关的部分) 与温度方程的依赖关系"""
+        n = len(self.streams)
+        flow = [None] * n
+        deps = [[] for _ in range(n)]
+        for name, (s, _, _) in self.sources.items():
+            flow[s] = ("source", name)
+        for _, hot_in, cold_in, hot_out, cold_out, _ in self.units:
+            flow[hot_out] = ("same", hot_in)
+            flow[cold_out] = ("same", cold_in)
+            deps[hot_out] = deps[cold_out] = [hot_in, cold_in]
+        for k, (_, inlet, outlets, _) in enumerate(self.splits):
+            for j, s in enumerate(outlets):
+                flow[s] = ("split", inlet, k, j)
+                deps[s] = [inlet]
+        for _, inlets, outlet in self.mixes:
+            flow[outlet] = ("mix", inlets)
+            deps[outlet] = list(inlets)
+        return flow, deps
+
+    def _solve_flows(self, source_flow, fractions, m):
+        """各流股质量流量, 形状 (流股数, m)"""
+        rows = []
+        for kind, *args in self._flow_rows:
+            if kind == "source":
+                rows.append((source_flow[args[0]], []))
+            elif kind == "same":
+                rows.append((0, [(args[0], 1)]))
+            elif kind == "split":
+                rows.append((0, [(args[0], fractions[args[1]][args[2]])]))
+            else:
+                rows.append((0, [(s, 1) for s in args[0]]))
+        return _solve_blocks(self.blocks, rows, m)
+
+    def _unit_inputs(self, q, T, idx):
+        """各换热器在工况点 idx 下的批量输入, 形状 (换热器数, len(idx))
+
+        :q: 全部工况点的流股流量 (流股数, m)
+        :T: 工况点 idx 的流股温度 (流股数, len(idx))，为 None 时物性取基准配置值，
+            否则取两侧进出口平均温度下的值
+
+        """
+        shape = (len(self.units), len(idx))
+        bi = {k: np.broadcast_to(v, shape) for k, v in self.bi.items()}
+        bi["q_hm"] = q[self._hot_in][:, idx]
+        bi["q_cm"] = q[self._cold_in][:, idx]
+        if T is not None:
+            bi = update_properties(bi, self.tables, (T[self._hot_in] + T[self._hot_out]) / 2,
+                                   (T[self._cold_in] + T[self._cold_out]) / 2)
+        return bi
+
+    def _solve_temperatures(self, bi, q, source_temp, idx):
+        """给定换热器输入时求各流股温度, 形状 (流股数, len(idx))
+
+        出口温度对入口温度为线性, 以入口温度 1 与 0 计算一次得到系数:
+        t_hout = (1 - a)·t_hin + a·t_cin, t_cout = b·t_hin + (1 - b)·t_cin
+
+        """
+        _, t_hout, t_cout, flag = Thermal_batch_cal({**bi, "t_hin": np.ones(1), "t_cin": np.zeros(1)},
+                                                    return_flag=True)
+        a, b = 1 - t_hout, t_cout
+        rows = [None] * len(self.streams)
+        for name, (s, _, _) in self.sources.items():
+            rows[s] = (source_temp[name][idx], [])
+        for u, (_, hot_in, cold_in, hot_out, cold_out, _) in enumerate(self.units):
+            rows[hot_out] = (0, [(hot_in, 1 - a[u]), (cold_in, a[u])])
+            rows[cold_out] = (0, [(hot_in, b[u]), (cold_in, 1 - b[u])])
+        for _, inlet, outlets, _ in self.splits:
+            for s in outlets:
+                rows[s] = (0, [(inlet, 1)])
+        for _, inlets, outlet in self.mixes:
+            total = q[inlets][:, idx].sum(axis=0)
+            rows[outlet] = (0, [(s, q[s][idx] / total) for s in inlets])
+        return _solve_blocks(self.blocks, rows, len(idx)), flag
+
+    def rate(self, sources=None, fractions=None, L=0.25, tol=1e-6, max_iter=50):
+        """网络校核计算, 工况点沿末轴向量化
+
+        :sources: 来源流股名称到 {"flow": 流量, "temp": 温度} 的字典，覆盖网络文件中的值，可为数组
+        :fractions: 分流名称到各出口占比列表的字典，覆盖网络文件中的值，各项可为数组
+        :L: 流动长度 m
+        :tol: 物性随温度变化时流股温度的收敛判据 °C
+        :max_iter: 最大迭代次数
+        :returns: 列名到数组的字典: q.<流股>、T.<流股> 流股流量与温度, Phi.<换热器>、Delta_P_h.<换热器>、
+                  Delta_P_c.<换热器>、flag.<换热器> 各换热器换热量、压降与越界原因编码, Phi 总换热量
+
+        """
+        sources, fractions = sources or {}, fractions or {}
+        for name in list(sources) + list(fractions):
+            if name not in self.sources and name not in [split[0] for split in self.splits]:
+                raise ValueError(f"网络中没有来源流股或分流: {name}")
+        flow = {name: sources.get(name, {}).get("flow", q) for name, (_, q, _) in self.sources.items()}
+        temp = {name: sources.get(name, {}).get("temp", t) for name, (_, _, t) in self.sources.items()}
+        frac = [list(fractions.get(name, f)) for name, _, _, f in self.splits]
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in
+                                       [*flow.values(), *temp.values(), *(f for fs in frac for f in fs)]])
+        shape = values[0].shape
+        values = [v.reshape(-1) for v in values]
+        m = values[0].size if values else 1
+        n_src = len(flow)
+        flow, temp = dict(zip(flow, values[:n_src])), dict(zip(temp, values[n_src:2 * n_src]))
+        it = iter(values[2 * n_src:])
+        frac = [[next(it) for _ in fs] for fs in frac]
+
+        # 流量与温度无关, 只求一次
+        q = self._solve_flows(flow, frac, m)
+        idx = np.arange(m)
+        bi = self._unit_inputs(q, None, idx)
+        T, flag = self._solve_temperatures(bi, q, temp, idx)
+        converged = np.ones(m, dtype=bool)
+        if any(self.tables.values()):
+            def update(x, idx):
+                return self._solve_temperatures(self._unit_inputs(q, x.T, idx), q, temp, idx)[0].T
+
+            x, converged, _ = anderson_solve(update, T.T, tol, max_iter)
+            bi = self._unit_inputs(q, x.T, idx)
+            T, flag = self._solve_temperatures(bi, q, temp, idx)
+        Delta_P_h, Delta_P_c, flag_h = Hydraulic_batch_cal(bi, L, return_flag=True)
+        Phi = q[self._hot_in] * bi["cp_h"] * (T[self._hot_in] - T[self._hot_out])
+        flag = flag | flag_h | np.where(converged, 0, NOT_CONVERGED)
+
+        res = {}
+        for i, name in enumerate(self.streams):
+            res[f"q.{name}"], res[f"T.{name}"] = q[i], T[i]
+        for u, unit in enumerate(self.units):
+            name = unit[0]
+            res[f"Phi.{name}"], res[f"Delta_P_h.{name}"], res[f"Delta_P_c.{name}"] = Phi[u], Delta_P_h[u], Delta_P_c[u]
+            res[f"flag.{name}"] = flag[u]
+        res["Phi"] = Phi.sum(axis=0)
+        return {k: np.reshape(v, shape) for k, v in res.items()}
+
+
+def Network_cal(cd, path, **options):
+    """按网络文件中的来源流量与温度计算换热器网络
+
+    :cd: 基准配置字典
+    :path: 网络文件路径 (TOML)，格式见 EXAMPLE_NETWORK
+    :options: 见 Heat_exchanger_network.rate
+    :returns: 列名到标量的字典
+
+    """
+    return {k: np.asarray(v).item() for k, v in Heat_exchanger_network.load(path, cd).rate(**options).items()}
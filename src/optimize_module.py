@@ -0,0 +1,263 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 14:42:09 +0800
+LastEditTime : 2026-10-18 14:42:09 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/optimize_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 几何优化: 在板有效宽度、波纹深度、板厚、波纹角与板片数上做差分进化 (DE/rand/1/bin) 搜索,
+# 以板片质量 (材料成本)、换热面积或两侧压降之和为目标, 换热量不低于设计值为约束。
+# 每代整个种群按波纹角分组做向量化校核计算, 种群可分块交给进程池
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_module import Rating_batch_cal, config_to_batch, take_rows
+from .property_module import property_tables
+from .thermal_module import D_h_class
+
+logger = logging.getLogger(__name__)
+
+# 优化变量: 名称 -> (配置键, 默认下限, 默认上限)
+OPT_VARIABLES = {
+    "L_w": ("SP.Effective_width", 0.05, 0.5),
+    "d_corrugate": ("SP.Ripple_depth", 0.001, 0.01),
+    "sigma": ("SP.Plate_thickness", 0.0003, 0.001),
+    "n_plates": ("plates", 3, 200),
+}
+
+# 波纹角可选值 (Okada 公式), 可用 ang_corrugated=45,60 限定
+ANGLES = (30, 45, 60, 75)
+
+# 优化目标: 板片质量 kg (材料成本)、换热面积 m^2、两侧压降之和 Pa
+OPT_OBJECTIVES = ("mass", "area", "pressure")
+
+
+def parse_bound_spec(spec):
+    """解析单个优化变量范围
+
+    支持的写法:
+        SP.Effective_width=0.1:0.3     连续变量上下限
+        plates=10:60                   板片数上下限
+        ang_corrugated=45,60           波纹角可选值
+
+    :spec: 范围字符串
+    :returns: (变量名, (下限, 上限)) 或 ("ang", 可选值元组)
+
+    """
+    key, sep, values = spec.partition("=")
+    key = key.strip()
+    try:
+        if key == "ang_corrugated" and sep:
+            choices = tuple(float(v) for v in values.split(","))
+            if not set(choices) <= set(ANGLES):
+                raise ValueError
+            return "ang", choices
+        name = {cfg: name for name, (cfg, _, _) in OPT_VARIABLES.items()}[key]
+        lo, hi = (float(v) for v in values.split(":"))
+        if not 0 < lo <= hi:
+            raise ValueError
+    except (KeyError, ValueError):
+        keys = ", ".join([cfg for cfg, _, _ in OPT_VARIABLES.values()] + ["ang_corrugated"])
+        raise ValueError(f"无法识别的优化变量范围: {spec}，可选键: {keys}，波纹角可选 {ANGLES}")
+    return name, (lo, hi)
+
+
+def evaluate_geometry(bi, geometry, rho_s, L=0.25, tables=None):
+    """批量计算一组几何方案的换热量、压降与板片用量
+
+    板片换热面积取 板有效宽度 × 流动长度, 换热面积为 (板片数 - 2) × 板片面积 (端板不换热);
+    水力直径按波纹通道计算, 使压降随几何变化
+
+    :bi: 批量输入字典 (工况与物性)，几何相关输入被 geometry 覆盖
+    :geometry: L_w、d_corrugate、sigma、n_plates、ang 到等长数组的字典
+    :rho_s: 板片材料密度 kg/m^3
+    :L: 流动长度 m
+    :tables: property_module.property_tables 的返回值
+    :returns: Phi、Delta_P_h、Delta_P_c、flag、area、mass 到数组的字典
+
+    """
+    n = len(geometry["ang"])
+    bi = {k: np.broadcast_to(v, (n,)) for k, v in bi.items()}
+    bi.update(L_w=geometry["L_w"], d_corrugate=geometry["d_corrugate"], sigma=geometry["sigma"])
+    bi["D_h"] = D_h_class().Corrugate_cal(geometry["L_w"], geometry["d_corrugate"])
+    plate_area = geometry["L_w"] * L
+    bi["A"] = (geometry["n_plates"] - 2) * plate_area
+
+    out = {name: np.full(n, np.nan) for name in ("Phi", "Delta_P_h", "Delta_P_c")}
+    out["flag"] = np.zeros(n, dtype=np.int64)
+    # 种群每代都不同, 不写入结果缓存
+    rating = Rating_batch_cal.__wrapped__
+    for ang in np.unique(geometry["ang"]):
+        idx = np.flatnonzero(geometry["ang"] == ang)
+        res = rating(take_rows(bi, idx), float(ang), L, tables)
+        for name in out:
+            out[name][idx] = res[name]
+    out["area"] = bi["A"]
+    out["mass"] = geometry["n_plates"] * plate_area * geometry["sigma"] * rho_s
+    return out
+
+
+def _decode(x, bounds, angles):
+    """将单位超立方体中的个体解码为几何方案, 板片数取整, 波纹角取可选值"""
+    geometry = {}
+    for j, (name, (lo, hi)) in enumerate(bounds.items()):
+        geometry[name] = lo + x[:, j] * (hi - lo)
+    geometry["n_plates"] = np.round(geometry["n_plates"]).astype(np.int64)
+    k = np.minimum((x[:, -1] * len(angles)).astype(int), len(angles) - 1)
+    geometry["ang"] = np.asarray(angles, dtype=float)[k]
+    return geometry
+
+
+def _score(res, objective, duty, max_dp=None):
+    """目标值与约束违反量 (各约束相对超出量之和)
+
+    超出经验公式适用范围 (flag 非零) 的方案违反量加 1, 不会被判为可行; 换热量或压降计算无效 (NaN) 的方案
+    违反量为无穷大
+
+    """
+    obj = res["Delta_P_h"] + res["Delta_P_c"] if objective == "pressure" else res[objective]
+    violation = np.maximum(0.0, 1.0 - res["Phi"] / duty) + (res["flag"] != 0)
+    valid = np.isfinite(obj) & np.isfinite(res["Phi"])
+    for name in ("Delta_P_h", "Delta_P_c"):
+        if max_dp is not None:
+            violation += np.maximum(0.0, res[name] / max_dp - 1.0)
+        valid &= np.isfinite(res[name])
+    return obj, np.where(valid, violation, np.inf)
+
+
+def _evaluate_chunk(bi, x, bounds, angles, rho_s, L, tables):
+    """计算种群的一块, 供进程池调用"""
+    return evaluate_geometry(bi, _decode(x, bounds, angles), rho_s, L, tables)
+
+
+def _evaluate(pool, workers, bi, x, bounds, angles, rho_s, L, tables):
+    if pool is None:
+        return _evaluate_chunk(bi, x, bounds, angles, rho_s, L, tables)
+    parts = list(pool.map(_evaluate_chunk, *zip(*[(bi, part, bounds, angles, rho_s, L, tables)
+                                                  for part in np.array_split(x, workers)])))
+    return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+
+def optimize_geometry(cd, objective="mass", duty=None, max_dp=None, bounds=None, angles=ANGLES, population=None,
+                      generations=1000, F=(0.5, 1.0), CR=0.9, tol=1e-6, seed=0,
+                      workers=None, L=0.25):
+    """几何优化: 差分进化搜索满足换热量约束的最优几何
+
+    约束按可行性规则处理: 可行解优于不可行解, 不可行解之间比较约束违反量 (换热量不足、压降超限的相对量及超出经验公式适用范围),
+    可行解之间比较目标值; 变异系数每代在 F 范围内随机抖动。搜索期间不输出经验公式适用范围警告,
+    最优方案的越界情况见返回的 flag
+
+    :cd: 配置字典，工况与物性取配置值
+    :objective: 优化目标，见 OPT_OBJECTIVES
+    :duty: 换热量下限 W，None 表示取当前配置几何的换热量
+    :max_dp: 单侧压降上限 Pa，None 表示不限制
+    :bounds: 变量名到 (下限, 上限) 的字典，缺省取 OPT_VARIABLES 中的默认范围
+    :angles: 波纹角可选值
+    :population: 种群规模，None 表示 15 × 变量数
+    :generations: 最大代数
+    :F: 变异系数抖动范围
+    :CR: 交叉概率
+    :tol: 种群全部可行且目标值标准差不大于 tol × |均值| 时停止
+    :seed: 随机数种子
+    :workers: 进程数, None 表示 CPU 核数, 1 表示在当前进程计算
+    :L: 流动长度 m
+    :returns: 字典: geometry 最优几何 (配置键到取值)、objective 目标值、feasible 是否满足约束、
+              Phi、Delta_P_h、Delta_P_c、area、mass、flag、duty、generations 代数、evaluations 计算次数、history 每代最优目标值
+
+    """
+    if objective not in OPT_OBJECTIVES:
+        raise ValueError(f"未知优化目标: {objective}，可选: {', '.join(OPT_OBJECTIVES)}")
+    bounds = {name: (lo, hi) for name, (_, lo, hi) in OPT_VARIABLES.items()} | dict(bounds or {})
+    angles = tuple(angles)
+    tables = property_tables(cd)
+    bi = config_to_batch(cd)
+    rho_s = cd["SPP"]["Density"]
+    if duty is None:
+        duty = float(Rating_batch_cal(bi, tables=tables)["Phi"])
+        logger.info(f"换热量约束取当前几何的换热量: {duty:.6g} W")
+
+    dim = len(bounds) + 1
+    n_pop = population or 15 * dim
+    workers = workers or os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        x = rng.random((n_pop, dim))
+        res = _evaluate(pool, workers, bi, x, bounds, angles, rho_s, L, tables)
+        obj, viol = _score(res, objective, duty, max_dp)
+        evaluations, history = n_pop, []
+        gen = 0
+        for gen in range(1, generations + 1):
+            # DE/rand/1: 每个个体取三个互不相同且不同于自身的个体
+            r = np.argsort(rng.random((n_pop, n_pop)) + np.eye(n_pop), axis=1)[:, :3]
+            mutant = x[r[:, 0]] + rng.uniform(*F) * (x[r[:, 1]] - x[r[:, 2]])
+            # 越界分量在父代与边界之间随机取值
+            low, high = mutant < 0, mutant > 1
+            mutant[low] = x[low] * rng.random(low.sum())
+            mutant[high] = x[high] + (1 - x[high]) * rng.random(high.sum())
+            cross = rng.random((n_pop, dim)) < CR
+            cross[np.arange(n_pop), rng.integers(dim, size=n_pop)] = True
+            trial = np.where(cross, mutant, x)
+
+            res_t = _evaluate(pool, workers, bi, trial, bounds, angles, rho_s, L, tables)
+            obj_t, viol_t = _score(res_t, objective, duty, max_dp)
+            evaluations += n_pop
+            better = (viol_t < viol) | ((viol_t == viol) & (obj_t <= obj))
+            x[better], obj[better], viol[better] = trial[better], obj_t[better], viol_t[better]
+            for name in res:
+                res[name][better] = res_t[name][better]
+
+            best = np.lexsort((obj, viol))[0]
+            history.append(obj[best] if viol[best] == 0 else np.nan)
+            if np.all(viol == 0) and np.std(obj) <= tol * abs(np.mean(obj)):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        logging.disable(previous)
+
+    best = np.lexsort((obj, viol))[0]
+    geometry = _decode(x[best:best + 1], bounds, angles)
+    result = {
+        "geometry": {**{OPT_VARIABLES[name][0]: geometry[name][0].item() for name in bounds},
+                     "ang_corrugated": float(geometry["ang"][0])},
+        "objective": float(obj[best]),
+        "feasible": bool(viol[best] == 0),
+        **{name: float(res[name][best]) for name in ("Phi", "Delta_P_h", "Delta_P_c", "area", "mass")},
+        "flag": int(res["flag"][best]),
+        "duty": duty,
+        "generations": gen,
+        "evaluations": evaluations,
+        "history": np.array(history),
+    }
+    logger.info(f"几何优化完成: {gen} 代, {evaluations} 次计算, {objective} = {result['objective']:.6g}")
+    if not result["feasible"]:
+        logger.warning("未找到满足换热量与压降约束的几何方案")
+    return result
@@ -0,0 +1,176 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 15:52:40 +0800
+LastEditTime : 2026-10-18 15:52:40 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/property_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from .dual_module import as_float
+from .io_module import read_csv
+
+logger = logging.getLogger(__name__)
+
+# 物性名称, 与配置文件 [FHSPPP]/[FCSPPP] 中的键一致
+PROPERTY_NAMES = ("Density", "Specific_heat_capacity", "Thermal_conductivity", "Dynamic_viscosity")
+
+# 两侧物性在批量输入中的名称
+SIDE_INPUTS = {
+    "h": dict(zip(PROPERTY_NAMES, ("rho_h", "cp_h", "k_fh", "mu_h"))),
+    "c": dict(zip(PROPERTY_NAMES, ("rho_c", "cp_c", "k_fc", "mu_c"))),
+}
+
+# 配置文件中两侧物性的 section
+SIDE_SECTIONS = {"h": "FHSPPP", "c": "FCSPPP"}
+
+# 常压下水的物性 来源于 《传热学》附录 饱和水的热物理性质
+WATER = {
+    "T": [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
+    "Density": [999.9, 999.7, 998.2, 995.7, 992.2, 988.1, 983.1, 977.8, 971.8, 965.3, 958.4],
+    "Specific_heat_capacity": [4212, 4191, 4183, 4174, 4174, 4174, 4179, 4187, 4195, 4208, 4220],
+    "Thermal_conductivity": [0.551, 0.574, 0.599, 0.618, 0.635, 0.648, 0.659, 0.668, 0.674, 0.680, 0.683],
+    "Dynamic_viscosity": [1.788e-3, 1.306e-3, 1.004e-3, 0.801e-3, 0.653e-3, 0.549e-3, 0.469e-3, 0.406e-3,
+                          0.355e-3, 0.315e-3, 0.282e-3],
+}
+
+BUILTIN_TABLES = {"water": WATER}
+
+
+def _spline_resample(x, y, grid):
+    """自然三次样条插值, 将表格数据重采样到均匀网格"""
+    n = len(x)
+    h = np.diff(x)
+    # 求解节点二阶导数 M 的三对角方程组, 两端 M=0
+    mat = np.zeros((n, n))
+    rhs = np.zeros(n)
+    mat[0, 0] = mat[-1, -1] = 1
+    for i in range(1, n - 1):
+        mat[i, i - 1:i + 2] = h[i - 1], 2 * (h[i - 1] + h[i]), h[i]
+        rhs[i] = 6 * ((y[i + 1] - y[i]) / h[i] - (y[i] - y[i - 1]) / h[i - 1])
+    M = np.linalg.solve(mat, rhs)
+
+    i = np.clip(np.searchsorted(x, grid) - 1, 0, n - 2)
+    a, b = x[i + 1] - grid, grid - x[i]
+    return (M[i] * a**3 + M[i + 1] * b**3) / (6 * h[i]) + (y[i] / h[i] - M[i] * h[i] / 6) * a \
+        + (y[i + 1] / h[i] - M[i + 1] * h[i] / 6) * b
+
+
+class Property_table(object):
+    """随温度变化的流体物性表
+
+    构造时以三次样条将表格数据重采样到均匀温度网格 (粘度在对数空间插值),
+    查询时直接由温度计算网格下标做线性插值, 每个点的计算量与表格大小无关
+    """
+
+    def __init__(self, T, props, n_grid=2048):
+        """
+        :T: 表格温度 摄氏度，递增
+        :props: 物性名称到表格数值的字典，名称见 PROPERTY_NAMES
+        :n_grid: 均匀网格点数
+        """
+        T = np.asarray(T, dtype=float)
+        self.T_min, self.T_max = T[0], T[-1]
+        self.dT = (self.T_max - self.T_min) / (n_grid - 1)
+        grid = np.linspace(self.T_min, self.T_max, n_grid)
+        self.values = {}
+        for name, y in props.items():
+            y = np.asarray(y, dtype=float)
+            if name == "Dynamic_viscosity":
+                self.values[name] = np.exp(_spline_resample(T, np.log(y), grid))
+            else:
+                self.values[name] = _spline_resample(T, y, grid)
+        self.slopes = {name: np.diff(v) for name, v in self.values.items()}
+
+    def query(self, T):
+        """查询给定温度下的物性, 超出表格范围时取端点值
+
+        :T: 温度 摄氏度，标量或数组
+        :returns: 物性名称到数组的字典
+
+        """
+        T = as_float(T)
+        n_out = np.count_nonzero((T < self.T_min) | (T > self.T_max))
+        if n_out:
+            logger.warning(f"有 {n_out} 个温度超出物性表范围 {self.T_min}~{self.T_max} °C, 取端点值")
+        # 非有限温度 (上游计算失败的行) 按第一个区间定位后置为 NaN, 不影响其余行
+        ok = np.isfinite(T)
+        u = np.clip((np.where(ok, T, self.T_min) - self.T_min) / self.dT, 0, len(self.values[PROPERTY_NAMES[0]]) - 1)
+        i = np.minimum(u.astype(np.int64), len(self.values[PROPERTY_NAMES[0]]) - 2)
+        frac = np.where(ok, u - i, np.nan)
+        return {name: v[i] + self.slopes[name][i] * frac for name, v in self.values.items()}
+
+
+@lru_cache(maxsize=None)
+def load_property_table(spec):
+    """加载物性表, 同一进程内只加载一次
+
+    :spec: 内置物性表名称 (见 BUILTIN_TABLES) 或 CSV 文件路径，
+           CSV 需包含 T 列及 PROPERTY_NAMES 中的物性列
+    :returns: Property_table 实例
+
+    """
+    data = BUILTIN_TABLES.get(spec)
+    if data is None:
+        data = read_csv(spec)
+    missing = [name for name in ("T",) + PROPERTY_NAMES if name not in data]
+    if missing:
+        raise ValueError(f"物性表 {spec} 缺少列: {', '.join(missing)}")
+    logger.info(f"物性表加载成功: {spec}")
+    return Property_table(data["T"], {name: data[name] for name in PROPERTY_NAMES})
+
+
+def property_tables(cd):
+    """获取配置中两侧流体的物性表
+
+    :cd: 配置字典，[FHSPPP]/[FCSPPP] 中的 Property_table 键指定物性表
+    :returns: 字典 {"h": Property_table 或 None, "c": Property_table 或 None}
+
+    """
+    return {side: load_property_table(cd[section]["Property_table"]) if "Property_table" in cd[section] else None
+            for side, section in SIDE_SECTIONS.items()}
+
+
+def update_properties(bi, tables, T_h, T_c, keep=()):
+    """按给定温度更新批量输入中的两侧流体物性
+
+    :bi: 批量输入字典
+    :tables: property_tables 的返回值
+    :T_h: 热侧物性温度
+    :T_c: 冷侧物性温度
+    :keep: 不更新的批量输入名称
+    :returns: 更新后的批量输入字典 (新字典)
+
+    """
+    bi = dict(bi)
+    for side, T in (("h", T_h), ("c", T_c)):
+        if tables[side] is None:
+            continue
+        for name, value in tables[side].query(T).items():
+            if SIDE_INPUTS[side][name] not in keep:
+                bi[SIDE_INPUTS[side][name]] = value
+    return bi
@@ -0,0 +1,127 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 16:15:00 +0800
+LastEditTime : 2026-10-18 16:15:00 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/sensitivity_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import numpy as np
+
+from .batch_module import (INPUT_KEYS, Hydraulic_batch_cal, Thermal_batch_cal, Thermal_iter_batch_cal,
+                           config_to_batch)
+from .dual_module import Dual, deriv, value
+from .property_module import property_tables, update_properties
+from .valid_module import NOT_CONVERGED
+
+# 可求导的输入: 除流动方式与流程数等离散输入外的全部输入
+SENSITIVITY_INPUTS = tuple(name for name in INPUT_KEYS if name not in ("FD", "N_pass"))
+
+# 求导的结果量
+SENSITIVITY_OUTPUTS = ("Phi", "t_hout", "t_cout", "Delta_P_h", "Delta_P_c")
+
+
+def _iter_dual(bi, tables, keep, ang_corrugated, tol, max_iter):
+    """物性随温度变化时的对偶数计算
+
+    先以普通数组求得收敛的出口温度, 再以对偶数在解附近继续做不动点迭代 (piggyback),
+    导数与数值以相同的收敛速度收敛, 导数变化小于 tol 时停止
+
+    :returns: Phi, t_hout, t_cout, flag, 平均温度物性下的批量输入字典, 是否收敛 (均为扁平数组)
+
+    """
+    plain = {k: value(v) for k, v in bi.items()}
+    _, t_hout, t_cout, _, _, converged = Thermal_iter_batch_cal(plain, tables, keep, ang_corrugated)
+    x = [t_hout, t_cout]
+    d_prev = None
+    for _ in range(max_iter):
+        sub = update_properties(bi, tables, (bi["t_hin"] + x[0]) / 2, (bi["t_cin"] + x[1]) / 2, keep)
+        _, t_hout, t_cout = Thermal_batch_cal(sub, ang_corrugated)
+        x = [t_hout, t_cout]
+        d = np.stack([deriv(t_hout), deriv(t_cout)])
+        if d_prev is not None and not np.nanmax(np.abs(d - d_prev), initial=0) > tol:
+            break
+        d_prev = d
+    else:
+        converged = np.zeros_like(converged)
+    bi = update_properties(bi, tables, (bi["t_hin"] + x[0]) / 2, (bi["t_cin"] + x[1]) / 2, keep)
+    Phi, t_hout, t_cout, flag = Thermal_batch_cal(bi, ang_corrugated, return_flag=True)
+    return Phi, t_hout, t_cout, flag, bi, converged
+
+
+def Rating_sensitivity_batch_cal(bi, names=SENSITIVITY_INPUTS, ang_corrugated=60, L=0.25, tables=None, keep=(),
+                                 tol=1e-9, max_iter=50):
+    """批量校核计算, 同时给出结果对各输入的导数
+
+    以前向模式对偶数一次计算所有方向, 经验公式、epsilon_cal 与物性表插值均直接流经对偶数,
+    不需要对每个输入额外做差分计算
+
+    :bi: 批量输入字典，见 INPUT_KEYS
+    :names: 求导的输入名称，默认 SENSITIVITY_INPUTS
+    :ang_corrugated: 波纹角 °
+    :L: 流动长度 m
+    :tables: property_module.property_tables 的返回值
+    :keep: 不随温度更新的物性输入名称
+    :tol: 物性随温度变化时导数迭代的收敛判据
+    :max_iter: 物性随温度变化时导数迭代的最大次数
+    :returns: 结果字典: Rating_batch_cal 的各结果，以及 "jacobian":
+              {结果名称: {输入名称: 导数数组}}，结果名称见 SENSITIVITY_OUTPUTS
+
+    """
+    shape = np.shape(bi["t_hin"])
+    flat = {k: np.reshape(v, -1) for k, v in bi.items()}
+    bi = dict(flat)
+    bi.update(zip(names, Dual.seed([flat[name] for name in names])))
+
+    if tables and any(tables.values()):
+        Phi, t_hout, t_cout, flag_t, bi, converged = _iter_dual(bi, tables, keep, ang_corrugated, tol, max_iter)
+        flag_t = flag_t | np.where(converged, 0, NOT_CONVERGED)
+    else:
+        Phi, t_hout, t_cout, flag_t = Thermal_batch_cal(bi, ang_corrugated, return_flag=True)
+    Delta_P_h, Delta_P_c, flag_h = Hydraulic_batch_cal(bi, L, return_flag=True)
+
+    outputs = dict(zip(SENSITIVITY_OUTPUTS, (Phi, t_hout, t_cout, Delta_P_h, Delta_P_c)))
+    res = {name: np.reshape(value(v), shape) for name, v in outputs.items()}
+    res["flag"] = np.reshape(flag_t | flag_h, shape)
+    size = int(np.prod(shape))
+    res["jacobian"] = {}
+    for out, v in outputs.items():
+        d = deriv(v, len(names))
+        d = np.broadcast_to(d, (size, len(names)))
+        res["jacobian"][out] = {name: d[:, k].reshape(shape) for k, name in enumerate(names)}
+    return res
+
+
+def Rating_sensitivity_cal(cd):
+    """单工况校核计算及结果对各配置项的导数
+
+    :cd: 配置字典
+    :returns: 结果字典，数值为标量，jacobian 以配置键 (如 BC.Mass_flow_heat) 为输入名称
+
+    """
+    res = Rating_sensitivity_batch_cal(config_to_batch(cd), tables=property_tables(cd))
+    jac = {out: {"{}.{}".format(*INPUT_KEYS[name]): float(d) for name, d in row.items()}
+           for out, row in res.pop("jacobian").items()}
+    res = {k: np.asarray(v).item() for k, v in res.items()}
+    res["jacobian"] = jac
+    return res
@@ -0,0 +1,371 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 14:05:37 +0800
+LastEditTime : 2026-10-18 14:05:37 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/server_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 常驻计算服务: 本机 HTTP (TCP 端口或 Unix 套接字) 上的 JSON-RPC 2.0 接口。
+# 配置文件与物性表只在启动时读取一次; 同一时间窗内到达的校核与设计请求按输入列合并为一次向量化计算,
+# 大规模参数扫描交给进程池, 不阻塞事件循环
+
+import asyncio
+import json
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .batch_module import CONFIG_KEYS, Rating_batch_cal, config_to_batch
+from .property_module import property_tables
+from .sizing_module import TARGETS, plate_count, size_area
+from .sweep_module import parse_sweep_spec, run_sweep
+
+logger = logging.getLogger(__name__)
+
+# 服务提供的方法
+SERVER_METHODS = ("ping", "rating", "sizing", "sweep")
+
+# JSON-RPC 2.0 错误码
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# 超过该工况数的参数扫描交给进程池计算
+LARGE_SWEEP = 50000
+
+
+class Rpc_error(Exception):
+    """带 JSON-RPC 错误码的异常"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _to_json(value):
+    """将计算结果转换为可 JSON 序列化的对象, NaN 与无穷大转为 null"""
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return _to_json(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _inputs(params):
+    """解析请求中的输入覆盖值
+
+    :params: 请求参数，其中 inputs 为 "BC.Mass_flow_heat" 形式的配置键到标量或等长数组的字典
+    :returns: (批量输入名称到一维数组的字典, 行数, 是否为标量请求)
+
+    """
+    inputs = params.get("inputs", {})
+    if not isinstance(inputs, dict):
+        raise Rpc_error(INVALID_PARAMS, "inputs 应为配置键到数值的对象")
+    unknown = [key for key in inputs if key not in CONFIG_KEYS]
+    if unknown:
+        raise Rpc_error(INVALID_PARAMS, f"未知配置键: {', '.join(unknown)}")
+    try:
+        columns = {CONFIG_KEYS[key]: np.asarray(v, dtype=float) for key, v in inputs.items()}
+        shape = np.broadcast_shapes(*(v.shape for v in columns.values()))
+    except (TypeError, ValueError) as e:
+        raise Rpc_error(INVALID_PARAMS, f"inputs 取值无效: {e}")
+    if len(shape) > 1:
+        raise Rpc_error(INVALID_PARAMS, "inputs 取值应为标量或一维数组")
+    n = shape[0] if shape else 1
+    return {k: np.broadcast_to(v, (n,)) for k, v in columns.items()}, n, not shape
+
+
+class Micro_batcher:
+    """微批处理: 同一分组键的请求在时间窗内累积, 到期或行数达到上限时合并为一次计算
+
+    :compute: 函数 (分组键, [请求数据, ...]) -> [结果, ...]，结果与请求一一对应
+    :window: 累积时间窗 s
+    :max_rows: 单批最大行数
+    :executor: 执行合并计算的线程池或进程池, None 表示事件循环的默认线程池
+
+    """
+
+    def __init__(self, compute, window=0.002, max_rows=65536, executor=None):
+        self.compute = compute
+        self.window = window
+        self.max_rows = max_rows
+        self.executor = executor
+        self.pending = {}
+        self.timers = {}
+        self.tasks = set()
+
+    async def submit(self, key, payload, rows=1):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.setdefault(key, [[], 0])
+        batch[0].append((payload, future))
+        batch[1] += rows
+        if batch[1] >= self.max_rows:
+            self.flush(key)
+        elif key not in self.timers:
+            self.timers[key] = loop.call_later(self.window, self.flush, key)
+        return await future
+
+    def flush(self, key):
+        """取出分组键下累积的请求, 交给执行器计算, 不在事件循环中做数值计算"""
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items, rows = self.pending.pop(key, ([], 0))
+        if not items:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(key, items, rows))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, key, items, rows):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.compute, key, [payload for payload, _ in items])
+        except Exception as e:
+            logger.exception(f"批量计算失败 ({len(items)} 个请求, {rows} 行)")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _split(columns, counts):
+    """按各请求行数拆分合并计算的结果列"""
+    offsets = np.cumsum([0] + counts)
+    return [{name: v[a:b] for name, v in columns.items()} for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def _concat(payloads, names):
+    """合并各请求的输入列"""
+    return {name: np.concatenate([p[name] for p in payloads]) for name in names}
+
+
+class Calculation_server:
+    """常驻计算服务
+
+    :cd: 配置字典，作为各请求未给出输入的默认值
+    :workers: 参数扫描进程池的进程数, None 表示 CPU 核数
+    :window: 微批处理时间窗 s
+
+    """
+
+    def __init__(self, cd, workers=None, window=0.002):
+        self.cd = cd
+        self.tables = property_tables(cd)
+        self.workers = workers
+        self.pool = None
+        # 合并计算在单独线程中串行执行, 事件循环只负责收发请求
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batcher = Micro_batcher(self._compute, window, executor=self.executor)
+        self.n_requests = 0
+        self.n_batches = 0
+
+    # ---------------------------------------------------------------- 批量计算
+
+    def _compute(self, key, payloads):
+        self.n_batches += 1
+        kind, names = key[0], key[-1]
+        counts = [p["rows"] for p in payloads]
+        columns = _concat([p["columns"] for p in payloads], names)
+        bi = {k: np.broadcast_to(v, (sum(counts),)) for k, v in config_to_batch(self.cd, **columns).items()}
+        if kind == "rating":
+            # 合并后的批次每次都不同, 不写入结果缓存
+            res = Rating_batch_cal.__wrapped__(bi, tables=self.tables, keep=columns)
+        else:
+            value = np.concatenate([p["value"] for p in payloads])
+            A, converged = size_area(bi, key[1], value)
+            res = {"A": A, "converged": converged}
+        logger.debug(f"合并计算 {kind}: {len(payloads)} 个请求, {sum(counts)} 行")
+        return _split(res, counts)
+
+    @staticmethod
+    def _unwrap(result, scalar):
+        return {k: v[0] if scalar else v for k, v in result.items()}
+
+    # ---------------------------------------------------------------- 方法
+
+    async def ping(self, params):
+        return {"requests": self.n_requests, "batches": self.n_batches}
+
+    async def rating(self, params):
+        columns, n, scalar = _inputs(params)
+        key = ("rating", tuple(sorted(columns)))
+        result = await self.batcher.submit(key, {"columns": columns, "rows": n}, n)
+        return self._unwrap(result, scalar)
+
+    async def sizing(self, params):
+        target = params.get("target", "Phi")
+        if target not in TARGETS:
+            raise Rpc_error(INVALID_PARAMS, f"未知设计目标: {target}，可选: {', '.join(TARGETS)}")
+        columns, n, scalar = _inputs(params)
+        try:
+            value = np.asarray(params["value"], dtype=float)
+        except (KeyError, TypeError, ValueError):
+            raise Rpc_error(INVALID_PARAMS, "value 应为数值或数值数组")
+        if value.ndim == 1 and scalar:
+            n, scalar = value.size, False
+            columns = {k: np.broadcast_to(v, (n,)) for k, v in columns.items()}
+        if value.ndim > 1 or value.size not in (1, n):
+            raise Rpc_error(INVALID_PARAMS, "value 应为数值或与 inputs 等长的数组")
+        value = np.broadcast_to(value, (n,))
+        key = ("sizing", target, tuple(sorted(columns)))
+        result = await self.batcher.submit(key, {"columns": columns, "value": value, "rows": n}, n)
+        if "plate_area" in params:
+            result["plates"] = plate_count(result["A"], float(params["plate_area"]))
+        return self._unwrap(result, scalar)
+
+    async def sweep(self, params):
+        specs = params.get("sweep")
+        if not specs or not isinstance(specs, list):
+            raise Rpc_error(INVALID_PARAMS, "sweep 应为 \"KEY=VALUES\" 形式的扫描参数列表")
+        try:
+            axes = dict(parse_sweep_spec(spec) for spec in specs)
+        except ValueError as e:
+            raise Rpc_error(INVALID_PARAMS, str(e))
+        chunk_size = int(params.get("chunk_size", 100000))
+        total = int(np.prod([len(v) for v in axes.values()]))
+        loop = asyncio.get_running_loop()
+        if total <= LARGE_SWEEP:
+            return await loop.run_in_executor(self.executor, run_sweep, self.cd, axes, 1, chunk_size)
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return await loop.run_in_executor(self.pool, run_sweep, self.cd, axes, 1, chunk_size)
+
+    # ---------------------------------------------------------------- JSON-RPC
+
+    async def dispatch(self, request):
+        """处理单个 JSON-RPC 请求对象, 通知 (无 id) 返回 None"""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "无效的 JSON-RPC 请求"}}
+        rid = request.get("id")
+        method = request["method"]
+        params = request.get("params", {})
+        self.n_requests += 1
+        try:
+            if method not in SERVER_METHODS:
+                raise Rpc_error(METHOD_NOT_FOUND, f"未知方法: {method}，可选: {', '.join(SERVER_METHODS)}")
+            if not isinstance(params, dict):
+                raise Rpc_error(INVALID_PARAMS, "params 应为对象")
+            response = {"jsonrpc": "2.0", "id": rid, "result": _to_json(await getattr(self, method)(params))}
+        except Rpc_error as e:
+            response = {"jsonrpc": "2.0", "id": rid, "error": {"code": e.code, "message": str(e)}}
+        except Exception as e:
+            logger.exception(f"请求 {method} 计算失败")
+            response = {"jsonrpc": "2.0", "id": rid, "error": {"code": SERVER_ERROR, "message": str(e)}}
+        return response if "id" in request else None
+
+    async def handle_body(self, body):
+        """处理 HTTP 请求体, 支持 JSON-RPC 批量请求 (数组), 批量中的请求并发处理并参与微批合并"""
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "JSON 解析失败"}}
+        if isinstance(request, list) and request:
+            responses = await asyncio.gather(*(self.dispatch(r) for r in request))
+            return [r for r in responses if r is not None] or None
+        return await self.dispatch(request)
+
+    async def handle_connection(self, reader, writer):
+        """HTTP/1.1 连接处理, 支持长连接; 只接受 POST"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, _, version = request_line.decode("latin-1").split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method != "POST":
+                    status, payload = "405 Method Not Allowed", b""
+                else:
+                    response = await self.handle_body(body)
+                    status = "200 OK" if response is not None else "204 No Content"
+                    payload = b"" if response is None else json.dumps(response, ensure_ascii=False).encode()
+                keep_alive = version.strip() == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address):
+        """在指定地址上运行服务直到被取消
+
+        :address: "HOST:PORT" 或 "unix:套接字路径"
+
+        """
+        if address.startswith("unix:"):
+            server = await asyncio.start_unix_server(self.handle_connection, address[5:])
+        else:
+            host, _, port = address.rpartition(":")
+            server = await asyncio.start_server(self.handle_connection, host or "127.0.0.1", int(port))
+        logger.info(f"计算服务已启动: {address}, 方法: {', '.join(SERVER_METHODS)}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+
+
+def run_server(cd, address="127.0.0.1:8765", workers=None, window=0.002):
+    """运行常驻计算服务, Ctrl+C 退出
+
+    :cd: 配置字典
+    :address: "HOST:PORT" 或 "unix:套接字路径"
+    :workers: 参数扫描进程池的进程数, None 表示 CPU 核数
+    :window: 微批处理时间窗 s
+
+    """
+    try:
+        asyncio.run(Calculation_server(cd, workers, window).serve(address))
+    except KeyboardInterrupt:
+        logger.info("计算服务已退出")
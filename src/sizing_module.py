@@ -0,0 +1,165 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 11:05:38 +0800
+LastEditTime : 2026-10-18 11:05:38 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/sizing_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+
+import numpy as np
+
+from .batch_module import Thermal_batch_cal, take_rows
+
+logger = logging.getLogger(__name__)
+
+# 设计目标名称
+TARGETS = ("Phi", "t_hout", "t_cout")
+
+
+def bracket_solve(func, lo, hi, f_lo, f_hi, xtol=1e-10, ftol=1e-9, max_iter=100):
+    """批量区间求根 (Illinois 修正试位法)
+
+    每行独立收敛, 已收敛的行不再参与计算
+
+    :func: 函数 (x, idx) -> f，idx 为参与计算的行号
+    :lo: 区间下限数组
+    :hi: 区间上限数组
+    :f_lo: 下限处函数值
+    :f_hi: 上限处函数值，与 f_lo 异号
+    :xtol: 区间宽度相对收敛判据
+    :ftol: 函数值相对收敛判据 (相对于 |f_lo| 与 |f_hi| 的较大者)
+    :max_iter: 最大迭代次数
+    :returns: (根, 是否收敛)
+
+    """
+    lo, hi = np.array(lo, dtype=float), np.array(hi, dtype=float)
+    f_lo, f_hi = np.array(f_lo, dtype=float), np.array(f_hi, dtype=float)
+    scale = np.maximum(np.abs(f_lo), np.abs(f_hi))
+    x = np.where(np.abs(f_lo) < np.abs(f_hi), lo, hi)
+    converged = np.zeros(lo.shape, dtype=bool)
+    side = np.zeros(lo.shape, dtype=np.int8)  # 上一次被替换的端点: -1 下限, 1 上限
+    active = np.flatnonzero(np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi)))
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+        xi = (a * fb - b * fa) / (fb - fa)
+        # 试位点落在区间外或区间过窄时退化为二分
+        bad = ~((xi > a) & (xi < b))
+        xi[bad] = 0.5 * (a[bad] + b[bad])
+        fi = func(xi, active)
+        x[active] = xi
+
+        left = np.sign(fi) == np.sign(fa)
+        # Illinois: 同一端点连续保留时将其函数值减半
+        fb_half = left & (side[active] == -1)
+        fa_half = ~left & (side[active] == 1)
+        lo[active] = np.where(left, xi, a)
+        f_lo[active] = np.where(left, fi, np.where(fa_half, fa / 2, fa))
+        hi[active] = np.where(left, b, xi)
+        f_hi[active] = np.where(left, np.where(fb_half, fb / 2, fb), fi)
+        side[active] = np.where(left, -1, 1)
+
+        done = (np.abs(fi) <= ftol * scale[active]) | (hi[active] - lo[active] <= xtol * np.abs(xi))
+        converged[active[done]] = True
+        active = active[~done]
+
+    return x, converged
+
+
+def target_Phi(bi, target, value):
+    """将设计目标转换为换热量目标
+
+    :bi: 批量输入字典
+    :target: 目标名称，见 TARGETS
+    :value: 目标值
+    :returns: 目标换热量 W
+
+    """
+    if target == "Phi":
+        return np.broadcast_to(np.asarray(value, dtype=float), bi["t_hin"].shape)
+    if target == "t_hout":
+        return bi["q_hm"] * bi["cp_h"] * (bi["t_hin"] - value)
+    if target == "t_cout":
+        return bi["q_cm"] * bi["cp_c"] * (value - bi["t_cin"])
+    raise ValueError(f"未知设计目标: {target}，可选: {', '.join(TARGETS)}")
+
+
+def size_area(bi, target, value, ang_corrugated=60, max_expand=60):
+    """求达到设计目标所需的换热面积 SP.Cross_sectional_area
+
+    换热量随面积单调增加, 先以配置面积为起点倍增确定区间, 再批量区间求根
+
+    :bi: 批量输入字典，其中 A 作为初始估计
+    :target: 目标名称，见 TARGETS
+    :value: 目标值，可为数组
+    :ang_corrugated: 波纹角 °
+    :max_expand: 区间倍增的最大次数
+    :returns: (所需面积 m^2, 是否收敛)，无法达到目标的行返回 NaN
+
+    """
+    shape = np.broadcast(bi["t_hin"], value).shape
+    bi = {k: np.broadcast_to(v, shape).ravel() for k, v in bi.items()}
+    Phi_target = target_Phi(bi, target, np.broadcast_to(value, shape).ravel())
+
+    def residual(A, idx):
+        sub = take_rows(bi, idx)
+        sub["A"] = A
+        return Thermal_batch_cal(sub, ang_corrugated)[0] - Phi_target[idx]
+
+    idx = np.arange(Phi_target.size)
+    lo = np.zeros(Phi_target.shape)
+    f_lo = -Phi_target.astype(float)
+    hi = bi["A"].astype(float).copy()
+    f_hi = residual(hi, idx)
+
+    # 上限处仍未达到目标的行继续倍增区间
+    todo = np.flatnonzero(f_hi < 0)
+    for _ in range(max_expand):
+        if todo.size == 0:
+            break
+        lo[todo], f_lo[todo] = hi[todo], f_hi[todo]
+        hi[todo] *= 2
+        f_hi[todo] = residual(hi[todo], todo)
+        todo = todo[f_hi[todo] < 0]
+    if todo.size:
+        logger.warning(f"有 {todo.size} 个工况在面积范围内无法达到设计目标")
+
+    A, converged = bracket_solve(residual, lo, hi, f_lo, f_hi)
+    A = np.where(converged, A, np.nan)
+    return A.reshape(shape), converged.reshape(shape)
+
+
+def plate_count(A, plate_area):
+    """由换热面积计算板片数, 两端端板不参与换热
+
+    :A: 换热面积 m^2
+    :plate_area: 单张板片换热面积 m^2
+    :returns: 板片总数, 无法计算时为 -1
+
+    """
+    n = np.ceil(np.asarray(A) / plate_area - 1e-9) + 2
+    return np.where(np.isfinite(n), n, -1).astype(np.int64)
@@ -0,0 +1,61 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 13:26:14 +0800
+LastEditTime : 2026-10-18 13:26:14 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/stream_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+
+from .batch_module import Rating_batch_cal, column_inputs, config_to_batch
+from .io_module import Chunk_writer, iter_chunks
+from .property_module import property_tables
+
+logger = logging.getLogger(__name__)
+
+
+def run_stream(cd, input_path, output_path, chunk_size=100000):
+    """流式批量校核: 分块读取工况文件, 逐块计算并写出结果
+
+    输入列名为 "BC.Mass_flow_heat" 形式的配置键或批量输入名称, 缺失的输入取配置值;
+    输出包含全部输入列以及 Phi、t_hout、t_cout、Delta_P_h、Delta_P_c、flag, 同名输入列被计算结果覆盖
+
+    :cd: 配置字典
+    :input_path: 输入文件路径 (CSV 或 Parquet)
+    :output_path: 输出文件路径 (CSV 或 Parquet)
+    :chunk_size: 每块行数
+    :returns: 计算的工况总数
+
+    """
+    total = 0
+    tables = property_tables(cd)
+    with Chunk_writer(output_path) as writer:
+        for columns in iter_chunks(input_path, chunk_size):
+            overrides = column_inputs(columns)
+            # 逐块流式计算, 不写入结果缓存
+            result = Rating_batch_cal.__wrapped__(config_to_batch(cd, **overrides), tables=tables, keep=overrides)
+            writer.write({**columns, **result})
+            total += len(result["flag"])
+            logger.info(f"已完成 {total} 个工况")
+    return total
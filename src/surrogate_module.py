@@ -0,0 +1,330 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 16:48:30 +0800
+LastEditTime : 2026-10-18 16:48:30 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/surrogate_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 代理响应面: 对固定几何, 在两侧流量与入口温度组成的四维张量网格上预先计算完整模型的
+# 换热量、出口温度与压降, 保存到磁盘后以多线性或三次 (4 点拉格朗日) 插值查询。
+# 网格按轴自适应加密: 每轮在各轴区间中点计算完整模型, 线性插值误差超过容差的区间对分,
+# 中点处的计算结果直接并入网格。建成后在随机抽取的网格单元中心校核, 记录各输出的最大误差。
+# 表格以 .npy 保存, 可内存映射只读打开, 多个进程共享同一份物理内存
+
+import json
+import logging
+import math
+from bisect import bisect_right
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from .batch_module import CONFIG_KEYS, INPUT_KEYS, Rating_batch_cal, config_to_batch
+from .cache_module import code_version
+from .property_module import property_tables
+
+logger = logging.getLogger(__name__)
+
+# 网格轴: 批量输入名称, 顺序即表格维度顺序
+SURROGATE_AXES = ("q_hm", "q_cm", "t_hin", "t_cin")
+
+# 表格中的输出量, 无效工况 (超出经验公式适用范围) 为 NaN
+SURROGATE_OUTPUTS = ("Phi", "t_hout", "t_cout", "Delta_P_h", "Delta_P_c")
+
+# 插值方法
+SURROGATE_METHODS = ("linear", "cubic")
+
+# 每块查询取出的模板节点总数 (行数 × 每行模板点数), 使模板值留在缓存内
+_QUERY_BLOCK = 2**16
+
+
+def default_ranges(cd):
+    """默认网格范围: 流量为配置值的 0.5~1.5 倍, 入口温度为配置值 ±10 °C"""
+    bi = config_to_batch(cd)
+    ranges = {}
+    for name in SURROGATE_AXES:
+        v = float(bi[name])
+        ranges[name] = (0.5 * v, 1.5 * v) if name.startswith("q_") else (v - 10, v + 10)
+    return ranges
+
+
+def parse_range_spec(spec):
+    """解析单个网格范围, 如 BC.Mass_flow_heat=0.05:0.3
+
+    :spec: 范围字符串，键为 SURROGATE_AXES 对应的配置键
+    :returns: (批量输入名称, (下限, 上限))
+
+    """
+    key, sep, values = spec.partition("=")
+    name = CONFIG_KEYS.get(key.strip())
+    try:
+        lo, hi = (float(v) for v in values.split(":"))
+        if name not in SURROGATE_AXES or not lo < hi:
+            raise ValueError
+    except ValueError:
+        keys = ", ".join("{}.{}".format(*INPUT_KEYS[name]) for name in SURROGATE_AXES)
+        raise ValueError(f"无法识别的网格范围: {spec}，可选键: {keys}，格式为 KEY=下限:上限")
+    return name, (lo, hi)
+
+
+def _fixed_inputs(cd):
+    """表格对应的固定输入 (网格轴以外的全部输入)"""
+    bi = config_to_batch(cd)
+    return {name: float(v) for name, v in bi.items() if name not in SURROGATE_AXES}
+
+
+def _locate(axis, x):
+    """各查询点所在区间的左端点序号与区间内的相对位置, 越界点另行标记"""
+    i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, axis.size - 2)
+    w = (x - axis[i]) / (axis[i + 1] - axis[i])
+    return i, w, (x < axis[0]) | (x > axis[-1])
+
+
+def _stencil(axis, x, method):
+    """插值模板: 返回 (模板首节点序号, 权重 (n, 模板点数), 越界掩码), 模板节点为首节点起的连续节点"""
+    i, w, out = _locate(axis, x)
+    if method == "linear":
+        return i, np.stack([1 - w, w], axis=1), out
+    # 4 点拉格朗日插值, 靠近边界时模板整体内移
+    s = np.clip(i - 1, 0, axis.size - 4)
+    nodes = axis[s[:, None] + np.arange(4)]
+    weights = np.ones(nodes.shape)
+    for k, m in product(range(4), repeat=2):
+        if k != m:
+            weights[:, k] *= (x - nodes[:, m]) / (nodes[:, k] - nodes[:, m])
+    return s, weights, out
+
+
+class Surrogate_table(object):
+    """代理响应面表格
+
+    :axes: 各网格轴节点数组的列表，顺序同 SURROGATE_AXES
+    :values: 形状 (n_q_hm, n_q_cm, n_t_hin, n_t_cin, 输出数) 的数组，可为内存映射
+    :meta: 表格信息字典 (固定输入、误差、程序版本等)
+    """
+
+    def __init__(self, axes, values, meta):
+        self.axes = [np.asarray(a, dtype=float) for a in axes]
+        self.values = np.asarray(values)  # 内存映射按普通数组视图使用, 避免 memmap 子类的切片开销
+        self.meta = meta
+        self._lists = [a.tolist() for a in self.axes]
+
+    @property
+    def error(self):
+        """校核点上各输出的最大绝对误差与相对误差 (相对于该输出在表格中的取值范围)"""
+        return self.meta["error"]
+
+    # ---------------------------------------------------------------- 建表
+
+    @classmethod
+    def build(cls, cd, ranges=None, n0=5, tol=1e-3, max_points=2_000_000, n_check=100_000, seed=0):
+        """由完整模型建立表格
+
+        :cd: 配置字典，网格轴以外的输入 (几何、物性等) 取配置值
+        :ranges: 批量输入名称到 (下限, 上限) 的字典，缺省见 default_ranges
+        :n0: 各轴初始节点数 (不少于 4)
+        :tol: 加密判据，区间中点线性插值误差与该输出取值范围之比
+        :max_points: 网格总节点数上限，达到后停止加密
+        :n_check: 校核的网格单元数
+        :seed: 校核单元抽样的随机数种子
+        :returns: Surrogate_table
+
+        """
+        ranges = {**default_ranges(cd), **(ranges or {})}
+        tables = property_tables(cd)
+        fixed = _fixed_inputs(cd)
+
+        # 建表结果已保存为表格本身, 不写入结果缓存
+        def model(grid_axes):
+            grid = np.meshgrid(*grid_axes, indexing="ij")
+            overrides = {name: g.ravel() for name, g in zip(SURROGATE_AXES, grid)}
+            res = Rating_batch_cal.__wrapped__(config_to_batch(cd, **overrides), tables=tables, keep=overrides)
+            return np.stack([res[name].reshape(grid[0].shape) for name in SURROGATE_OUTPUTS], axis=-1)
+
+        axes = [np.linspace(*ranges[name], max(n0, 4)) for name in SURROGATE_AXES]
+        previous = logging.root.manager.disable
+        logging.disable(logging.WARNING)  # 建表时大量工况超出适用范围属正常情况, 不逐次告警
+        try:
+            values = model(axes)
+            scale = cls._scale(values)
+            for rounds in range(1, 64):
+                n_split = 0
+                for j in range(len(axes)):
+                    size = values.size // values.shape[j] * (values.shape[j] - 1)
+                    if values.size + size > max_points * len(SURROGATE_OUTPUTS):
+                        continue
+                    mids = (axes[j][:-1] + axes[j][1:]) / 2
+                    exact = model(axes[:j] + [mids] + axes[j + 1:])
+                    lo = np.take(values, range(axes[j].size - 1), axis=j)
+                    hi = np.take(values, range(1, axes[j].size), axis=j)
+                    err = np.abs(exact - (lo + hi) / 2) / scale
+                    err = np.where(np.isfinite(err), err, 0).max(axis=tuple(a for a in range(err.ndim) if a != j))
+                    split = np.flatnonzero(err > tol)
+                    if split.size == 0:
+                        continue
+                    n_split += split.size
+                    axes[j] = np.insert(axes[j], split + 1, mids[split])
+                    values = np.insert(values, split + 1, np.take(exact, split, axis=j), axis=j)
+                scale = cls._scale(values)
+                logger.info(f"第 {rounds} 轮加密: 对分 {n_split} 个区间, 网格 {'×'.join(str(a.size) for a in axes)}")
+                if n_split == 0:
+                    break
+        finally:
+            logging.disable(previous)
+
+        meta = {
+            "axes": list(SURROGATE_AXES),
+            "outputs": list(SURROGATE_OUTPUTS),
+            "fixed_inputs": fixed,
+            "property_tables": {side: cd[section].get("Property_table") for side, section in
+                                (("h", "FHSPPP"), ("c", "FCSPPP"))},
+            "tol": tol,
+            "code_version": code_version(),
+        }
+        table = cls(axes, values, meta)
+        table.meta["error"] = table._check(cd, tables, n_check, seed, scale)
+        return table
+
+    @staticmethod
+    def _scale(values):
+        """各输出的取值范围, 作为相对误差的分母"""
+        finite = np.where(np.isfinite(values), values, np.nan).reshape(-1, values.shape[-1])
+        with np.errstate(invalid="ignore"):
+            span = np.nanmax(finite, axis=0) - np.nanmin(finite, axis=0) if np.isfinite(finite).any() else 0
+        return np.where(np.isfinite(span) & (span > 0), span, 1.0)
+
+    def _check(self, cd, tables, n_check, seed, scale):
+        """在随机抽取的网格单元中心比较插值结果与完整模型, 返回各方法、各输出的最大误差"""
+        rng = np.random.default_rng(seed)
+        cells = [rng.integers(a.size - 1, size=n_check) for a in self.axes]
+        points = {name: (a[c] + a[c + 1]) / 2 for name, a, c in zip(SURROGATE_AXES, self.axes, cells)}
+        previous = logging.root.manager.disable
+        logging.disable(logging.WARNING)
+        try:
+            exact = Rating_batch_cal.__wrapped__(config_to_batch(cd, **points), tables=tables, keep=points)
+        finally:
+            logging.disable(previous)
+        error = {}
+        for method in SURROGATE_METHODS:
+            approx = self.query(**points, method=method)
+            error[method] = {}
+            for k, name in enumerate(SURROGATE_OUTPUTS):
+                diff = np.abs(approx[name] - exact[name])
+                diff = diff[np.isfinite(diff)]
+                max_abs = float(diff.max()) if diff.size else 0.0
+                error[method][name] = {"abs": max_abs, "rel": max_abs / float(scale[k])}
+        return error
+
+    # ---------------------------------------------------------------- 读写
+
+    def save(self, path):
+        """保存到目录: values.npy (可内存映射) 与 meta.json
+
+        :path: 目录路径，不存在时创建
+
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "values.npy", np.ascontiguousarray(self.values))
+        meta = {**self.meta, "grid": [a.tolist() for a in self.axes]}
+        (path / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path, cd=None, mmap=True):
+        """读取表格
+
+        :path: save 保存的目录
+        :cd: 配置字典，给出时检查表格的固定输入与配置一致，不一致时抛出 ValueError
+        :mmap: 为 True 时以只读内存映射方式打开 values.npy
+        :returns: Surrogate_table
+
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        values = np.load(path / "values.npy", mmap_mode="r" if mmap else None)
+        axes = meta.pop("grid")
+        if cd is not None:
+            fixed = _fixed_inputs(cd)
+            diff = [name for name, v in meta["fixed_inputs"].items() if not math.isclose(fixed[name], v, rel_tol=1e-12)]
+            if diff:
+                raise ValueError(f"代理表格 {path} 与当前配置的输入不一致: {', '.join(diff)}")
+        if meta.get("code_version") != code_version():
+            logger.warning(f"代理表格 {path} 由其他版本的计算程序生成")
+        return cls(axes, values, meta)
+
+    # ---------------------------------------------------------------- 查询
+
+    def query(self, q_hm, q_cm, t_hin, t_cin, method="linear"):
+        """插值查询, 输入可为标量或可广播的数组; 超出网格范围的点返回 NaN
+
+        :method: 插值方法，见 SURROGATE_METHODS
+        :returns: 输出名称到数组的字典，见 SURROGATE_OUTPUTS
+
+        """
+        if method not in SURROGATE_METHODS:
+            raise ValueError(f"未知插值方法: {method}，可选: {', '.join(SURROGATE_METHODS)}")
+        x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (q_hm, q_cm, t_hin, t_cin)))
+        shape = x[0].shape
+        x = [v.ravel() for v in x]
+        n = x[0].size
+        out = np.empty((n, len(SURROGATE_OUTPUTS)))
+        chunk = _QUERY_BLOCK // (2 if method == "linear" else 4)**len(SURROGATE_AXES)
+        for start in range(0, n, chunk):
+            rows = slice(start, min(start + chunk, n))
+            out[rows] = self._query_chunk([v[rows] for v in x], method)
+        return {name: out[:, k].reshape(shape)[()] for k, name in enumerate(SURROGATE_OUTPUTS)}
+
+    def _query_chunk(self, x, method):
+        stencils = [_stencil(axis, v, method) for axis, v in zip(self.axes, x)]
+        k = stencils[0][1].shape[1]
+        n = x[0].size
+        # 模板节点在展平表格中的行号 = 首节点行号 + 张量积偏移, 一次取出全部模板值后逐轴收缩
+        strides = np.cumprod([1] + [a.size for a in self.axes[:0:-1]])[::-1]
+        base = sum(start * stride for (start, _, _), stride in zip(stencils, strides))
+        offsets = sum(np.arange(k).reshape((k,) + (1,) * (3 - d)) * stride for d, stride in enumerate(strides)).ravel()
+        block = np.take(self.values.reshape(-1, self.values.shape[-1]), base[:, None] + offsets, axis=0)
+        for _, weights, _ in stencils:
+            block = (weights[:, None, :] @ block.reshape((n, k, -1)))[:, 0]
+        block[np.logical_or.reduce([out for _, _, out in stencils])] = np.nan
+        return block
+
+    def query_point(self, q_hm, q_cm, t_hin, t_cin):
+        """单点多线性插值查询, 标量输入标量输出, 供低延迟调用; 超出网格范围时返回 NaN
+
+        :returns: 输出名称到 float 的字典
+
+        """
+        lows = []
+        weights = []
+        for axis, grid, x in zip(self.axes, self._lists, (q_hm, q_cm, t_hin, t_cin)):
+            if not grid[0] <= x <= grid[-1]:
+                return dict.fromkeys(SURROGATE_OUTPUTS, math.nan)
+            i = min(bisect_right(grid, x) - 1, len(grid) - 2)
+            lows.append(i)
+            weights.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+        i0, i1, i2, i3 = lows
+        block = self.values[i0:i0 + 2, i1:i1 + 2, i2:i2 + 2, i3:i3 + 2].reshape(16, -1)
+        corner = [a * b * c * d for a, b, c, d in product(*((1 - w, w) for w in weights))]
+        return dict(zip(SURROGATE_OUTPUTS, (np.array(corner) @ block).tolist()))
@@ -0,0 +1,142 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 15:21:09 +0800
+LastEditTime : 2026-10-18 15:21:09 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/sweep_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_module import CONFIG_KEYS, Rating_batch_cal, config_to_batch
+from .io_module import Chunk_writer
+from .property_module import property_tables
+
+logger = logging.getLogger(__name__)
+
+
+def parse_sweep_spec(spec):
+    """解析单个扫描参数
+
+    支持的写法:
+        BC.Mass_flow_heat=0.1:0.5:9    起点:终点:点数, 等间距
+        SP.Flow_direction=1,2          逗号分隔的取值列表
+        SP.Ripple_depth=0.01           单个取值
+
+    :spec: 扫描参数字符串
+    :returns: (配置键, 取值数组)
+
+    """
+    key, sep, values = spec.partition("=")
+    key = key.strip()
+    if not sep or key not in CONFIG_KEYS:
+        raise ValueError(f"无法识别的扫描参数: {spec}，可选键: {', '.join(CONFIG_KEYS)}")
+    if ":" in values:
+        start, stop, num = values.split(":")
+        return key, np.linspace(float(start), float(stop), int(num))
+    return key, np.array([float(v) for v in values.split(",")])
+
+
+def _sweep_chunk(cd, axes, start, stop):
+    """计算扫描网格中 [start, stop) 范围内的工况, 供进程池调用"""
+    shape = tuple(len(v) for v in axes.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    columns = {key: values[i] for (key, values), i in zip(axes.items(), index)}
+
+    overrides = {CONFIG_KEYS[key]: v for key, v in columns.items()}
+    bi = config_to_batch(cd, **overrides)
+    # 大批量网格逐块计算, 不写入结果缓存
+    columns.update(Rating_batch_cal.__wrapped__(bi, tables=property_tables(cd), keep=overrides))
+    return columns
+
+
+def iter_sweep(cd, axes, workers=None, chunk_size=100000):
+    """参数扫描: 对各扫描参数取值的笛卡尔积分块批量计算, 按网格顺序逐块产生结果
+
+    网格按扁平索引分块, 每块在工作进程内独立生成并做向量化计算; 同时提交的块数不超过进程数的 2 倍,
+    调用方逐块处理 (如写入文件) 时内存占用与网格总量无关
+
+    :cd: 配置字典
+    :axes: 配置键到取值数组的有序字典
+    :workers: 进程数, None 表示 CPU 核数, 1 表示在当前进程计算
+    :chunk_size: 每块工况数
+    :returns: 生成器，每次产生一块的列名到数组的字典, 包含扫描参数列和 Phi、t_hout、t_cout、Delta_P_h、Delta_P_c、flag
+
+    """
+    total = int(np.prod([len(v) for v in axes.values()]))
+    bounds = [(i, min(i + chunk_size, total)) for i in range(0, total, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"参数扫描共 {total} 个工况, 分为 {len(bounds)} 块, {workers} 个进程")
+
+    if workers == 1 or len(bounds) == 1:
+        for start, stop in bounds:
+            yield _sweep_chunk(cd, axes, start, stop)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, stop in bounds:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_sweep_chunk, cd, axes, start, stop))
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_sweep(cd, axes, workers=None, chunk_size=100000):
+    """参数扫描, 全部结果合并保存在内存中; 大规模网格应使用 write_sweep 逐块写入文件
+
+    :cd: 配置字典
+    :axes: 配置键到取值数组的有序字典
+    :workers: 进程数, None 表示 CPU 核数, 1 表示在当前进程计算
+    :chunk_size: 每块工况数
+    :returns: 列名到数组的字典, 包含扫描参数列和 Phi、t_hout、t_cout、Delta_P_h、Delta_P_c、flag
+
+    """
+    parts = list(iter_sweep(cd, axes, workers, chunk_size))
+    return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+
+def write_sweep(cd, axes, output_path, workers=None, chunk_size=100000):
+    """参数扫描, 按网格顺序逐块写入 CSV 或 Parquet 文件, 内存占用与网格总量无关
+
+    :cd: 配置字典
+    :axes: 配置键到取值数组的有序字典
+    :output_path: 输出文件路径
+    :workers: 进程数, None 表示 CPU 核数, 1 表示在当前进程计算
+    :chunk_size: 每块工况数
+    :returns: (工况总数, 超出经验公式适用范围的工况数)
+
+    """
+    total = n_bad = 0
+    with Chunk_writer(output_path) as writer:
+        for columns in iter_sweep(cd, axes, workers, chunk_size):
+            writer.write(columns)
+            total += len(columns["flag"])
+            n_bad += int((columns["flag"] != 0).sum())
+    return total, n_bad
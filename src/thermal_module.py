@@ -0,0 +1,303 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 09:12:31 +0800
+LastEditTime : 2026-10-18 09:12:31 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/thermal_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import math
+
+import numpy as np
+
+from .dual_module import as_float
+
+
+def _ret(x):
+    """标量输入返回 float，数组输入原样返回"""
+    return x.item() if np.ndim(x) == 0 else x
+
+
+def Pr_cal(cp, k, mu):
+    """计算普朗特数
+
+    :cp: 比热 jk/kg·K
+    :k: 导热系数 W/(m·k)
+    :mu: 动力粘度
+
+    :returns: Pr 普朗特数
+
+    """
+    return cp * mu / k
+
+
+# 计算平壁换热系数
+def k_plane_cal(h_h, h_c, sigma, k_s):
+    """计算平壁的换热系数
+
+    :h_h: 热侧表面传热系数
+    :h_c: 冷侧表面传热系数
+    :sigma: 固体厚度
+    :k_s: 固体导热率 (W/(m·k))
+    :returns: k 返回平壁换热系数
+
+    """
+    k = 1 / (1 / h_h + sigma / k_s + 1 / h_c)
+    return k
+
+
+# 计算表面换热系数
+def h_cal(Nu, k_f, D_h):
+    """计算液体表面换热系数
+
+    :Nu: 努塞尔数 
+    :k_f: 液体导热率 (W/(m·k))
+    :D_h: 水力直径
+    :returns: h_cal 表面换热系数
+    """
+    return Nu * k_f / D_h
+
+
+class D_h_class(object):
+    """计算水力直径类"""
+
+    def __init__(self):
+        """无 """
+
+    def common_cal(self, A, U):
+        """水力直径通用计算方法
+
+        :A: 截面积 m^2
+        :U: 周长 m
+        :returns: D_h 水力直径 m
+
+        """
+        return 4 * A / U
+
+    def Corrugate_cal(self, L_w, d_corrugate):
+        """波纹板换水力直径计算
+        来源于 《热交换原理与设计》史美中 135 页
+        :L_w: 板有效宽度 m
+        :d_corrugate: 波纹深度 m
+        :returns: D_h 水力直径 m
+
+        """
+
+        return 4 * L_w * d_corrugate / (2 * (d_corrugate + L_w))
+
+
+def lmtd_cal(t_hin, t_hout, t_cin, t_cout):
+    DeltaT_in = np.subtract(t_hin, t_cin)
+    DeltaT_out = np.subtract(t_hout, t_cout)
+    DeltaT_max = np.maximum(DeltaT_in, DeltaT_out)
+    DeltaT_min = np.minimum(DeltaT_in, DeltaT_out)
+    DeltaT_m = (DeltaT_max - DeltaT_min) / np.log(DeltaT_max / DeltaT_min)
+    return _ret(DeltaT_m)
+
+
+# 判断获取最大和最小热容量: qc_max, qc_min
+def judge(q_hm, cp_h, q_cm, cp_c):
+    qc_h = np.multiply(q_hm, cp_h)
+    qc_c = np.multiply(q_cm, cp_c)
+    qc_max = np.maximum(qc_h, qc_c)
+    qc_min = np.minimum(qc_h, qc_c)
+    return _ret(qc_max), _ret(qc_min)
+
+
+# 计算 NTU
+def ntu_cal(k, A, qc_min):
+    res_ntu = k * A / qc_min
+    return res_ntu
+
+
+# 计算 R_c
+def R_c(qc_max, qc_min):
+    return qc_min / qc_max
+
+
+# 流动方式编号
+FLOW_DIRECTIONS = {
+    1: "顺流 parallel flow",
+    2: "逆流 counter flow",
+    3: "交叉流, 两侧均不混合 crossflow, both unmixed",
+    4: "交叉流, Cmax 侧混合 Cmin 侧不混合 crossflow, Cmax mixed",
+    5: "交叉流, Cmin 侧混合 Cmax 侧不混合 crossflow, Cmin mixed",
+    6: "1-2 壳管式, N 个壳程串联 1-2 shell-and-tube, N shells in series",
+    7: "N 流程板式, 各流程为顺流, 流程间总体逆流 N-pass plate, overall counter flow",
+}
+
+# R_c 与 0 或 1 的差小于该值时采用极限公式
+_R_EPS = 1e-9
+
+
+def _eps_parallel(ntu, R):
+    """顺流"""
+    return -np.expm1(-ntu * (1 + R)) / (1 + R)
+
+
+def _eps_counter(ntu, R):
+    """逆流, R_c = 1 时取极限 NTU / (1 + NTU)"""
+    e = np.expm1(-ntu * (1 - R))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps = -e / ((1 - R) - R * e)
+    # R_c = 1 附近取一阶展开, 使数值与对 R_c 的导数都连续
+    eps_R1 = ntu / (1 + ntu) + (1 - R) * ntu**2 / (2 * (1 + ntu)**2)
+    return np.where(np.abs(1 - R) < _R_EPS, eps_R1, eps)
+
+
+def _eps_cross_unmixed(ntu, R, tol=1e-10, max_terms=2000):
+    """交叉流两侧均不混合, 精确级数解 (Mason 1954) 截断求和
+
+    epsilon = 1/(R·NTU) Σ_n P(n+1, NTU) · P(n+1, R·NTU)
+    P(n+1, x) = 1 - e^-x Σ_{m<=n} x^m/m! 为正则化下不完全伽马函数, 且 Σ_n P(n+1, x) = x,
+    因此截断误差不超过 min(NTU - Σ P(k+1, NTU), R·NTU - Σ P(k+1, R·NTU)) / (R·NTU),
+    每行单独判断, 误差小于 tol 的行即退出求和
+    """
+    x, y = ntu, R * ntu
+    limit = (R < _R_EPS) | (ntu <= 0)
+    eps = np.where(limit, -np.expm1(-ntu), np.nan)
+    rows = np.flatnonzero(~limit & np.isfinite(y))
+    xa, ya = x[rows], y[rows]
+    log_x, log_y = np.log(xa), np.log(ya)
+    cdf_x, cdf_y = np.zeros_like(xa), np.zeros_like(ya)
+    total, rest_x, rest_y = np.zeros_like(xa), xa.copy(), ya.copy()
+    active = np.arange(rows.size)
+    for n in range(max_terms):
+        if active.size == 0:
+            break
+        # 泊松概率 e^-x x^n / n! 在对数空间计算, 避免大 NTU 时下溢
+        lg = math.lgamma(n + 1)
+        cdf_x[active] += np.exp(n * log_x[active] - xa[active] - lg)
+        cdf_y[active] += np.exp(n * log_y[active] - ya[active] - lg)
+        P_x = np.maximum(1 - cdf_x[active], 0)
+        P_y = np.maximum(1 - cdf_y[active], 0)
+        total[active] += P_x * P_y
+        rest_x[active] -= P_x
+        rest_y[active] -= P_y
+        done = np.minimum(rest_x[active], rest_y[active]) <= tol * ya[active]
+        active = active[~done]
+    eps[rows] = total / ya
+    return eps
+
+
+def _eps_cross_Cmax_mixed(ntu, R):
+    """交叉流, Cmax 侧混合, Cmin 侧不混合"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps = -np.expm1(R * np.expm1(-ntu)) / R
+    return np.where(R < _R_EPS, -np.expm1(-ntu), eps)
+
+
+def _eps_cross_Cmin_mixed(ntu, R):
+    """交叉流, Cmin 侧混合, Cmax 侧不混合"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = np.where(R < _R_EPS, ntu, -np.expm1(-R * ntu) / R)
+    return -np.expm1(-g)
+
+
+def _eps_shell_1_2(ntu, R):
+    """1-2 壳管式 (单壳程, 偶数管程)"""
+    s = np.sqrt(1 + R**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coth = (2 - (-np.expm1(-ntu * s))) / (-np.expm1(-ntu * s))  # (1 + e^-x)/(1 - e^-x)
+        return 2 / (1 + R + s * coth)
+
+
+def _eps_series(eps_p, R, N):
+    """N 个相同单元在总体逆流方向串联, eps_p 为单个单元的效能"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = ((1 - eps_p * R) / (1 - eps_p))**N
+        eps = (z - 1) / (z - R)
+    # R_c = 1 附近取一阶展开
+    eps_R1 = N * eps_p / (1 + (N - 1) * eps_p) + (1 - R) * N * (N - 1) * eps_p**2 / (2 * (1 + (N - 1) * eps_p)**2)
+    eps = np.where(np.abs(1 - R) < _R_EPS, eps_R1, eps)
+    # 单元效能为 1 时串联后效能也为 1
+    return np.where(eps_p >= 1, 1.0, eps)
+
+
+def _eps_shell_series(ntu, R, N):
+    """N 个 1-2 壳程串联, 每个壳程的 NTU 为总 NTU/N"""
+    return _eps_series(_eps_shell_1_2(ntu / N, R), R, N)
+
+
+def _eps_multipass_plate(ntu, R, N):
+    """N 流程板式, 每个流程按顺流计算, 流程间总体逆流串联"""
+    return _eps_series(_eps_parallel(ntu / N, R), R, N)
+
+
+_EPSILON_FUNCS = {
+    1: _eps_parallel,
+    2: _eps_counter,
+    3: _eps_cross_unmixed,
+    4: _eps_cross_Cmax_mixed,
+    5: _eps_cross_Cmin_mixed,
+    6: _eps_shell_series,
+    7: _eps_multipass_plate,
+}
+
+
+# 计算 epsilon
+def epsilon_cal(FD_num, phase_change, ntu, R_c, N_pass=1):
+    '''
+    名称 编号 英文名称, 见 FLOW_DIRECTIONS
+    顺流：1 parallel flow
+    逆流：2 counter flow
+    交叉流两侧均不混合：3
+    交叉流 Cmax 侧混合：4
+    交叉流 Cmin 侧混合：5
+    1-2 壳管式：6 (N_pass 为串联壳程数)
+    N 流程板式：7 (N_pass 为流程数)
+
+    FD_num、ntu、R_c、N_pass 均可为数组，按元素计算，每种流动方式只对对应的行计算；
+    R_c 为 0、1 等极限情况均采用数值稳定的写法；未知流动方式对应结果为 NaN
+    '''
+    FD_num, ntu, R_c, N_pass = np.broadcast_arrays(np.asarray(FD_num), as_float(ntu), as_float(R_c),
+                                                   np.asarray(N_pass, dtype=float))
+    shape = ntu.shape
+    FD_num, ntu, R_c, N_pass = (np.ravel(a) for a in (FD_num, ntu, R_c, N_pass))
+    if phase_change:
+        R_c = np.zeros_like(R_c)
+
+    res_epsilon = np.full_like(ntu, np.nan)
+    for code, func in _EPSILON_FUNCS.items():
+        rows = FD_num == code
+        if not rows.any():
+            continue
+        if code in (6, 7):
+            res_epsilon[rows] = func(ntu[rows], R_c[rows], N_pass[rows])
+        else:
+            res_epsilon[rows] = func(ntu[rows], R_c[rows])
+    return _ret(res_epsilon.reshape(shape))
+
+
+def Delta_P(f, L, D_h, rho, v):
+    """计算压降
+
+    :f: 摩擦因子，通过经验公式估算
+    :L: 流动长度，通常为板式换热器的通道长度 m
+    :D_h: 水力直径 m
+    :rho: 密度 kg/m^3
+    :v: 流速 m/s
+    :returns: 压降 Pa
+
+    """
+    return f * L / D_h * rho * v**2 / 2
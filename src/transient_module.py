@@ -0,0 +1,418 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 17:40:12 +0800
+LastEditTime : 2026-10-18 17:40:12 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/transient_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+# 瞬态计算: 沿流动方向将换热器分为 n_seg 个单元, 每个单元有热侧流体、板片、冷侧流体三个温度节点
+# (单元内流体充分混合的单元模型)。板片热容由 [SPP] 的密度与比热容给出, 流体热容按流道容积计入。
+# 各时刻的传热系数由当时的流量与物性按 Okada 公式计算, 在时间步内冻结, 温度按隐式欧拉法推进:
+# 隐式欧拉法 L 稳定, 流体滞留时间远小于时间步时也不会振荡, 不计流体热容时同样适用。
+# 每个时间步的方程组按单元扫描一次求解 (逆流为两侧对向的追赶法), 许多换热器同时向量化计算;
+# 开启 jit_module 加速时时间推进由编译后的并行循环完成。第一个时刻以稳态作为初始状态
+
+import logging
+
+import numpy as np
+
+from . import instrument_module as instrument
+from . import jit_module as jit
+from .batch_module import column_inputs, config_to_batch
+from .io_module import Chunk_writer, iter_chunks
+from .Nu_module import Nu_SP_class
+from .property_module import property_tables, update_properties
+from .Re_module import Re_class
+from .thermal_module import D_h_class, Pr_cal, h_cal
+from .valid_module import OPTION_OUT
+
+logger = logging.getLogger(__name__)
+
+# 板片热容输入名称与配置文件 [SPP] 键的对应关系
+WALL_KEYS = {
+    "rho_s": "Density",  # 板片密度 kg/m^3
+    "cp_s": "Specific_heat_capacity",  # 板片比热容
+}
+
+# 随时间变化的输入 (边界条件), 其余输入在整个过程中保持不变
+TRANSIENT_INPUTS = ("t_hin", "t_cin", "q_hm", "q_cm")
+
+# 逐时刻输出
+TRANSIENT_OUTPUTS = ("t_hout", "t_cout", "Phi", "Phi_c", "T_w", "flag")
+
+# 单元模型支持的流动方式: 顺流 1、逆流 2
+TRANSIENT_DIRECTIONS = (1, 2)
+
+# 单侧单元 NTU 上限, 见 _plug_flow
+_NTU_CELL_MAX = 30
+
+
+def transient_to_batch(cd, **overrides):
+    """由配置字典生成瞬态计算的批量输入
+
+    :cd: 配置字典
+    :overrides: 以 INPUT_KEYS 或 WALL_KEYS 中的名称覆盖配置值，可为标量或数组
+    :returns: 批量输入字典，包含 INPUT_KEYS 与 WALL_KEYS 中的全部名称，所有数组已广播为相同形状
+
+    """
+    wall = {name: cd["SPP"][key] for name, key in WALL_KEYS.items()}
+    wall.update({k: v for k, v in overrides.items() if k in WALL_KEYS})
+    bi = config_to_batch(cd, **{k: v for k, v in overrides.items() if k not in WALL_KEYS})
+    arrays = np.broadcast_arrays(*bi.values(), *[np.asarray(v, dtype=float) for v in wall.values()])
+    return dict(zip(list(bi) + list(wall), arrays))
+
+
+def _plug_flow(U, G):
+    """单元内流体与板片间的等效传热能力
+
+    单元内流体取出口温度, 将传热能力 U 换为 G·(exp(U/G) - 1), 使板片温度均匀时单元换热量与活塞流的
+    精确解 G·(1 - exp(-U/G))·(入口温度 - 板片温度) 一致; 单元 NTU 超过 _NTU_CELL_MAX 时流体出口已与板片
+    同温, 按该值截断以免溢出; 流量为零时取 U
+
+    """
+    return np.where(G > 0, G * np.expm1(np.minimum(U / G, _NTU_CELL_MAX)), U)
+
+
+def _coefficients(bi, series, n_seg, ang_corrugated, tables, keep, holdup):
+    """各时刻、各换热器的单元系数
+
+    板片导热热阻两侧各取一半, 两侧串联后与稳态模型的平壁传热系数一致
+
+    :bi: 批量输入字典, 各数组形状 (m,)
+    :series: TRANSIENT_INPUTS 中的名称到形状 (n_t, m) 数组的字典
+    :returns: 形状 (n_t, m) 的数组字典: G_h、G_c 两侧热容量流率 W/K, U_h、U_c 单元内流体与板片间的
+              传热能力 W/K, C_h、C_c、C_w 单元内两侧流体与板片的热容 J/K, 以及越界原因编码 flag
+
+    """
+    shape = np.shape(series["t_hin"])
+    rows = {k: np.broadcast_to(v, shape) for k, v in bi.items()}
+    rows.update(series)
+    if tables:
+        rows = update_properties(rows, tables, rows["t_hin"], rows["t_cin"], keep)
+
+    Re = Re_class()
+    Re_h = Re.common_cal(rows["q_hm"], rows["A"], rows["mu_h"], rows["rho_h"])
+    Re_c = Re.common_cal(rows["q_cm"], rows["A"], rows["mu_c"], rows["rho_c"])
+    Pr_h = Pr_cal(rows["cp_h"], rows["k_fh"], rows["mu_h"])
+    Pr_c = Pr_cal(rows["cp_c"], rows["k_fc"], rows["mu_c"])
+    Nu_SP = Nu_SP_class()
+    Nu_h, flag_h = Nu_SP.Okada_cal(Re_h, Pr_h, ang_corrugated, return_flag=True)
+    Nu_c, flag_c = Nu_SP.Okada_cal(Re_c, Pr_c, ang_corrugated, return_flag=True)
+
+    D_h = D_h_class().Corrugate_cal(rows["L_w"], rows["d_corrugate"])
+    A = rows["A"] / n_seg
+    half = rows["sigma"] / (2 * rows["k_s"])
+    G_h = rows["q_hm"] * rows["cp_h"]
+    G_c = rows["q_cm"] * rows["cp_c"]
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        U_h = _plug_flow(A / (1 / h_cal(Nu_h, rows["k_fh"], D_h) + half), G_h)
+        U_c = _plug_flow(A / (1 / h_cal(Nu_c, rows["k_fc"], D_h) + half), G_c)
+    # 每侧流道容积取换热面积 × 波纹深度 / 2 (相邻两板之间为一个流道, 两侧交替)
+    volume = A * rows["d_corrugate"] / 2 if holdup else 0
+    supported = np.isin(rows["FD"], TRANSIENT_DIRECTIONS)
+    return {"G_h": G_h, "G_c": G_c, "U_h": U_h, "U_c": U_c,
+            "C_h": rows["rho_h"] * rows["cp_h"] * volume, "C_c": rows["rho_c"] * rows["cp_c"] * volume,
+            "C_w": rows["rho_s"] * rows["cp_s"] * A * rows["sigma"],
+            "flag": flag_h | flag_c | np.where(supported, 0, OPTION_OUT)}
+
+
+def _cell_matrix(k, dt, G_h, G_c, U_h, U_c, C_h, C_c, C_w):
+    """第 k 步消去板片温度后的单元方程系数
+
+    单元 j 的隐式欧拉方程消去板片温度后为
+        P·h_j - Q·c_j = g_h·h_j' + s_h·w_j' + G_h·h_(j-1)
+        -Q·h_j + R·c_j = g_c·c_j' + s_c·w_j' + G_c·c_上游
+    带 ' 的为上一步温度, 板片温度 w_j = (g_w·w_j' + U_h·h_j + U_c·c_j) / D_w
+
+    :returns: g_h, g_c, g_w, D_w, P, Q, R, s_h, s_c
+
+    """
+    U_h, U_c = U_h[k], U_c[k]
+    g_h, g_c, g_w = C_h[k] / dt[k], C_c[k] / dt[k], C_w[k] / dt[k]
+    D_w = g_w + U_h + U_c
+    P = g_h + G_h[k] + U_h * (g_w + U_c) / D_w
+    R = g_c + G_c[k] + U_c * (g_w + U_h) / D_w
+    return g_h, g_c, g_w, D_w, P, U_h * U_c / D_w, R, U_h * g_w / D_w, U_c * g_w / D_w
+
+
+def _replay_numpy(counter, t_hin, t_cin, G_h, G_c, U_h, U_c, C_h, C_c, C_w, dt, h, w, c, t_hout, t_cout, T_w):
+    """时间推进, 换热器维度向量化, 同一批换热器的流动方式相同
+
+    :counter: 是否逆流
+    :t_hin ~ C_w: 形状 (n_t, m) 的入口温度与单元系数
+    :dt: 各步时间步长 s, 形状 (n_t,)，inf 表示求稳态
+    :h, w, c: 两侧流体与板片的单元温度, 形状 (n_seg, m)，原位更新
+    :t_hout, t_cout, T_w: 形状 (n_t, m) 的输出数组
+
+    """
+    n_seg = h.shape[0]
+    for k in range(dt.size):
+        g_h, g_c, g_w, D_w, P, Q, R, s_h, s_c = _cell_matrix(k, dt, G_h, G_c, U_h, U_c, C_h, C_c, C_w)
+        if counter:
+            # 追赶法: 正向扫描得到 h_j = a_j + b_j·c_(j+1), c_j = e_j + f_j·c_(j+1), 再从冷侧入口回代
+            a, b = t_hin[k], 0
+            coef = []
+            for j in range(n_seg):
+                s = g_h * h[j] + s_h * w[j] + G_h[k] * a
+                t = Q + G_h[k] * b
+                den = R - Q * t / P
+                e = (g_c * c[j] + s_c * w[j] + Q * s / P) / den
+                f = G_c[k] / den
+                a, b = (s + t * e) / P, t * f / P
+                coef.append((a, b, e, f))
+            c_next = t_cin[k]
+            for j in range(n_seg - 1, -1, -1):
+                a, b, e, f = coef[j]
+                h[j], c[j] = a + b * c_next, e + f * c_next
+                w[j] = (g_w * w[j] + U_h[k] * h[j] + U_c[k] * c[j]) / D_w
+                c_next = c[j]
+            t_cout[k] = c[0]
+        else:
+            det = P * R - Q**2
+            h_prev, c_prev = t_hin[k], t_cin[k]
+            for j in range(n_seg):
+                b_h = g_h * h[j] + s_h * w[j] + G_h[k] * h_prev
+                b_c = g_c * c[j] + s_c * w[j] + G_c[k] * c_prev
+                h[j], c[j] = (R * b_h + Q * b_c) / det, (Q * b_h + P * b_c) / det
+                w[j] = (g_w * w[j] + U_h[k] * h[j] + U_c[k] * c[j]) / D_w
+                h_prev, c_prev = h[j], c[j]
+            t_cout[k] = c[-1]
+        t_hout[k] = h[-1]
+        T_w[k] = w.mean(axis=0)
+
+
+@jit._jit(parallel=True)
+def _replay_kernel(counter, t_hin, t_cin, G_h, G_c, U_h, U_c, C_h, C_c, C_w, dt, h, w, c, t_hout, t_cout, T_w):
+    """时间推进的编译核, 各换热器并行, 逐换热器推进全部时刻; 数组均为换热器在前的布局 (m, n_t)/(m, n_seg),
+    算法同 _replay_numpy"""
+    m, n_t = t_hin.shape
+    n_seg = h.shape[1]
+    for i in jit.prange(m):
+        ca = np.empty(n_seg)
+        cb = np.empty(n_seg)
+        ce = np.empty(n_seg)
+        cf = np.empty(n_seg)
+        for k in range(n_t):
+            Uh, Uc, Gh, Gc = U_h[i, k], U_c[i, k], G_h[i, k], G_c[i, k]
+            g_h, g_c, g_w = C_h[i, k] / dt[k], C_c[i, k] / dt[k], C_w[i, k] / dt[k]
+            D_w = g_w + Uh + Uc
+            P = g_h + Gh + Uh * (g_w + Uc) / D_w
+            R = g_c + Gc + Uc * (g_w + Uh) / D_w
+            Q = Uh * Uc / D_w
+            s_h, s_c = Uh * g_w / D_w, Uc * g_w / D_w
+            if counter[i]:
+                a, b = t_hin[i, k], 0.0
+                for j in range(n_seg):
+                    s = g_h * h[i, j] + s_h * w[i, j] + Gh * a
+                    t = Q + Gh * b
+                    den = R - Q * t / P
+                    ce[j] = (g_c * c[i, j] + s_c * w[i, j] + Q * s / P) / den
+                    cf[j] = Gc / den
+                    a, b = (s + t * ce[j]) / P, t * cf[j] / P
+                    ca[j], cb[j] = a, b
+                c_next = t_cin[i, k]
+                for j in range(n_seg - 1, -1, -1):
+                    h[i, j] = ca[j] + cb[j] * c_next
+                    c[i, j] = ce[j] + cf[j] * c_next
+                    w[i, j] = (g_w * w[i, j] + Uh * h[i, j] + Uc * c[i, j]) / D_w
+                    c_next = c[i, j]
+                t_cout[i, k] = c[i, 0]
+            else:
+                det = P * R - Q * Q
+                h_prev, c_prev = t_hin[i, k], t_cin[i, k]
+                for j in range(n_seg):
+                    b_h = g_h * h[i, j] + s_h * w[i, j] + Gh * h_prev
+                    b_c = g_c * c[i, j] + s_c * w[i, j] + Gc * c_prev
+                    h[i, j] = (R * b_h + Q * b_c) / det
+                    c[i, j] = (Q * b_h + P * b_c) / det
+                    w[i, j] = (g_w * w[i, j] + Uh * h[i, j] + Uc * c[i, j]) / D_w
+                    h_prev, c_prev = h[i, j], c[i, j]
+                t_cout[i, k] = c[i, n_seg - 1]
+            t_hout[i, k] = h[i, n_seg - 1]
+            total = 0.0
+            for j in range(n_seg):
+                total += w[i, j]
+            T_w[i, k] = total / n_seg
+
+
+def Transient_batch_cal(bi, series, dt, state=None, n_seg=20, ang_corrugated=60, tables=None, keep=(),
+                        holdup=True):
+    """多台换热器的瞬态计算, 对一段时间序列推进单元温度
+
+    长时间序列可分段调用, 将上一段返回的状态传入下一段, 结果与整体计算一致。
+    只支持顺流和逆流, 其余流动方式结果为 NaN 并标记 OPTION_OUT
+
+    :bi: 批量输入字典 (见 transient_to_batch)，各数组形状 (m,)，m 为换热器数
+    :series: TRANSIENT_INPUTS 中的名称到形状 (n_t, m) 数组的字典，缺失的输入在整个过程中取 bi 中的值
+    :dt: 各时刻与上一时刻的间隔 s，形状 (n_t,)；首个时刻为 inf 时以该时刻的稳态作为初始状态
+    :state: 上一段返回的单元温度，为 None 时 dt[0] 必须为 inf
+    :n_seg: 沿流动方向的单元数
+    :ang_corrugated: 波纹角 °
+    :tables: property_module.property_tables 的返回值，配置了物性表时物性取当时入口温度下的值
+    :keep: 不随温度更新的物性输入名称
+    :holdup: 是否计入流道内流体的热容，为 False 时只计板片热容 (流量为零的时刻结果为 NaN)
+    :returns: (结果, 状态)，结果为 TRANSIENT_OUTPUTS 中的名称到形状 (n_t, m) 数组的字典:
+              t_hout、t_cout 出口温度，Phi 热侧放热量 W，Phi_c 冷侧吸热量 W (两者之差为板片与流体的蓄热速率)，
+              T_w 板片平均温度，flag 越界原因编码；状态为形状 (3, n_seg, m) 的热侧、板片、冷侧单元温度
+
+    """
+    bi = {k: np.reshape(v, -1) for k, v in bi.items()}
+    m = bi["t_hin"].size
+    dt = np.asarray(dt, dtype=float)
+    n_t = dt.size
+    instrument.count("Transient_batch_cal.rows", n_t * m)
+    series = {name: np.broadcast_to(np.asarray(series.get(name, bi[name]), dtype=float), (n_t, m))
+              for name in TRANSIENT_INPUTS}
+    if state is None:
+        if n_t and dt[0] != np.inf:
+            raise ValueError("未给出初始状态时第一个时刻的时间间隔应为 inf (以稳态作为初始状态)")
+        state = np.zeros((3, n_seg, m))  # 稳态步中上一步温度的系数为零, 取值无关
+    state = np.array(state, dtype=float)
+
+    t = instrument.start()
+    coef = _coefficients(bi, series, n_seg, ang_corrugated, tables if tables and any(tables.values()) else None,
+                         keep, holdup)
+    t = instrument.lap("coefficients", t, coef["U_h"], coef["U_c"])
+    counter = bi["FD"] == 2
+    names = ("G_h", "G_c", "U_h", "U_c", "C_h", "C_c", "C_w")
+    out = np.full((3, n_t, m), np.nan)
+    if jit.enabled:
+        T = lambda x: np.ascontiguousarray(np.transpose(x))
+        h, w, c = (np.ascontiguousarray(s.T) for s in state)
+        res = np.empty((3, m, n_t))
+        jit._compile()
+        _replay_kernel(counter, T(series["t_hin"]), T(series["t_cin"]), *(T(coef[k]) for k in names), dt,
+                       h, w, c, *res)
+        state = np.stack([h.T, w.T, c.T])
+        out = res.transpose(0, 2, 1)
+    else:
+        for direction in (True, False):
+            idx = np.flatnonzero(counter == direction)
+            if idx.size == 0:
+                continue
+            h, w, c = state[:, :, idx]
+            res = np.empty((3, n_t, idx.size))
+            _replay_numpy(direction, series["t_hin"][:, idx], series["t_cin"][:, idx],
+                          *(np.broadcast_to(coef[k], (n_t, m))[:, idx] for k in names), dt, h, w, c, *res)
+            state[:, :, idx] = np.stack([h, w, c])
+            out[:, :, idx] = res
+    instrument.lap("replay", t, out[0], out[1])
+
+    supported = np.isin(bi["FD"], TRANSIENT_DIRECTIONS)
+    t_hout, t_cout, T_w = (np.where(supported, v, np.nan) for v in out)
+    result = {"t_hout": t_hout, "t_cout": t_cout,
+              "Phi": coef["G_h"] * (series["t_hin"] - t_hout), "Phi_c": coef["G_c"] * (t_cout - series["t_cin"]),
+              "T_w": T_w, "flag": np.broadcast_to(coef["flag"], (n_t, m))}
+    return result, state
+
+
+def _time_steps(time, previous):
+    """由时间列得到各时刻与上一时刻的间隔, 第一段第一个时刻为 inf"""
+    dt = np.diff(time, prepend=previous)
+    if np.any(dt <= 0) or not np.all(np.isfinite(time)):
+        raise ValueError("瞬态计算的时间列须严格递增")
+    return dt
+
+
+def Transient_cal(cd, time, n_seg=20, **series):
+    """单台换热器的瞬态计算, 以第一个时刻的稳态作为初始状态
+
+    :cd: 配置字典
+    :time: 时刻 s，严格递增
+    :n_seg: 沿流动方向的单元数
+    :series: TRANSIENT_INPUTS 中的名称到与 time 等长数组的字典，缺失的输入取配置值
+    :returns: TRANSIENT_OUTPUTS 中的名称到与 time 等长数组的字典
+
+    """
+    time = np.asarray(time, dtype=float)
+    series = {k: np.reshape(v, (-1, 1)) for k, v in series.items()}
+    res, _ = Transient_batch_cal(transient_to_batch(cd), series, _time_steps(time, -np.inf), n_seg=n_seg,
+                                 tables=property_tables(cd), keep=tuple(series))
+    return {k: v[:, 0] for k, v in res.items()}
+
+
+def run_transient(cd, input_path, output_path, chunk_size=100000, n_seg=20, holdup=True):
+    """流式瞬态计算: 分块读取多台换热器的运行记录, 逐块推进并写出结果
+
+    输入文件按时间排序, 每个时刻依次为各台换热器的一行, 各时刻的换热器顺序相同 (台数由第一个时刻的行数确定)。
+    time 列为时刻 s, 其余列名同流式计算; TRANSIENT_INPUTS 以外的输入取各台换热器第一个时刻的值,
+    板片密度与比热容可用 SPP.Density、SPP.Specific_heat_capacity 列逐台给出
+
+    :cd: 配置字典
+    :input_path: 输入文件路径 (CSV 或 Parquet)
+    :output_path: 输出文件路径 (CSV 或 Parquet)
+    :chunk_size: 每块读取的行数，应大于换热器台数
+    :n_seg: 沿流动方向的单元数
+    :holdup: 是否计入流道内流体的热容
+    :returns: (时刻数, 换热器台数)
+
+    """
+    wall_columns = {f"SPP.{key}": name for name, key in WALL_KEYS.items()}
+    tables = property_tables(cd)
+    bi = state = None
+    previous = -np.inf
+    pending = {}
+    n_t = m = 0
+    flagged = 0
+    with Chunk_writer(output_path) as writer:
+        for columns in iter_chunks(input_path, chunk_size):
+            if "time" not in columns:
+                raise ValueError("瞬态计算的输入文件需要 time 列 (s)")
+            columns = {k: np.concatenate([pending[k], v]) if pending else v for k, v in columns.items()}
+            if bi is None:
+                time = columns["time"]
+                m = int(np.argmax(time != time[0])) or time.size
+                if m == time.size and time.size >= chunk_size:
+                    raise ValueError(f"第一个时刻的行数不少于每块行数 {chunk_size}, 请增大 --chunk-size")
+            rows = columns["time"].size // m * m
+            pending = {k: v[rows:] for k, v in columns.items()}
+            if rows == 0:
+                continue
+            block = {k: v[:rows].reshape(-1, m) for k, v in columns.items()}
+            if np.any(block["time"] != block["time"][:, :1]):
+                raise ValueError("瞬态计算的输入文件须按时间排序, 且每个时刻依次包含全部换热器的一行")
+            inputs = column_inputs(block)
+            if bi is None:
+                overrides = {k: v[0] for k, v in inputs.items() if k not in TRANSIENT_INPUTS}
+                overrides.update({name: block[col][0] for col, name in wall_columns.items() if col in block})
+                keep = tuple(k for k in inputs if k not in TRANSIENT_INPUTS)
+                bi = transient_to_batch(cd, **overrides)
+            dt = _time_steps(block["time"][:, 0], previous)
+            previous = block["time"][-1, 0]
+            previous_disable = logging.root.manager.disable
+            logging.disable(logging.WARNING)  # 逐块告警过多, 越界情况汇总于结束时给出
+            try:
+                res, state = Transient_batch_cal(bi, {k: v for k, v in inputs.items() if k in TRANSIENT_INPUTS},
+                                                 dt, state, n_seg, tables=tables, keep=keep, holdup=holdup)
+            finally:
+                logging.disable(previous_disable)
+            writer.write({**{k: v.ravel() for k, v in block.items()}, **{k: v.ravel() for k, v in res.items()}})
+            flagged += int(np.count_nonzero(res["flag"]))
+            n_t += dt.size
+            logger.info(f"已完成 {n_t} 个时刻")
+    if pending and pending["time"].size:
+        logger.warning(f"输入文件末尾 {pending['time'].size} 行不足一个时刻的换热器台数, 已忽略")
+    if flagged:
+        logger.warning(f"共 {flagged} 行超出经验公式适用范围, 见输出的 flag 列")
+    return n_t, m
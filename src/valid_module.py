@@ -0,0 +1,122 @@
+'''
+ =======================================================================
+ ·······································································
+ ·······································································
+ ····Y88b···d88P················888b·····d888·d8b·······················
+ ·····Y88b·d88P·················8888b···d8888·Y8P·······················
+ ······Y88o88P··················88888b·d88888···························
+ ·······Y888P··8888b···88888b···888Y88888P888·888·88888b·····d88b·······
+ ········888······"88b·888·"88b·888·Y888P·888·888·888·"88b·d88P"88b·····
+ ········888···d888888·888··888·888··Y8P··888·888·888··888·888··888·····
+ ········888··888··888·888··888·888···"···888·888·888··888·Y88b·888·····
+ ········888··"Y888888·888··888·888·······888·888·888··888··"Y88888·····
+ ·······························································888·····
+ ··························································Y8b·d88P·····
+ ···························································"Y88P"······
+ ·······································································
+ =======================================================================
+
+ -----------------------------------------------------------------------
+Author       : 焱铭
+Date         : 2026-10-18 14:02:47 +0800
+LastEditTime : 2026-10-18 14:02:47 +0800
+Github       : https://github.com/YanMing-lxb/
+FilePath     : /Heat-Exchanger-Calibration-Calculator/src/valid_module.py
+Description  : 
+ -----------------------------------------------------------------------
+'''
+
+import numpy as np
+
+from .dual_module import value as dual_value
+
+# 越界原因编码, 按位组合, 0 表示在适用范围内
+RE_LOW = 1  # Re 低于适用下限
+RE_HIGH = 2  # Re 高于适用上限
+PR_OUT = 4  # Pr 超出适用范围
+ANGLE_OUT = 8  # 波纹角不在可选值或适用范围内
+PHI_OUT = 16  # 放大系数/颗粒体积浓度不在可选值或适用范围内
+CO_OUT = 32  # 两相特征参数 (Co 等) 超出适用范围
+OPTION_OUT = 64  # 制冷剂、状态等离散选项不支持
+NOT_CONVERGED = 128  # 迭代计算未收敛
+QUALITY_OUT = 256  # 干度超出 0~1 (如出口前已完全冷凝)
+
+REASON_NAMES = {
+    RE_LOW: "Re 低于下限",
+    RE_HIGH: "Re 高于上限",
+    PR_OUT: "Pr 超出范围",
+    ANGLE_OUT: "波纹角超出范围",
+    PHI_OUT: "phi 超出范围",
+    CO_OUT: "Co 超出范围",
+    OPTION_OUT: "选项不支持",
+    NOT_CONVERGED: "迭代未收敛",
+    QUALITY_OUT: "干度超出范围",
+}
+
+
+def range_flag(Re, lo=None, hi=None):
+    """按元素检查 Re 是否在开区间 (lo, hi) 内
+
+    :Re: 雷诺数，标量或数组
+    :lo: 下限，None 表示不检查
+    :hi: 上限，None 表示不检查
+    :returns: 越界原因编码数组
+
+    """
+    Re = np.asarray(dual_value(Re), dtype=float)
+    flag = np.zeros(Re.shape, dtype=np.int64)
+    if lo is not None:
+        flag |= np.where(Re > lo, 0, RE_LOW)
+    if hi is not None:
+        flag |= np.where(Re < hi, 0, RE_HIGH)
+    return flag
+
+
+def between_flag(x, lo, hi, code):
+    """按元素检查 x 是否在开区间 (lo, hi) 内, 越界记为 code"""
+    x = np.asarray(dual_value(x), dtype=float)
+    return np.where((lo < x) & (x < hi), 0, code).astype(np.int64)
+
+
+def choice_flag(x, choices, code):
+    """按元素检查 x 是否为可选值之一, 否则记为 code"""
+    x = np.asarray(dual_value(x), dtype=float)
+    hit = np.zeros(x.shape, dtype=bool)
+    for c in choices:
+        hit |= np.isclose(x, c)
+    return np.where(hit, 0, code).astype(np.int64)
+
+
+def describe_flag(flag):
+    """将越界原因编码转换为文字说明
+
+    :flag: 越界原因编码，数组时对所有元素取并集
+    :returns: 说明文字列表
+
+    """
+    merged = int(np.bitwise_or.reduce(np.ravel(flag))) if np.size(flag) else 0
+    return [name for code, name in REASON_NAMES.items() if merged & code]
+
+
+def check_result(logger, name, value, flag, return_flag):
+    """处理经验公式结果: 越界元素置为 NaN 并记录警告, 不中断程序
+
+    :logger: 日志记录器
+    :name: 经验公式名称
+    :value: 经验公式计算值
+    :flag: 越界原因编码
+    :return_flag: 为 True 时同时返回越界原因编码
+    :returns: value 或 (value, flag)，标量输入时返回 Python 标量
+
+    """
+    flag = np.broadcast_to(flag, np.broadcast_shapes(np.shape(value), np.shape(flag)))
+    with np.errstate(invalid="ignore"):
+        value = np.where(flag == 0, value, np.nan)
+    n_bad = np.count_nonzero(flag)
+    if n_bad:
+        logger.warning(f"{name} 有 {n_bad}/{flag.size} 个工况超出适用范围: {', '.join(describe_flag(flag))}")
+    if np.ndim(value) == 0:
+        value, flag = value.item(), int(flag)
+    if return_flag:
+        return value, flag
+    return value
@@ -0,0 +1,32 @@
+import copy
+import logging
+import tomllib
+
+import pytest
+
+from src.config_module import default_config
+
+_DEFAULT = tomllib.loads(default_config)
+
+
+@pytest.fixture
+def cd():
+    """默认配置字典 (每个测试独立副本)"""
+    return copy.deepcopy(_DEFAULT)
+
+
+@pytest.fixture
+def water_cd(cd):
+    """两侧物性取内置水物性表的默认配置"""
+    for section in ("FHSPPP", "FCSPPP"):
+        cd[section]["Property_table"] = "water"
+    return cd
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logging():
+    """经验公式越界告警在测试中属预期情况, 不输出"""
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(previous)
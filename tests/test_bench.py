@@ -0,0 +1,27 @@
+import time
+
+from src import bench_module
+
+
+def test_time_excludes_first_call():
+    calls = []
+
+    def func():
+        if not calls:
+            time.sleep(0.05)
+        calls.append(None)
+
+    assert bench_module._time(func, 0.001) < 0.01
+    assert len(calls) >= 2
+
+
+def test_every_correlation_has_bench_case():
+    assert bench_module.missing_cases() == []
+
+
+def test_run_bench_and_compare():
+    results = bench_module.run_bench([10], min_time=0.001, only="Okada")
+    assert results and all(v > 0 for v in results.values())
+    slower = {k: v * 2 for k, v in results.items()}
+    assert set(bench_module.compare(results, slower, 0.2)) == set(results)
+    assert bench_module.compare(results, results, 0.2) == {}
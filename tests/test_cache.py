@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src import cache_module as cache
+from src.batch_module import Rating_batch_cal, Rating_cal, config_to_batch
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache.enable(tmp_path / "cache.sqlite")
+    cache.clear()
+    yield cache._store
+    cache.disable()
+    cache._store = None
+
+
+def test_cached_result_equals_direct(cd, disk_cache):
+    first = Rating_cal(cd)
+    second = Rating_cal(cd)
+    assert first == pytest.approx(second, nan_ok=True)
+    assert first["Phi"] == pytest.approx(6974.543, abs=1e-3)
+
+
+def test_disk_hit_does_not_write_until_flush(cd, disk_cache):
+    bi = config_to_batch(cd)
+    Rating_batch_cal(bi)
+    cache._memory.clear()
+    key = next(iter(disk_cache._touched), None)
+    assert key is None
+    Rating_batch_cal(bi)
+    assert len(disk_cache._touched) == 1
+    disk_cache.flush()
+    assert not disk_cache._touched
+
+
+def test_cache_is_off_by_default():
+    assert not cache.enabled
@@ -0,0 +1,18 @@
+import logging
+
+import numpy as np
+
+from src.batch_module import Rating_cal
+from src.compare_module import NU_CORRELATIONS, Compare_cal
+
+
+def test_okada_entry_matches_rating(cd):
+    res = Compare_cal(cd)
+    assert np.isclose(res["Phi.Okada"], Rating_cal(cd)["Phi"], rtol=1e-12)
+    assert res["Phi_n_valid"] <= len(NU_CORRELATIONS)
+
+
+def test_logging_level_restored(cd):
+    logging.disable(logging.CRITICAL)
+    Compare_cal(cd)
+    assert logging.root.manager.disable == logging.CRITICAL
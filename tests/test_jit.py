@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src import jit_module as jit
+from src.batch_module import Rating_batch_cal, config_to_batch
+from src.transient_module import Transient_cal
+
+pytestmark = pytest.mark.skipif(not jit.available, reason="未安装 numba")
+
+
+@pytest.fixture
+def jit_on():
+    jit.enable()
+    yield
+    jit.disable()
+
+
+def test_import_does_not_load_numba():
+    code = "import sys; import src.batch_module, src.transient_module; print('numba' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_fused_kernel_matches_numpy(cd, jit_on):
+    bi = config_to_batch(cd, q_hm=np.linspace(0.1, 0.4, 7), FD=np.array([1, 2, 3, 4, 5, 6, 7]))
+    fused = Rating_batch_cal.__wrapped__(bi)["Phi"]
+    jit.disable()
+    plain = Rating_batch_cal.__wrapped__(bi)["Phi"]
+    np.testing.assert_allclose(fused, plain, rtol=1e-10)
+
+
+def test_transient_kernel_matches_numpy(cd, jit_on):
+    time = np.linspace(0, 60, 31)
+    t_hin = np.where(time < 20, cd["BC"]["Temp_heat_inlet"], cd["BC"]["Temp_heat_inlet"] + 10)
+    fused = Transient_cal(cd, time, t_hin=t_hin)
+    jit.disable()
+    plain = Transient_cal(cd, time, t_hin=t_hin)
+    for name, v in plain.items():
+        np.testing.assert_allclose(fused[name], v, rtol=1e-9, err_msg=name)
@@ -0,0 +1,30 @@
+import logging
+
+import numpy as np
+
+from src.optimize_module import _score, optimize_geometry
+
+
+def test_score_rejects_out_of_range_and_nan_pressure():
+    res = {"mass": np.array([1.0, 1.0, 1.0]), "Phi": np.array([10.0, 10.0, 10.0]),
+           "Delta_P_h": np.array([1.0, 1.0, 1.0]), "Delta_P_c": np.array([1.0, np.nan, 1.0]),
+           "flag": np.array([0, 0, 1])}
+    _, violation = _score(res, "mass", duty=5.0)
+    assert violation[0] == 0
+    assert np.isinf(violation[1])
+    assert violation[2] > 0
+
+
+def test_optimum_is_within_correlation_range(cd):
+    res = optimize_geometry(cd, "mass", generations=60, workers=1)
+    if res["feasible"]:
+        assert res["flag"] == 0
+        assert np.isfinite(res["Delta_P_h"]) and np.isfinite(res["Delta_P_c"])
+        assert res["Phi"] >= res["duty"] * (1 - 1e-12)
+
+
+def test_zero_generations_and_logging_restored(cd):
+    before = logging.root.manager.disable
+    res = optimize_geometry(cd, "mass", generations=0, workers=1, population=10)
+    assert res["generations"] == 0 and res["evaluations"] == 10
+    assert logging.root.manager.disable == before
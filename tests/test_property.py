@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.batch_module import Rating_batch_cal, config_to_batch
+from src.property_module import load_property_table, property_tables
+
+
+def test_query_interpolates_table_points():
+    table = load_property_table("water")
+    res = table.query([20.0, 100.0])
+    assert np.allclose(res["Density"], [998.2, 958.4], rtol=1e-6)
+
+
+def test_query_nan_temperature_gives_nan_row():
+    res = load_property_table("water").query([20.0, np.nan])
+    for values in res.values():
+        assert np.isfinite(values[0]) and np.isnan(values[1])
+
+
+def test_rating_with_tables_keeps_valid_rows(water_cd):
+    res = Rating_batch_cal.__wrapped__(config_to_batch(water_cd, FD=np.array([2.0, 9.0])),
+                                       tables=property_tables(water_cd))
+    assert np.isfinite(res["Phi"][0]) and np.isnan(res["Phi"][1])
+    assert res["flag"][1] != 0
@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import pytest
+
+from src.server_module import Calculation_server
+
+
+def _call(server, method, params, rid=1):
+    body = json.dumps({"jsonrpc": "2.0", "id": rid, "method": method, "params": params})
+    return server.handle_body(body.encode())
+
+
+def test_rating_matches_default(cd):
+    async def main():
+        server = Calculation_server(cd, window=0.001)
+        try:
+            return await _call(server, "rating", {})
+        finally:
+            server.executor.shutdown()
+
+    response = asyncio.run(main())
+    assert response["result"]["Phi"] == pytest.approx(6974.543, abs=1e-3)
+
+
+def test_concurrent_requests_share_one_batch(cd):
+    async def main():
+        server = Calculation_server(cd, window=0.01)
+        try:
+            responses = await asyncio.gather(*(_call(server, "rating", {"inputs": {"BC.Mass_flow_heat": 0.1 + 0.05 * i}}, i) for i in range(4)))
+            return responses, server.n_batches
+        finally:
+            server.executor.shutdown()
+
+    responses, n_batches = asyncio.run(main())
+    assert n_batches == 1
+    phis = [r["result"]["Phi"] for r in responses]
+    assert phis == sorted(phis)
+
+
+def test_loop_stays_responsive_during_sweep(cd):
+    async def main():
+        server = Calculation_server(cd, window=0.001)
+        try:
+            sweep = asyncio.ensure_future(_call(server, "sweep", {"sweep": ["BC.Mass_flow_heat=0.1:0.5:2000"]}))
+            ping = await asyncio.wait_for(_call(server, "ping", {}), 5)
+            return ping, await sweep
+        finally:
+            server.executor.shutdown()
+
+    ping, sweep = asyncio.run(main())
+    assert "result" in ping and "result" in sweep
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.batch_module import Rating_batch_cal, config_to_batch
+from src.io_module import read_csv
+from src.sweep_module import iter_sweep, parse_sweep_spec, run_sweep, write_sweep
+
+
+def test_parse_sweep_spec():
+    key, values = parse_sweep_spec("BC.Mass_flow_heat=0.1:0.5:9")
+    assert key == "BC.Mass_flow_heat" and len(values) == 9
+    assert list(parse_sweep_spec("SP.Flow_direction=1,2")[1]) == [1, 2]
+    with pytest.raises(ValueError):
+        parse_sweep_spec("BC.Unknown=1")
+
+
+def test_sweep_matches_direct_rating(cd):
+    axes = dict([parse_sweep_spec("BC.Mass_flow_heat=0.1:0.5:5"), parse_sweep_spec("SP.Flow_direction=1,2")])
+    columns = run_sweep(cd, axes, workers=1, chunk_size=3)
+    q_hm = np.repeat(axes["BC.Mass_flow_heat"], 2)
+    FD = np.tile(axes["SP.Flow_direction"], 5)
+    direct = Rating_batch_cal.__wrapped__(config_to_batch(cd, q_hm=q_hm, FD=FD))
+    np.testing.assert_allclose(columns["Phi"], direct["Phi"])
+    np.testing.assert_array_equal(columns["BC.Mass_flow_heat"], q_hm)
+
+
+def test_parallel_chunks_stay_in_grid_order(cd):
+    axes = dict([parse_sweep_spec("BC.Mass_flow_heat=0.1:0.5:23")])
+    chunks = list(iter_sweep(cd, axes, workers=2, chunk_size=2))
+    assert len(chunks) == 12
+    np.testing.assert_array_equal(np.concatenate([c["BC.Mass_flow_heat"] for c in chunks]), axes["BC.Mass_flow_heat"])
+
+
+def test_write_sweep_streams_to_file(cd, tmp_path):
+    axes = dict([parse_sweep_spec("BC.Mass_flow_heat=0.1:0.5:7")])
+    path = tmp_path / "sweep.csv"
+    total, n_bad = write_sweep(cd, axes, path, workers=1, chunk_size=3)
+    columns = read_csv(path)
+    assert total == 7 and n_bad == int((columns["flag"] != 0).sum())
+    np.testing.assert_allclose(columns["Phi"], run_sweep(cd, axes, workers=1)["Phi"], rtol=1e-9)